@@ -4,12 +4,59 @@ from .process_high_density_region_algorithm import ProcessHighDensityRegionAlgor
 from .karhunen_loeve_dimension_reduction_algorithm import (
     KarhunenLoeveDimensionReductionAlgorithm,
 )
+from .univariate_high_density_region_algorithm import (
+    UnivariateHighDensityRegionAlgorithm,
+)
 from .draw_univariate_sample import DrawUnivariateSampleDistribution
+from .process_sample_conversion import (
+    ConvertProcessSampleToArray,
+    ConvertArrayToProcessSample,
+)
+from .process_high_density_region_monitor import ProcessHighDensityRegionMonitor
+from .reduced_distribution_factory import ReducedDistributionFactory
+from .cross_validation_kernel_smoothing import CrossValidationKernelSmoothing
+from .process_high_density_region_pipeline import ProcessHighDensityRegionPipeline
+from .parameter_sweep_algorithm import ParameterSweepAlgorithm
+from .importance_sampling_threshold_algorithm import (
+    ImportanceSamplingThresholdAlgorithm,
+)
+from .monte_carlo_threshold_algorithm import MonteCarloThresholdAlgorithm
+from .shared_high_density_region_model import SharedHighDensityRegionModel
+from .density_lookup_table import DensityLookupTable
+from .high_density_region_matrix_plot import HighDensityRegionMatrixPlot
+from .columnar_export import ExportToNPZ, ExportToParquet
+from .trajectory_decimation import DecimateTrajectories
+from .batch_process_high_density_region_algorithm import (
+    BatchProcessHighDensityRegionAlgorithm,
+)
+from .process_band_depth_algorithm import (
+    ProcessBandDepthAlgorithm,
+    ComputeModifiedBandDepth,
+)
 
 __all__ = [
     "HighDensityRegionAlgorithm",
     "ProcessHighDensityRegionAlgorithm",
     "KarhunenLoeveDimensionReductionAlgorithm",
-    "DrawUnivariateSampleDistribution"
+    "UnivariateHighDensityRegionAlgorithm",
+    "DrawUnivariateSampleDistribution",
+    "ConvertProcessSampleToArray",
+    "ConvertArrayToProcessSample",
+    "ProcessHighDensityRegionMonitor",
+    "ReducedDistributionFactory",
+    "CrossValidationKernelSmoothing",
+    "ProcessHighDensityRegionPipeline",
+    "ParameterSweepAlgorithm",
+    "ProcessBandDepthAlgorithm",
+    "ComputeModifiedBandDepth",
+    "ImportanceSamplingThresholdAlgorithm",
+    "MonteCarloThresholdAlgorithm",
+    "SharedHighDensityRegionModel",
+    "BatchProcessHighDensityRegionAlgorithm",
+    "DensityLookupTable",
+    "HighDensityRegionMatrixPlot",
+    "ExportToNPZ",
+    "ExportToParquet",
+    "DecimateTrajectories",
 ]
 __version__ = "2.2"
@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Component to create BatchProcessHighDensityRegionAlgorithm.
+"""
+import numpy as np
+import openturns as ot
+
+
+def _computeBatchGaussianKernelPDF(points, centers, bandwidth, batchSize):
+    """
+    Evaluate the Gaussian kernel densities of several models.
+
+    Parameters
+    ----------
+    points : np.array(M, s, d)
+        The points of each model.
+    centers : np.array(M, n, d)
+        The kernel centers of each model, with equal weights.
+    bandwidth : np.array(M, d)
+        The bandwidth of each model.
+    batchSize : int
+        The maximum number of kernel evaluations computed together.
+
+    Returns
+    -------
+    pdf : np.array(M, s)
+        The density of each model at its points.
+    """
+    numberOfModels, size, dim = points.shape
+    numberOfCenters = centers.shape[1]
+    scaled_points = points / bandwidth[:, None, :]
+    scaled_centers = centers / bandwidth[:, None, :]
+    points_norm2 = np.sum(scaled_points ** 2, axis=2)
+    centers_norm2 = np.sum(scaled_centers ** 2, axis=2)
+    normalization = (2.0 * np.pi) ** (-0.5 * dim) / np.prod(bandwidth, axis=1)
+    pdf = np.empty((numberOfModels, size))
+    # Models per batch, and points per batch if a model is too large
+    step = max(1, batchSize // (size * numberOfCenters))
+    pointStep = max(1, min(size, batchSize // numberOfCenters))
+    for start in range(0, numberOfModels, step):
+        models = slice(start, start + step)
+        for pointStart in range(0, size, pointStep):
+            rows = slice(pointStart, pointStart + pointStep)
+            squared_distance = (
+                points_norm2[models, rows, None]
+                + centers_norm2[models, None, :]
+                - 2.0
+                * np.matmul(
+                    scaled_points[models, rows], scaled_centers[models].transpose(0, 2, 1)
+                )
+            )
+            np.maximum(squared_distance, 0.0, out=squared_distance)
+            pdf[models, rows] = np.mean(np.exp(-0.5 * squared_distance), axis=2)
+    return pdf * normalization[:, None]
+
+
+class BatchProcessHighDensityRegionAlgorithm:
+    """Compute the functional HDR of many independent process samples."""
+
+    def __init__(
+        self,
+        trajectories,
+        numberOfComponents=2,
+        alphaLevels=[0.9, 0.5, 0.1],
+        vertexWeights=None,
+        sampleSize=10000,
+        seed=None,
+        batchSize=10000000,
+    ):
+        """
+        Functional HDR of many process samples, computed together.
+
+        Each model is the functional HDR of one process sample, e.g. one
+        sensor channel: a K-L decomposition, a Gaussian kernel smoothing
+        of the reduced components and the thresholds of the alpha levels.
+        All the models share the same mesh and the same number of
+        trajectories, so that they are stacked in one 3-D array and each
+        step is computed for all the models by batched linear algebra,
+        without any OpenTURNS object per model:
+
+        - the K-L modes are the right singular vectors of the centered
+          trajectories, weighted by the square root of the vertex weights,
+          as with ot.KarhunenLoeveSVDAlgorithm. The reduced components are
+          the projections of the trajectories on the modes, divided by the
+          square root of the eigenvalues, as in
+          ot.KarhunenLoeveResult.project. The sign of each mode is set so
+          that its largest value is positive,
+        - the bandwidth of the kernel smoothing is the Silverman rule
+          with the interquartile range, as in ot.KernelSmoothing,
+        - the threshold of an alpha level is the quantile of level
+          1 - alpha of the PDF of a sample of the distribution, as with
+          Monte-Carlo minimum volume level sets.
+
+        Parameters
+        ----------
+        trajectories : np.array(M, n, m)
+            The n trajectories of each of the M models, on m vertices.
+        numberOfComponents : int
+            The number of components of the K-L decompositions.
+        alphaLevels : list(float)
+            The alpha levels, shared by all the models.
+        vertexWeights : np.array(m)
+            The integration weights of the vertices of the mesh, e.g.
+            mesh.computeWeights(). If None, the weights are equal.
+        sampleSize : int
+            The size of the sample of each distribution for the thresholds.
+        seed : int
+            The seed of the sample of the thresholds. If None, it is
+            generated by the OpenTURNS random generator.
+        batchSize : int
+            The maximum number of kernel evaluations computed together.
+            The memory used is proportional to it.
+        """
+        trajectories = np.asarray(trajectories, dtype=float)
+        if trajectories.ndim != 3:
+            raise ValueError(
+                "The trajectories must be a 3-D array, but their dimension is %d."
+                % (trajectories.ndim)
+            )
+        numberOfModels, size, numberOfVertices = trajectories.shape
+        if len(alphaLevels) == 0:
+            raise ValueError("The number of alpha levels is zero.")
+        if size < 2:
+            raise ValueError(
+                "The number of trajectories must be at least 2, but is %d." % (size)
+            )
+        if numberOfComponents < 1 or numberOfComponents > min(size, numberOfVertices):
+            raise ValueError(
+                "The number of components must be in [1, %d], but is %d."
+                % (min(size, numberOfVertices), numberOfComponents)
+            )
+        if vertexWeights is None:
+            vertexWeights = np.full(numberOfVertices, 1.0 / numberOfVertices)
+        vertexWeights = np.asarray(vertexWeights, dtype=float)
+        if vertexWeights.shape != (numberOfVertices,):
+            raise ValueError(
+                "The number of vertex weights is %d but "
+                "the number of vertices is %d." % (vertexWeights.size, numberOfVertices)
+            )
+        self.trajectories = trajectories
+        self.numberOfComponents = numberOfComponents
+        self.alphaLevels = sorted(alphaLevels, reverse=True)
+        self.outlierAlpha = float(np.max(self.alphaLevels))
+        self.vertexWeights = vertexWeights
+        self.sampleSize = sampleSize
+        self.seed = seed
+        self.batchSize = batchSize
+
+        # Computed by the algorithm
+        self.eigenvalues = None
+        self.modes = None
+        self.reducedComponents = None
+        self.bandwidths = None
+        self.pvalues = None
+        self.outlierPvalues = None
+        self.sample_pdf = None
+        self.outlier_flags = None
+        self.idx_mode = None
+
+    def _computeKarhunenLoeve(self):
+        """Compute the modes and the reduced components of all the models."""
+        size = self.trajectories.shape[1]
+        sqrt_weights = np.sqrt(self.vertexWeights)
+        centered = self.trajectories - np.mean(self.trajectories, axis=1)[:, None, :]
+        _, singular_values, vt = np.linalg.svd(
+            centered * sqrt_weights / np.sqrt(size - 1.0), full_matrices=False
+        )
+        k = self.numberOfComponents
+        singular_values = singular_values[:, :k]
+        vt = vt[:, :k, :]
+        # Deterministic signs
+        largest = np.argmax(np.abs(vt), axis=2)
+        signs = np.sign(np.take_along_axis(vt, largest[:, :, None], axis=2))
+        vt = vt * signs
+        self.eigenvalues = singular_values ** 2
+        self.modes = vt / sqrt_weights
+        # <x, phi>_w / sqrt(lambda)
+        projection = vt * sqrt_weights / np.maximum(singular_values, 1.0e-300)[:, :, None]
+        self.reducedComponents = np.matmul(self.trajectories, projection.transpose(0, 2, 1))
+
+    def _computeBandwidths(self):
+        """Compute the Silverman bandwidths of all the models."""
+        size, dim = self.reducedComponents.shape[1:]
+        quartiles = np.quantile(
+            self.reducedComponents, [0.25, 0.75], axis=1, method="hazen"
+        )
+        sigma = (quartiles[1] - quartiles[0]) / (2.0 * ot.Normal().computeQuantile(0.75)[0])
+        # The standard deviation if the interquartile range is zero
+        std = np.std(self.reducedComponents, axis=1, ddof=1)
+        sigma = np.where(sigma > 0.0, sigma, std)
+        factor = (4.0 / (dim + 2.0)) ** (1.0 / (dim + 4.0)) * size ** (-1.0 / (dim + 4.0))
+        self.bandwidths = sigma * factor
+
+    def _computeThresholds(self):
+        """Compute the thresholds of all the models."""
+        if self.seed is None:
+            seed = int(ot.RandomGenerator.IntegerGenerate(1, 2 ** 31 - 1)[0])
+        else:
+            seed = self.seed
+        generator = np.random.default_rng(seed)
+        numberOfModels, size, dim = self.reducedComponents.shape
+        kernel_indices = generator.integers(0, size, (numberOfModels, self.sampleSize))
+        points = np.take_along_axis(
+            self.reducedComponents, kernel_indices[:, :, None], axis=1
+        )
+        points += generator.standard_normal(points.shape) * self.bandwidths[:, None, :]
+        pdf = _computeBatchGaussianKernelPDF(
+            points, self.reducedComponents, self.bandwidths, self.batchSize
+        )
+        probabilities = 1.0 - np.array(self.alphaLevels)
+        self.pvalues = np.quantile(pdf, probabilities, axis=1).T
+        self.outlierPvalues = self.pvalues[:, int(np.argmax(self.alphaLevels))]
+
+    def run(self):
+        """Compute the models and classify the trajectories."""
+        self._computeKarhunenLoeve()
+        self._computeBandwidths()
+        self._computeThresholds()
+        self.sample_pdf = _computeBatchGaussianKernelPDF(
+            self.reducedComponents,
+            self.reducedComponents,
+            self.bandwidths,
+            self.batchSize,
+        )
+        self.outlier_flags = self.sample_pdf < self.outlierPvalues[:, None]
+        self.idx_mode = np.argmax(self.sample_pdf, axis=1)
+
+    def getNumberOfModels(self):
+        """
+        Return the number of models.
+
+        Returns
+        -------
+        numberOfModels : int
+            The number of process samples.
+        """
+        return self.trajectories.shape[0]
+
+    def getReducedComponents(self):
+        """
+        Return the reduced components of all the models.
+
+        Returns
+        -------
+        reducedComponents : np.array(M, n, d)
+            The n points in the d-dimensional reduced space of each model.
+        """
+        return self.reducedComponents
+
+    def getEigenvalues(self):
+        """
+        Return the K-L eigenvalues of all the models.
+
+        Returns
+        -------
+        eigenvalues : np.array(M, d)
+            The eigenvalues of each model, in decreasing order.
+        """
+        return self.eigenvalues
+
+    def getModes(self):
+        """
+        Return the K-L modes of all the models.
+
+        Returns
+        -------
+        modes : np.array(M, d, m)
+            The values of the modes of each model on the vertices.
+        """
+        return self.modes
+
+    def getBandwidths(self):
+        """
+        Return the bandwidths of the kernel smoothings.
+
+        Returns
+        -------
+        bandwidths : np.array(M, d)
+            The bandwidth of each model.
+        """
+        return self.bandwidths
+
+    def getOutlierFlags(self):
+        """
+        Return True for the outliers of all the models.
+
+        Returns
+        -------
+        flags : np.array(M, n, bool)
+            True if the trajectory is an outlier of its model.
+        """
+        return self.outlier_flags
+
+    def getMode(self):
+        """
+        Return the index of the modal trajectory of each model.
+
+        Returns
+        -------
+        idx_mode : np.array(M, int)
+            The index of the trajectory with the highest density.
+        """
+        return self.idx_mode
+
+    def computeIndices(self, modelIndex, outlierFlag=True):
+        """
+        Return the indices of the outliers or inliers of one model.
+
+        Parameters
+        ----------
+        modelIndex : int
+            The index of the model.
+        outlierFlag : bool
+            If True, return the outliers, otherwise the inliers.
+
+        Returns
+        -------
+        indices : list(int)
+            The indices of the trajectories.
+        """
+        flags = self.outlier_flags[modelIndex]
+        if not outlierFlag:
+            flags = ~flags
+        return [int(i) for i in np.where(flags)[0]]
+
+    def getResults(self):
+        """
+        Return the results of each model.
+
+        Returns
+        -------
+        results : list(dict)
+            For each model, the alpha levels, the thresholds "pvalues", the
+            "outlierPvalue", the "outlierIndices" and the index "idx_mode"
+            of the modal trajectory.
+        """
+        results = []
+        for i in range(self.getNumberOfModels()):
+            results.append(
+                {
+                    "alphaLevels": tuple(self.alphaLevels),
+                    "pvalues": self.pvalues[i],
+                    "outlierPvalue": float(self.outlierPvalues[i]),
+                    "outlierIndices": self.computeIndices(i),
+                    "idx_mode": int(self.idx_mode[i]),
+                }
+            )
+        return results
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Columnar export of the results of a high density region.
+"""
+import numpy as np
+
+
+def _computeTables(algorithm):
+    """Return the columns of the points, of the vertices and the metadata."""
+    if algorithm.pvalues is None:
+        raise ValueError("The run() method of the algorithm must be called first.")
+    points = algorithm.computeResultColumns()
+    vertices = None
+    if hasattr(algorithm, "computeVertexColumns"):
+        vertices = algorithm.computeVertexColumns()
+    metadata = {
+        "alpha_levels": np.array(algorithm.alphaLevels, dtype=float),
+        "pvalues": np.array(algorithm.pvalues, dtype=float),
+        "outlier_pvalue": np.array(algorithm.getOutlierPValue(), dtype=float),
+    }
+    return points, vertices, metadata
+
+
+def ExportToNPZ(algorithm, filename, compressed=False):
+    """
+    Export the results of a HDR to a NPZ file.
+
+    The file contains one array per column of computeResultColumns(),
+    one array per column of computeVertexColumns() for a
+    ProcessHighDensityRegionAlgorithm, and the "alpha_levels", the
+    "pvalues" and the "outlier_pvalue". Each column is written as one
+    contiguous buffer.
+
+    Parameters
+    ----------
+    algorithm : HighDensityRegionAlgorithm
+        The algorithm, after run().
+    filename : str
+        The name of the file.
+    compressed : bool
+        If True, compress the file. This is slower.
+    """
+    points, vertices, metadata = _computeTables(algorithm)
+    arrays = dict(points)
+    if vertices is not None:
+        for name in vertices:
+            if name in arrays:
+                raise ValueError(
+                    "The column %s of the vertices is also a column of the points."
+                    % (name)
+                )
+        arrays.update(vertices)
+    for name in metadata:
+        if name in arrays:
+            raise ValueError("The column %s is also the name of a metadata." % (name))
+    arrays.update(metadata)
+    if compressed:
+        np.savez_compressed(filename, **arrays)
+    else:
+        np.savez(filename, **arrays)
+
+
+def ExportToParquet(algorithm, filename, verticesFilename=None):
+    """
+    Export the results of a HDR to Parquet files.
+
+    The points table has the columns of computeResultColumns(). The
+    alpha levels and the thresholds are stored in the metadata of its
+    schema. The numeric columns are passed to Arrow without copy. This
+    requires the pyarrow package.
+
+    Parameters
+    ----------
+    algorithm : HighDensityRegionAlgorithm
+        The algorithm, after run().
+    filename : str
+        The name of the file of the points table.
+    verticesFilename : str
+        The name of the file of the table of computeVertexColumns(), for
+        a ProcessHighDensityRegionAlgorithm. If None, it is not written.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("The pyarrow package is required to export to Parquet.")
+    points, vertices, metadata = _computeTables(algorithm)
+    schemaMetadata = {
+        key: " ".join(repr(float(value)) for value in np.ravel(array))
+        for key, array in metadata.items()
+    }
+    table = pyarrow.table(
+        {name: pyarrow.array(column) for name, column in points.items()}
+    ).replace_schema_metadata(schemaMetadata)
+    pyarrow.parquet.write_table(table, filename)
+    if verticesFilename is not None:
+        if vertices is None:
+            raise ValueError("The algorithm has no vertex columns.")
+        table = pyarrow.table(
+            {name: pyarrow.array(column) for name, column in vertices.items()}
+        )
+        pyarrow.parquet.write_table(table, verticesFilename)
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Command line tool to detect the outlier trajectories of curve files.
+
+For each input file, the tool runs the K-L reduction, the kernel smoothing
+of the reduced components and the ProcessHighDensityRegionAlgorithm, and
+writes the results in a compressed .npz file of the output directory, with
+the same base name. The directories of the input files, relative to their
+common directory, are mirrored in the output directory. The files are
+processed in parallel worker processes. A file which fails is reported
+without stopping the others, and the exit status is then 1.
+
+Examples
+--------
+::
+
+    othdrplot "data/*.csv" --output-directory results --jobs 4
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import cProfile
+import glob
+import os
+import sys
+import time
+import numpy as np
+import openturns as ot
+from .karhunen_loeve_dimension_reduction_algorithm import (
+    KarhunenLoeveDimensionReductionAlgorithm,
+)
+from .process_high_density_region_algorithm import ProcessHighDensityRegionAlgorithm
+from .monte_carlo_threshold_algorithm import MonteCarloThresholdAlgorithm
+from .process_sample_conversion import ConvertArrayToProcessSample
+
+
+def ReadTrajectoriesFile(filename, layout="columns", delimiter=None):
+    """
+    Read a file of trajectories.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the text file.
+    layout : str
+        If "columns", the first column is the time and each other column is
+        a trajectory, as in the logistic example. If "rows", each row is a
+        trajectory on a regular grid, as in the El Nino example.
+    delimiter : str
+        The delimiter of the values. If None, it is ";" or "," if the first
+        line contains one, otherwise any whitespace.
+
+    Returns
+    -------
+    processSample : ot.ProcessSample
+        The trajectories.
+    """
+    if layout not in ["columns", "rows"]:
+        raise ValueError("Unknown layout %s. Expect columns or rows." % (layout))
+    if delimiter is None:
+        with open(filename, "r") as f:
+            line = f.readline()
+        for candidate in [";", ","]:
+            if candidate in line:
+                delimiter = candidate
+                break
+    data = np.loadtxt(filename, delimiter=delimiter, ndmin=2)
+    if layout == "columns":
+        vertices = data[:, 0]
+        trajectories = data[:, 1:].T
+    else:
+        vertices = np.arange(data.shape[1], dtype=float)
+        trajectories = data
+    simplices = [[i, i + 1] for i in range(vertices.size - 1)]
+    mesh = ot.Mesh(ot.Sample(vertices[:, None]), simplices)
+    return ConvertArrayToProcessSample(mesh, trajectories)
+
+
+def _processFile(task):
+    """
+    Run the HDR of one file and write its results.
+
+    An error does not stop the other files: it is returned with the result,
+    together with a number of outliers equal to None.
+    """
+    filename, outputFilename, options = task
+    try:
+        return _runFile(filename, outputFilename, options) + (None,)
+    except Exception as error:
+        message = "%s: %s" % (type(error).__name__, error)
+        return filename, outputFilename, None, {}, message
+
+
+def _runFile(filename, outputFilename, options):
+    """Run the HDR of one file and write its results, or raise."""
+    profile = cProfile.Profile() if options["profile"] else None
+    if profile is not None:
+        profile.enable()
+    timings = {}
+    start = time.time()
+    ot.RandomGenerator.SetSeed(options["seed"])
+    processSample = ReadTrajectoriesFile(
+        filename, options["layout"], options["delimiter"]
+    )
+    timings["read"] = time.time() - start
+
+    start = time.time()
+    reduction = KarhunenLoeveDimensionReductionAlgorithm(
+        processSample, options["numberOfComponents"]
+    )
+    reduction.run()
+    reducedComponents = reduction.getReducedComponents()
+    distribution = ot.KernelSmoothing().build(reducedComponents)
+    timings["fit"] = time.time() - start
+
+    start = time.time()
+    hdr = ProcessHighDensityRegionAlgorithm(
+        processSample, reducedComponents, distribution, list(options["alphaLevels"])
+    )
+    if options["monteCarloSize"] is not None:
+        hdr.setThresholdAlgorithm(
+            MonteCarloThresholdAlgorithm(
+                options["monteCarloSize"], seed=options["seed"]
+            )
+        )
+    hdr.run()
+    timings["hdr"] = time.time() - start
+
+    vertexColumns = hdr.computeVertexColumns()
+    os.makedirs(os.path.dirname(outputFilename) or ".", exist_ok=True)
+    np.savez_compressed(
+        outputFilename,
+        vertices=vertexColumns["vertex"],
+        alpha_levels=np.array(hdr.alphaLevels),
+        pvalues=np.array(hdr.pvalues),
+        outlier_pvalue=np.array(hdr.getOutlierPValue()),
+        outlier_indices=np.asarray(hdr.computeIndices(), dtype=np.int32),
+        scores=hdr.computeOutlierScores(),
+        pdf=hdr.sample_pdf,
+        reduced_components=np.array(reducedComponents),
+        mode_index=np.array(hdr.getMode()),
+        mode=vertexColumns["mode"],
+        band_lower=vertexColumns["band_lower"],
+        band_upper=vertexColumns["band_upper"],
+    )
+    if profile is not None:
+        profile.disable()
+        profile.dump_stats(os.path.splitext(outputFilename)[0] + ".prof")
+    return filename, outputFilename, len(hdr.computeIndices()), timings
+
+
+def _computeOutputFilenames(filenames, outputDirectory):
+    """
+    Return the name of the result file of each input file.
+
+    The tree of the input files, relative to their common directory, is
+    mirrored in the output directory, so that files with the same base
+    name in different directories do not overwrite each other.
+    """
+    commonDirectory = os.path.commonpath(
+        [os.path.dirname(os.path.abspath(filename)) for filename in filenames]
+    )
+    outputFilenames = []
+    for filename in filenames:
+        relative = os.path.relpath(os.path.abspath(filename), commonDirectory)
+        outputFilename = os.path.splitext(relative)[0] + ".npz"
+        outputFilenames.append(os.path.join(outputDirectory, outputFilename))
+    return outputFilenames
+
+
+def _buildParser():
+    """Return the parser of the command line."""
+    parser = argparse.ArgumentParser(
+        prog="othdrplot",
+        description="Detect the outlier trajectories of curve files with the "
+        "functional high density region.",
+    )
+    parser.add_argument("patterns", nargs="+", help="The file names or glob patterns.")
+    parser.add_argument(
+        "-o",
+        "--output-directory",
+        default=".",
+        help="The directory of the .npz result files (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=["columns", "rows"],
+        default="columns",
+        help="columns: time in the first column and one trajectory per column; "
+        "rows: one trajectory per row (default: %(default)s).",
+    )
+    parser.add_argument("--delimiter", default=None, help="The delimiter of the values.")
+    parser.add_argument(
+        "-c",
+        "--components",
+        type=int,
+        default=2,
+        help="The number of K-L components (default: %(default)s).",
+    )
+    parser.add_argument(
+        "-a",
+        "--alpha",
+        type=float,
+        nargs="+",
+        default=[0.9, 0.5],
+        help="The alpha levels (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--monte-carlo-size",
+        type=int,
+        default=None,
+        help="Compute the thresholds by Monte-Carlo with this sample size "
+        "instead of minimum volume level sets.",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="The random seed (default: %(default)s)."
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="The number of worker processes (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the time of each stage and write a .prof cProfile file "
+        "next to each result file.",
+    )
+    return parser
+
+
+def main(argv=None):
+    """
+    Run the command line tool.
+
+    Parameters
+    ----------
+    argv : list(str)
+        The arguments. If None, the arguments of the command line.
+
+    Returns
+    -------
+    status : int
+        0 if all the files were processed, 1 otherwise.
+    """
+    arguments = _buildParser().parse_args(argv)
+    filenames = []
+    for pattern in arguments.patterns:
+        matches = sorted(glob.glob(pattern))
+        if len(matches) == 0:
+            print("No file matches %s" % (pattern), file=sys.stderr)
+            return 1
+        filenames.extend(matches)
+    # A file matched by several patterns is processed once
+    uniqueFilenames = {}
+    for filename in filenames:
+        uniqueFilenames.setdefault(os.path.realpath(filename), filename)
+    filenames = list(uniqueFilenames.values())
+    outputFilenames = _computeOutputFilenames(filenames, arguments.output_directory)
+    inputs = {}
+    for filename, outputFilename in zip(filenames, outputFilenames):
+        if outputFilename in inputs:
+            print(
+                "The files %s and %s would both be written to %s"
+                % (inputs[outputFilename], filename, outputFilename),
+                file=sys.stderr,
+            )
+            return 1
+        inputs[outputFilename] = filename
+    if arguments.jobs < 1:
+        print("The number of jobs must be at least 1.", file=sys.stderr)
+        return 1
+    os.makedirs(arguments.output_directory, exist_ok=True)
+    options = {
+        "layout": arguments.layout,
+        "delimiter": arguments.delimiter,
+        "numberOfComponents": arguments.components,
+        "alphaLevels": arguments.alpha,
+        "monteCarloSize": arguments.monte_carlo_size,
+        "seed": arguments.seed,
+        "profile": arguments.profile,
+    }
+    tasks = [
+        (filename, outputFilename, options)
+        for filename, outputFilename in zip(filenames, outputFilenames)
+    ]
+    start = time.time()
+    if arguments.jobs > 1:
+        with ProcessPoolExecutor(max_workers=arguments.jobs) as executor:
+            results = list(executor.map(_processFile, tasks))
+    else:
+        results = [_processFile(task) for task in tasks]
+    numberOfFailures = 0
+    for filename, outputFilename, numberOfOutliers, timings, error in results:
+        if error is not None:
+            print("%s: failed: %s" % (filename, error), file=sys.stderr)
+            numberOfFailures += 1
+            continue
+        print("%s: %d outliers -> %s" % (filename, numberOfOutliers, outputFilename))
+        if arguments.profile:
+            print(
+                "  read %.3f s, fit %.3f s, hdr %.3f s"
+                % (timings["read"], timings["fit"], timings["hdr"])
+            )
+    if arguments.profile:
+        print("Total: %d files in %.3f s" % (len(results), time.time() - start))
+    if numberOfFailures > 0:
+        print(
+            "%d of %d files failed." % (numberOfFailures, len(results)), file=sys.stderr
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Component to create CrossValidationKernelSmoothing.
+"""
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import numpy as np
+import openturns as ot
+from .gaussian_kernel_density import ComputeGaussianKernelPDF, ComputeSilvermanBandwidth
+
+
+def _binSample(x, numberOfBins):
+    """Return the means and the weights of the nonempty bins of a regular grid."""
+    size, dim = x.shape
+    lower = np.min(x, axis=0)
+    upper = np.max(x, axis=0)
+    width = np.where(upper > lower, upper - lower, 1.0)
+    cell = np.floor((x - lower) / width * numberOfBins).astype(int)
+    np.clip(cell, 0, numberOfBins - 1, out=cell)
+    flat_cell = np.ravel_multi_index(cell.T, (numberOfBins,) * dim)
+    cells, inverse, counts = np.unique(flat_cell, return_inverse=True, return_counts=True)
+    inverse = np.ravel(inverse)
+    sums = np.zeros((cells.size, dim))
+    np.add.at(sums, inverse, x)
+    return sums / counts[:, None], counts / float(size)
+
+
+def _computeFoldScores(task):
+    """Return the mean log-PDF of the test points of one fold for some bandwidths."""
+    centers, weights, test, test_weights, candidates = task
+    scores = []
+    for bandwidth in candidates:
+        pdf = ComputeGaussianKernelPDF(test, centers, bandwidth, weights)
+        log_pdf = np.log(np.maximum(pdf, np.finfo(float).tiny))
+        if test_weights is None:
+            scores.append(float(np.mean(log_pdf)))
+        else:
+            scores.append(float(np.dot(test_weights, log_pdf)))
+    return scores
+
+
+class CrossValidationKernelSmoothing:
+    """Kernel smoothing with a bandwidth selected by cross-validation."""
+
+    def __init__(
+        self,
+        bandwidthFactors=None,
+        numberOfFolds=5,
+        numberOfJobs=1,
+        binningThreshold=10000,
+        numberOfBins=64,
+        cacheSize=8,
+    ):
+        """
+        Select the bandwidth of a Gaussian kernel smoothing.
+
+        The candidate bandwidths are the Silverman bandwidth of the sample
+        multiplied by the bandwidth factors. The score of a candidate is
+        the mean log-PDF of the points of each fold with the kernel
+        smoothing of the other folds, averaged over the folds. The
+        folds are evaluated in a pool of processes. When there are fewer
+        folds than processes, the candidates are split into chunks and
+        each task evaluates one chunk on one fold, so that all the
+        processes are used; otherwise each task evaluates all the
+        candidates on one fold, so that each training fold is sent once.
+        When the training folds have more than binningThreshold points,
+        the training and test points are replaced by the means of the
+        nonempty cells of a regular grid, weighted by their number of
+        points.
+
+        The selected bandwidth and the scores are stored in a least
+        recently used cache: building again on one of the last cacheSize
+        samples with the same parameters does not repeat the
+        cross-validation.
+
+        Parameters
+        ----------
+        bandwidthFactors : sequence of float
+            The factors of the Silverman bandwidth.
+            If None, 13 factors logarithmically spaced in [0.2, 2].
+        numberOfFolds : int
+            The number of folds, at least 2.
+        numberOfJobs : int
+            The number of processes. If 1, no process is created.
+        binningThreshold : int
+            The training size above which the kernels are binned.
+        numberOfBins : int
+            The number of bins in each direction.
+        cacheSize : int
+            The maximum number of samples in the cache.
+        """
+        if bandwidthFactors is None:
+            bandwidthFactors = np.geomspace(0.2, 2.0, 13)
+        if len(bandwidthFactors) == 0:
+            raise ValueError("The number of bandwidth factors is zero.")
+        if numberOfFolds < 2:
+            raise ValueError(
+                "The number of folds must be at least 2, but is %d." % (numberOfFolds)
+            )
+        if cacheSize < 1:
+            raise ValueError("The cache size must be at least 1, but is %d." % (cacheSize))
+        self.bandwidthFactors = np.array(bandwidthFactors, dtype=float)
+        self.numberOfFolds = numberOfFolds
+        self.numberOfJobs = numberOfJobs
+        self.binningThreshold = binningThreshold
+        self.numberOfBins = numberOfBins
+        self.cacheSize = cacheSize
+
+        # Computed by build()
+        self.bandwidth = None
+        self.scores = None
+        self._cache = OrderedDict()
+
+    def computeBandwidth(self, sample):
+        """
+        Return the bandwidth which maximizes the cross-validation score.
+
+        Parameters
+        ----------
+        sample : ot.Sample
+            The sample.
+
+        Returns
+        -------
+        bandwidth : ot.Point
+            The selected bandwidth.
+        """
+        x = np.array(sample)
+        size = x.shape[0]
+        if size < self.numberOfFolds:
+            raise ValueError(
+                "The sample size %d is lower than the number of folds %d."
+                % (size, self.numberOfFolds)
+            )
+        key = (
+            x.shape,
+            hashlib.sha256(x.tobytes()).hexdigest(),
+            tuple(self.bandwidthFactors),
+            self.numberOfFolds,
+            self.binningThreshold,
+            self.numberOfBins,
+        )
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.bandwidth, self.scores = self._cache[key]
+            return ot.Point(self.bandwidth)
+
+        silverman = ComputeSilvermanBandwidth(sample)
+        candidates = [factor * silverman for factor in self.bandwidthFactors]
+        permutation = np.array(
+            ot.KPermutationsDistribution(size, size).getRealization(), dtype=int
+        )
+        folds = np.array_split(permutation, self.numberOfFolds)
+        # Split the candidates so that there are at least as many tasks
+        # as processes
+        numberOfChunks = -(-self.numberOfJobs // self.numberOfFolds)
+        numberOfChunks = max(1, min(numberOfChunks, len(candidates)))
+        chunks = np.array_split(np.arange(len(candidates)), numberOfChunks)
+        tasks = []
+        for k in range(self.numberOfFolds):
+            train = x[np.concatenate(folds[:k] + folds[k + 1 :])]
+            test = x[folds[k]]
+            if train.shape[0] > self.binningThreshold:
+                centers, weights = _binSample(train, self.numberOfBins)
+                test, test_weights = _binSample(test, self.numberOfBins)
+            else:
+                centers, weights, test_weights = train, None, None
+            for chunk in chunks:
+                chunk_candidates = [candidates[i] for i in chunk]
+                tasks.append((centers, weights, test, test_weights, chunk_candidates))
+
+        if self.numberOfJobs > 1:
+            with ProcessPoolExecutor(max_workers=self.numberOfJobs) as executor:
+                fold_scores = list(executor.map(_computeFoldScores, tasks))
+        else:
+            fold_scores = [_computeFoldScores(task) for task in tasks]
+        # The tasks are ordered by fold, then by chunk
+        fold_scores = np.reshape(
+            [score for scores in fold_scores for score in scores],
+            (self.numberOfFolds, len(candidates)),
+        )
+        self.scores = np.mean(fold_scores, axis=0)
+        self.bandwidth = candidates[int(np.argmax(self.scores))]
+        self._cache[key] = (self.bandwidth, self.scores)
+        if len(self._cache) > self.cacheSize:
+            self._cache.popitem(last=False)
+        return ot.Point(self.bandwidth)
+
+    def build(self, sample):
+        """
+        Fit a kernel smoothing with the cross-validated bandwidth.
+
+        Parameters
+        ----------
+        sample : ot.Sample
+            The sample.
+
+        Returns
+        -------
+        distribution : ot.Distribution
+            The kernel smoothing distribution.
+        """
+        bandwidth = self.computeBandwidth(sample)
+        return ot.KernelSmoothing().build(sample, bandwidth)
+
+    def getBandwidth(self):
+        """
+        Return the bandwidth selected by the last build().
+
+        Returns
+        -------
+        bandwidth : ot.Point
+            The bandwidth.
+        """
+        return ot.Point(self.bandwidth)
+
+    def getScores(self):
+        """
+        Return the cross-validation score of each bandwidth factor.
+
+        Returns
+        -------
+        scores : np.array
+            The mean log-PDF of the test points for each factor.
+        """
+        return self.scores
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Component to create DensityLookupTable.
+"""
+import numpy as np
+
+
+class DensityLookupTable:
+    """A tabulated density with the thresholds of a HDR."""
+
+    def __init__(
+        self, distribution, axes, values, pvalues, alphaLevels, batchSize=1000000
+    ):
+        """
+        Density tabulated on a regular grid.
+
+        Inside the grid, the PDF is the multilinear interpolation of the
+        tabulated values: its cost does not depend on the size of the
+        sample of a kernel smoothing. Outside the grid, it is the PDF of
+        the distribution. Use HighDensityRegionAlgorithm.computeDensityLookupTable()
+        to create it.
+
+        Parameters
+        ----------
+        distribution : ot.Distribution
+            The distribution, used outside the grid.
+        axes : list(np.array)
+            The regular coordinates of the grid along each axis.
+        values : np.array
+            The PDF on the grid, with shape (len(axes[0]), len(axes[1]), ...).
+        pvalues : np.array(k)
+            The threshold of each alpha level.
+        alphaLevels : list(float)
+            The alpha levels.
+        batchSize : int
+            The number of points interpolated together.
+        """
+        self.distribution = distribution
+        self.axes = [np.asarray(axis, dtype=float) for axis in axes]
+        self.values = np.asarray(values, dtype=float)
+        if self.values.shape != tuple(axis.size for axis in self.axes):
+            raise ValueError(
+                "The shape of the values is %s but the shape of the grid is %s."
+                % (self.values.shape, tuple(axis.size for axis in self.axes))
+            )
+        self.pvalues = np.asarray(pvalues, dtype=float)
+        self.alphaLevels = list(alphaLevels)
+        self.outlierAlpha = float(np.max(self.alphaLevels))
+        self.batchSize = batchSize
+        self.lower = np.array([axis[0] for axis in self.axes])
+        self.upper = np.array([axis[-1] for axis in self.axes])
+        self.steps = np.array([axis[1] - axis[0] for axis in self.axes])
+        if not np.all(self.steps > 0.0):
+            raise ValueError(
+                "The axes must be increasing, but the steps are %s." % (self.steps)
+            )
+        self.strides = np.array(
+            [np.prod(self.values.shape[k + 1 :], dtype=int) for k in range(len(self.axes))]
+        )
+        self.flat_values = np.ravel(self.values)
+        # The index of the last cell along each axis
+        self.maximumCells = np.array(self.values.shape, dtype=float) - 2.0
+        # The coordinates of the upper bounds in units of the steps,
+        # rounded as for the points
+        self.lastNodes = (self.upper - self.lower) / self.steps
+        # The offsets of the 2^d corners of a cell, in the order of the
+        # weights of _interpolate(): the first axis varies slowest
+        self.cornerOffsets = np.zeros(1, dtype=np.intp)
+        for stride in self.strides:
+            self.cornerOffsets = np.column_stack(
+                (self.cornerOffsets, self.cornerOffsets + stride)
+            ).ravel()
+
+    def _interpolate(self, t):
+        """
+        Return the multilinear interpolation of the table in the grid.
+
+        The points are given by their coordinates in units of the steps
+        of the grid, one row per axis. The array t is modified.
+        """
+        cells = np.floor(t)
+        np.clip(cells, 0.0, self.maximumCells[:, None], out=cells)
+        t -= cells
+        base = self.strides.dot(cells.astype(np.intp))
+        # Weights of the 2^d corners, built axis by axis as the offsets
+        weights = [None]
+        for k in range(t.shape[0]):
+            nextWeights = []
+            for weight in weights:
+                upper = t[k] if weight is None else weight * t[k]
+                lower = 1.0 - t[k] if weight is None else weight - upper
+                nextWeights.extend([lower, upper])
+            weights = nextWeights
+        pdf = np.zeros(t.shape[1])
+        index = np.empty_like(base)
+        for offset, weight in zip(self.cornerOffsets, weights):
+            np.add(base, offset, out=index)
+            values = self.flat_values.take(index)
+            values *= weight
+            pdf += values
+        return pdf
+
+    def computePDF(self, points):
+        """
+        Return the PDF of points.
+
+        Parameters
+        ----------
+        points : np.array(n, d)
+            The points.
+
+        Returns
+        -------
+        pdf : np.array(n)
+            The interpolated PDF in the grid, the PDF of the distribution
+            outside.
+        """
+        points = np.asarray(points, dtype=float)
+        if points.ndim == 1:
+            points = points[:, None]
+        pdf = np.empty(points.shape[0])
+        for start in range(0, points.shape[0], self.batchSize):
+            batch = points[start : start + self.batchSize]
+            # Grid coordinates, one contiguous row per axis
+            t = np.empty((batch.shape[1], batch.shape[0]))
+            np.subtract(batch.T, self.lower[:, None], out=t)
+            t /= self.steps[:, None]
+            if np.min(t) >= 0.0 and np.all(np.max(t, axis=1) <= self.lastNodes):
+                # All the points are in the grid
+                pdf[start : start + self.batchSize] = self._interpolate(t)
+                continue
+            inside = np.all((t >= 0.0) & (t <= self.lastNodes[:, None]), axis=0)
+            batch_pdf = np.empty(batch.shape[0])
+            batch_pdf[inside] = self._interpolate(t[:, inside])
+            outside = batch[~inside]
+            batch_pdf[~inside] = np.ravel(self.distribution.computePDF(outside))
+            pdf[start : start + self.batchSize] = batch_pdf
+        return pdf
+
+    def computeLevelMembership(self, points):
+        """
+        Return the innermost high density region which contains each point.
+
+        Parameters
+        ----------
+        points : np.array(n, d)
+            The points.
+
+        Returns
+        -------
+        labels : np.array(n, int)
+            For each point, the index in alphaLevels of the smallest region
+            which contains it, or -1 if it is in none of them.
+        """
+        order = np.argsort(self.pvalues, kind="stable")
+        count = np.searchsorted(self.pvalues[order], self.computePDF(points), side="right")
+        labels = np.full(count.size, -1, dtype=int)
+        inside = count > 0
+        labels[inside] = order[count[inside] - 1]
+        return labels
+
+    def computeOutlierFlags(self, points):
+        """
+        Return True for the outliers.
+
+        Parameters
+        ----------
+        points : np.array(n, d)
+            The points.
+
+        Returns
+        -------
+        flag : np.array(n, bool)
+            True if the point is not in the region of the outlier alpha level.
+        """
+        outlierPvalue = self.pvalues[self.alphaLevels.index(self.outlierAlpha)]
+        return self.computePDF(points) < outlierPvalue
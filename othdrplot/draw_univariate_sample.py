@@ -5,10 +5,43 @@ Created on Fri Feb 12 23:30:42 2021
 
 @author: devel
 """
+import numpy as np
 import openturns as ot
+from .univariate_high_density_region_algorithm import (
+    UnivariateHighDensityRegionAlgorithm,
+)
 
 
-def DrawUnivariateSampleDistribution(sample, distribution):
+def _drawHistogramStrip(x, numberOfBins, height, color):
+    """Return the histogram of the points as bars below the X axis."""
+    counts, edges = np.histogram(x, bins=numberOfBins)
+    nonempty = np.where(counts > 0)[0]
+    scaled = height * counts[nonempty] / np.max(counts)
+    polygons = [
+        ot.Polygon(
+            [[edges[k], 0.0], [edges[k + 1], 0.0], [edges[k + 1], -h], [edges[k], -h]],
+            color,
+            color,
+        )
+        for k, h in zip(nonempty, scaled)
+    ]
+    return ot.PolygonArray(polygons)
+
+
+def _computeAxisPoints(x):
+    """Return the points of the X axis as one (n, 2) array."""
+    points = np.zeros((x.size, 2))
+    points[:, 0] = x
+    return points
+
+
+def DrawUnivariateSampleDistribution(
+    sample,
+    distribution,
+    alphaLevels=None,
+    numberOfBins=None,
+    maximumNumberOfMarkers=None,
+):
     """
     Draw a unidimensional sample and its distribution.
     
@@ -18,6 +51,22 @@ def DrawUnivariateSampleDistribution(sample, distribution):
         A dimension 1 sample.
     distribution : ot.Distribution
         A dimension 1 distribution.
+    alphaLevels : list(float)
+        If not None, the alpha levels of the high density regions drawn
+        as intervals at the height of their threshold. The inliers and
+        the outliers of the maximum alpha level are drawn with
+        different colors.
+    numberOfBins : int
+        If not None, the sample is drawn as a histogram strip below the
+        X axis with this number of bins, and points are drawn only if
+        maximumNumberOfMarkers is set. The drawing cost then depends on
+        the number of bins instead of the sample size.
+    maximumNumberOfMarkers : int
+        If not None, the maximum number of points drawn on the X axis.
+        The points are selected at random without replacement. If None,
+        every point is drawn as a marker: the clouds then hold n x 2
+        arrays, so that their memory grows as the sample size. With
+        numberOfBins, no marker is drawn unless this is set.
 
     Returns
     -------
@@ -28,11 +77,43 @@ def DrawUnivariateSampleDistribution(sample, distribution):
         raise ValueError("Expect a 1 dimension sample, but dimension is %d" % (sample.getDimension()))
     if distribution.getDimension()!=1:
         raise ValueError("Expect a 1 dimension distribution, but dimension is %d" % (distribution.getDimension()))
-    graph = distribution.drawPDF()
-    # Add points on X axis
+    if alphaLevels is not None:
+        # Only the thresholds: the PDF is not evaluated on the sample
+        algo = UnivariateHighDensityRegionAlgorithm(sample, distribution, alphaLevels)
+        algo.computeRegions()
+        graph = algo.draw(drawInliers=False, drawOutliers=False)
+    else:
+        graph = distribution.drawPDF()
     sample_size = sample.getSize()
-    data = ot.Sample(sample_size, 2)
-    data[:, 0] = sample
-    cloud = ot.Cloud(data)
-    graph.add(cloud)
+    x = np.ravel(np.asarray(sample))
+
+    # Add a histogram strip below the X axis
+    if numberOfBins is not None:
+        bounding_box = graph.getBoundingBox()
+        height = 0.1 * bounding_box.getUpperBound()[1]
+        graph.add(_drawHistogramStrip(x, numberOfBins, height, "gray"))
+        if maximumNumberOfMarkers is None:
+            return graph
+
+    # Select the points
+    if maximumNumberOfMarkers is not None and sample_size > maximumNumberOfMarkers:
+        selection = ot.KPermutationsDistribution(maximumNumberOfMarkers, sample_size)
+        x = x[np.sort(np.array(selection.getRealization(), dtype=int))]
+
+    # Add points on X axis
+    if alphaLevels is None:
+        graph.add(ot.Cloud(_computeAxisPoints(x)))
+        return graph
+    is_inlier = algo.computeIntervalMembership(x, algo.getIntervals())
+    for outlierFlag in [False, True]:
+        selected = x[is_inlier != outlierFlag]
+        if selected.size == 0:
+            continue
+        cloud = ot.Cloud(_computeAxisPoints(selected))
+        if outlierFlag:
+            cloud.setColor(algo.outlier_color)
+        else:
+            cloud.setColor(algo.inlier_color)
+        cloud.setPointStyle(algo.data_marker)
+        graph.add(cloud)
     return graph
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Vectorized evaluation of Gaussian kernel densities.
+"""
+import numpy as np
+import openturns as ot
+
+
+def GetGaussianKernelParameters(distribution):
+    """
+    Return the centers, bandwidth and weights of a Gaussian kernel density.
+
+    The distribution can be a KernelMixture with a Normal kernel, as
+    built by ot.KernelSmoothing, an independent Normal distribution, or
+    a Mixture of such distributions sharing the same standard deviations,
+    as built by ot.KernelSmoothing with binning.
+
+    Parameters
+    ----------
+    distribution : ot.Distribution
+        The distribution.
+
+    Returns
+    -------
+    parameters : tuple(np.array(n, d), np.array(d), np.array(n)) or None
+        The kernel centers, the bandwidth and the weights of the kernels.
+        None if the distribution is not a Gaussian kernel density.
+    """
+    implementation = ot.Distribution(distribution).getImplementation()
+    className = implementation.getClassName()
+    if className == "KernelMixture":
+        kernel = implementation.getKernel()
+        if kernel.getImplementation().getClassName() != "Normal":
+            return None
+        # The kernel is a standard univariate distribution scaled by
+        # the bandwidth
+        kernel_std = kernel.getStandardDeviation()[0]
+        centers = np.array(implementation.getInternalSample())
+        bandwidth = np.array(implementation.getBandwidth()) * kernel_std
+        weights = np.full(centers.shape[0], 1.0 / centers.shape[0])
+        return centers, bandwidth, weights
+    if className == "Normal":
+        if distribution.getDimension() > 1 and not distribution.hasIndependentCopula():
+            return None
+        centers = np.array(distribution.getMean())[None, :]
+        bandwidth = np.array(distribution.getStandardDeviation())
+        return centers, bandwidth, np.ones(1)
+    if className == "Mixture":
+        atoms = implementation.getDistributionCollection()
+        atom_weights = np.array(implementation.getWeights())
+        centers = []
+        weights = []
+        bandwidth = None
+        for atom, atom_weight in zip(atoms, atom_weights):
+            parameters = GetGaussianKernelParameters(atom)
+            if parameters is None:
+                return None
+            if bandwidth is None:
+                bandwidth = parameters[1]
+            elif not np.allclose(parameters[1], bandwidth):
+                return None
+            centers.append(parameters[0])
+            weights.append(atom_weight * parameters[2])
+        return np.vstack(centers), bandwidth, np.concatenate(weights)
+    return None
+
+
+def ComputeGaussianKernelPDF(points, centers, bandwidth, weights=None, batchSize=1024):
+    """
+    Evaluate a Gaussian product kernel density at a set of points.
+
+    Parameters
+    ----------
+    points : np.array(m, d)
+        The points where the density is evaluated.
+    centers : np.array(n, d)
+        The centers of the kernels.
+    bandwidth : np.array(d)
+        The standard deviation of the kernels in each direction.
+    weights : np.array(n)
+        The weights of the kernels. If None, the weights are equal.
+    batchSize : int
+        The number of points evaluated together. The memory used is
+        proportional to batchSize times the number of centers.
+
+    Returns
+    -------
+    pdf : np.array(m)
+        The density at each point.
+    """
+    points = np.asarray(points, dtype=float)
+    centers = np.asarray(centers, dtype=float)
+    bandwidth = np.asarray(bandwidth, dtype=float)
+    if points.ndim == 1:
+        points = points[:, None]
+    if centers.ndim == 1:
+        centers = centers[:, None]
+    n_centers, dim = centers.shape
+    if weights is None:
+        weights = np.full(n_centers, 1.0 / n_centers)
+    scaled_centers = centers / bandwidth
+    centers_norm2 = np.sum(scaled_centers ** 2, axis=1)
+    normalization = (2.0 * np.pi) ** (-0.5 * dim) / np.prod(bandwidth)
+    pdf = np.empty(points.shape[0])
+    for start in range(0, points.shape[0], batchSize):
+        scaled_points = points[start : start + batchSize] / bandwidth
+        squared_distance = (
+            np.sum(scaled_points ** 2, axis=1)[:, None]
+            + centers_norm2[None, :]
+            - 2.0 * scaled_points.dot(scaled_centers.T)
+        )
+        np.maximum(squared_distance, 0.0, out=squared_distance)
+        pdf[start : start + batchSize] = np.exp(-0.5 * squared_distance).dot(weights)
+    return pdf * normalization
+
+
+def ComputeGaussianMeanShift(
+    seeds,
+    centers,
+    bandwidth,
+    weights=None,
+    maximumIterations=100,
+    tolerance=1.0e-6,
+):
+    """
+    Move points uphill to the local modes of a Gaussian kernel density.
+
+    Each iteration replaces every point by the mean of the kernel
+    centers weighted by the kernels evaluated at the point. All the
+    seeds are updated together with matrix products, until they move
+    less than the tolerance.
+
+    Parameters
+    ----------
+    seeds : np.array(m, d)
+        The starting points.
+    centers : np.array(n, d)
+        The centers of the kernels.
+    bandwidth : np.array(d)
+        The standard deviation of the kernels in each direction.
+    weights : np.array(n)
+        The weights of the kernels. If None, the weights are equal.
+    maximumIterations : int
+        The maximum number of iterations.
+    tolerance : float
+        A seed is not updated anymore when its move, relative to the
+        bandwidth, is lower than this tolerance.
+
+    Returns
+    -------
+    modes : np.array(m, d)
+        The local mode reached from each seed.
+    """
+    centers = np.asarray(centers, dtype=float)
+    bandwidth = np.asarray(bandwidth, dtype=float)
+    if weights is None:
+        weights = np.full(centers.shape[0], 1.0 / centers.shape[0])
+    scaled_centers = centers / bandwidth
+    centers_norm2 = np.sum(scaled_centers ** 2, axis=1)
+    x = np.array(seeds, dtype=float) / bandwidth
+    active = np.arange(x.shape[0])
+    for _ in range(maximumIterations):
+        if active.size == 0:
+            break
+        x_active = x[active]
+        squared_distance = (
+            np.sum(x_active ** 2, axis=1)[:, None]
+            + centers_norm2[None, :]
+            - 2.0 * x_active.dot(scaled_centers.T)
+        )
+        # Shift each row to avoid underflow far from the centers
+        squared_distance -= np.min(squared_distance, axis=1)[:, None]
+        kernel = np.exp(-0.5 * squared_distance) * weights
+        x_new = kernel.dot(scaled_centers) / np.sum(kernel, axis=1)[:, None]
+        move = np.max(np.abs(x_new - x_active), axis=1)
+        x[active] = x_new
+        # Only the seeds which still move are updated at next iteration
+        active = active[move >= tolerance]
+    return x * bandwidth
+
+
+def ComputeSilvermanBandwidth(sample):
+    """
+    Return the Silverman rule of thumb bandwidth of a Normal kernel.
+
+    Parameters
+    ----------
+    sample : ot.Sample
+        The sample.
+
+    Returns
+    -------
+    bandwidth : np.array(d)
+        The bandwidth in each direction.
+    """
+    return np.array(ot.KernelSmoothing().computeSilvermanBandwidth(sample))
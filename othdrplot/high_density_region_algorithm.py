@@ -3,8 +3,20 @@
 """
 Component to create HighDensityRegionAlgorithm.
 """
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import openturns as ot
+import matplotlib.pyplot as plt
+from .gaussian_kernel_density import (
+    GetGaussianKernelParameters,
+    ComputeGaussianMeanShift,
+    ComputeSilvermanBandwidth,
+)
+from .density_lookup_table import DensityLookupTable
+from .matplotlib_rendering import (
+    ConvertColorToMatplotlib,
+    ConvertMarkerToMatplotlib,
+)
 
 
 class HighDensityRegionAlgorithm:
@@ -48,22 +60,90 @@ class HighDensityRegionAlgorithm:
         self.contour_color = "black"
         self.outlier_color = "firebrick3"
         self.inlier_color = "forestgreen"
+        # The colors of the inliers of each level when colored by level
+        # (a default palette if None)
+        self.level_colors = None
 
         self.sample = sample
         self.distribution = distribution
         self.dim = sample.getDimension()
 
+        # Incremental update: refresh the thresholds after this number of
+        # new points (never refresh if None)
+        self.driftBudget = None
+
+        # The algorithm of the thresholds (minimum volume level sets if None)
+        self.thresholdAlgorithm = None
+
+        # Compact storage: float32 points, int32 index arrays, PDF
+        # computed by batches
+        self.compactStorage = False
+        self.pdfBatchSize = 100000
+        self._points = None
+        self._numberOfPoints = 0
+        self._description = None
+
         # Computed by the algorithm
         self.pvalues = None
         self.levelsets = []
         self.outlierPvalue = None
         self.outlier_levelset = None
+        self.sample_pdf = None
+        self.local_mode_indices = None
+        self.numberOfPointsSinceRefresh = 0
+        self._pendingDistribution = None
+        self._sampleIsOwned = False
+        self._contour_grids = {}
+        # The buffers of the arrays extended by update()
+        self._buffers = {}
 
     def run(self):
         """Compute pvalues and level sets."""
+        self._applyPendingDistribution()
+        self._contour_grids = {}
+        if self.thresholdAlgorithm is not None:
+            # Thresholds only: the points are classified with their PDF
+            self.pvalues = np.array(
+                self.thresholdAlgorithm.computeThresholds(
+                    self.distribution, self.alphaLevels
+                ),
+                dtype=float,
+            )
+            self.levelsets = []
+            self.outlierPvalue = float(self.pvalues[int(np.argmax(self.alphaLevels))])
+            self.outlier_levelset = None
+        else:
+            self._computeLevelSets()
+
+        # Compute the modal level set
+        self.sample_pdf = self._computeSamplePDF(self._getPoints())
+        self.idx_mode = int(np.argmax(self.sample_pdf))
+        self.local_mode_indices = None
+
+        # Compute inliers and outliers indices
+        if self.compactStorage or self.outlier_levelset is None:
+            # Reuse the PDF instead of evaluating the level set
+            flag = self.sample_pdf >= self.outlierPvalue
+        else:
+            flag = np.array(self.outlier_levelset.contains(self.sample)) != 0
+        # Compute outliers
+        self.outlier_indices = self._convertIndices(np.where(~flag)[0])
+        # Compute inliers
+        self.inlier_indices = self._convertIndices(np.where(flag)[0])
+        self.numberOfPointsSinceRefresh = 0
+
+    def _applyPendingDistribution(self):
+        """Use the distribution given to update(), if any, from now on."""
+        if self._pendingDistribution is not None:
+            self.distribution = self._pendingDistribution
+            self._pendingDistribution = None
+
+    def _computeLevelSets(self):
+        """Compute the minimum volume level sets and their thresholds."""
         n_contour_lines = len(self.alphaLevels)
         # Compute the regular level sets
         self.pvalues = np.zeros(n_contour_lines)
+        self.levelsets = []
         for i in range(n_contour_lines):
             (
                 levelset,
@@ -82,18 +162,267 @@ class HighDensityRegionAlgorithm:
         self.outlierPvalue = pvalue
         self.outlier_levelset = levelset
 
-        # Compute the modal level set
-        pdf = np.array(self.distribution.computePDF(self.sample))
-        self.idx_mode = int(np.argmax(pdf))
-        
-        # Compute inliers and outliers indices
-        flag = self.outlier_levelset.contains(self.sample)
-        # Compute outliers
-        sample_idx = np.where(np.array(flag) == 0)[0]
-        self.outlier_indices = [int(i) for i in sample_idx]
-        # Compute inliers
-        sample_idx = np.where(np.array(flag) != 0)[0]
-        self.inlier_indices = [int(i) for i in sample_idx]
+    def _computeSamplePDF(self, sample):
+        """Return the PDF of the points, by batches in compact storage."""
+        if not self.compactStorage:
+            return np.ravel(self.distribution.computePDF(sample))
+        data = np.asarray(sample)
+        pdf = np.empty(data.shape[0])
+        for start in range(0, data.shape[0], self.pdfBatchSize):
+            stop = start + self.pdfBatchSize
+            batch = np.asarray(data[start:stop], dtype=float)
+            pdf[start:stop] = np.ravel(self.distribution.computePDF(batch))
+        return pdf
+
+    def _getPoints(self):
+        """Return the sample: a float32 array in compact storage."""
+        if self.compactStorage:
+            return self._points[: self._numberOfPoints]
+        return self.sample
+
+    def _getDescription(self):
+        """Return the description of the components of the sample."""
+        if self.compactStorage:
+            return self._description
+        return self.sample.getDescription()
+
+    @staticmethod
+    def _appendRows(array, size, rows):
+        """
+        Append rows after the first size rows of an array.
+
+        The capacity of the array is at least doubled when it is full, so
+        that appending by small batches has a linear cost.
+        """
+        rows = np.asarray(rows, dtype=array.dtype)
+        if size + rows.shape[0] > array.shape[0]:
+            capacity = max(size + rows.shape[0], 2 * array.shape[0])
+            grown = np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:size] = array[:size]
+            array = grown
+        array[size : size + rows.shape[0]] = rows
+        return array
+
+    def _extendArray(self, name, values):
+        """
+        Append values to an array attribute, without copying it if possible.
+
+        The attribute is a view of the first elements of a buffer, extended
+        with _appendRows(). An attribute assigned by run() is used as the
+        buffer.
+        """
+        array = getattr(self, name)
+        buffer = self._buffers.get(name)
+        if buffer is None or (array is not buffer and array.base is not buffer):
+            buffer = array
+        buffer = self._appendRows(buffer, array.shape[0], values)
+        self._buffers[name] = buffer
+        setattr(self, name, buffer[: array.shape[0] + len(values)])
+
+    def _convertIndices(self, indices):
+        """Return the indices as stored: an int32 array in compact storage."""
+        if self.compactStorage:
+            return np.asarray(indices, dtype=np.int32)
+        return [int(i) for i in indices]
+
+    def update(self, newPoints, distribution=None):
+        """
+        Append new points and score them against the current thresholds.
+
+        Only the new points are evaluated: their PDF is compared to the
+        outlier p-value computed by run() and the mode index is updated
+        if one of them has a higher density than the current mode. The
+        PDF and the indices are extended in place, in buffers whose
+        capacity grows geometrically, so that the cost of an update does
+        not depend on the number of previous points.
+        The level sets, the p-values and the PDF of the previous points are
+        left unchanged until the number of points appended since the
+        last refresh exceeds the drift budget. Then, if a refitted
+        distribution was given, run() is called again with it. The
+        thresholds only depend on the distribution, so that nothing is
+        recomputed otherwise.
+
+        Parameters
+        ----------
+        newPoints : ot.Sample
+            The points to append to the sample.
+        distribution : ot.Distribution
+            If not None, a distribution refitted on the updated sample.
+            It replaces the current distribution at the next refresh or
+            call to run(). Until then, the new points are scored with the
+            current distribution, so that their PDF is consistent with the
+            thresholds.
+        """
+        if self.pvalues is None:
+            raise ValueError("The run() method must be called before update().")
+        newPoints = ot.Sample(newPoints)
+        if newPoints.getDimension() != self.dim:
+            raise ValueError(
+                "The dimension of the new points is %d but "
+                "the dimension of the sample is %d."
+                % (newPoints.getDimension(), self.dim)
+            )
+        if distribution is not None:
+            if distribution.getDimension() != self.dim:
+                raise ValueError(
+                    "The dimension of the distribution is %d but "
+                    "the dimension of the sample is %d."
+                    % (distribution.getDimension(), self.dim)
+                )
+            self._pendingDistribution = distribution
+
+        if self.compactStorage:
+            offset = self._numberOfPoints
+            self._points = self._appendRows(self._points, offset, newPoints)
+            self._numberOfPoints += newPoints.getSize()
+        else:
+            # Do not modify the sample of the caller
+            if not self._sampleIsOwned:
+                self.sample = ot.Sample(self.sample)
+                self._sampleIsOwned = True
+            offset = self.sample.getSize()
+            self.sample.add(newPoints)
+
+        # Score the new points only
+        new_pdf = self._computeSamplePDF(newPoints)
+        self._extendArray("sample_pdf", new_pdf)
+        if new_pdf.size > 0:
+            idx_new_mode = int(np.argmax(new_pdf))
+            if new_pdf[idx_new_mode] > self.sample_pdf[self.idx_mode]:
+                self.idx_mode = offset + idx_new_mode
+        self.local_mode_indices = None
+        self._contour_grids = {}
+        flag = new_pdf >= self.outlierPvalue
+        new_outlier_indices = self._convertIndices(offset + np.where(~flag)[0])
+        new_inlier_indices = self._convertIndices(offset + np.where(flag)[0])
+        if self.compactStorage:
+            self._extendArray("outlier_indices", new_outlier_indices)
+            self._extendArray("inlier_indices", new_inlier_indices)
+        else:
+            self.outlier_indices.extend(new_outlier_indices)
+            self.inlier_indices.extend(new_inlier_indices)
+
+        # Refresh the thresholds if the drift budget is exhausted
+        self.numberOfPointsSinceRefresh += newPoints.getSize()
+        if (
+            self.driftBudget is not None
+            and self.numberOfPointsSinceRefresh > self.driftBudget
+        ):
+            if self._pendingDistribution is not None:
+                self.run()
+            else:
+                # Same distribution, hence same thresholds
+                self.numberOfPointsSinceRefresh = 0
+
+    def setDriftBudget(self, driftBudget):
+        """
+        Set the number of new points after which update() refreshes thresholds.
+
+        Parameters
+        ----------
+        driftBudget : int or None
+            The maximum number of points appended by update() before
+            run() is called again. If None, the thresholds are never
+            refreshed by update().
+        """
+        if driftBudget is not None and driftBudget < 0:
+            raise ValueError(
+                "The drift budget must be nonnegative, but is %d." % (driftBudget)
+            )
+        self.driftBudget = driftBudget
+
+    def getDriftBudget(self):
+        """
+        Return the number of new points after which update() refreshes thresholds.
+
+        Returns
+        -------
+        driftBudget : int or None
+            The drift budget.
+        """
+        return self.driftBudget
+
+    def setCompactStorage(self, compactStorage):
+        """
+        Set the compact storage mode.
+
+        In compact storage, the sample is converted once to a contiguous
+        float32 array and the sample attribute is set to None, so that
+        the algorithm no longer holds the double precision sample. The
+        points appended by update() are stored in this array, whose
+        capacity grows geometrically. The inlier and outlier indices are
+        int32 arrays instead of lists, the PDF of the sample is computed by
+        batches of pdfBatchSize points and the outliers are selected from
+        this PDF instead of a second evaluation by the outlier level set.
+        It must be set before run(). Unsetting it converts the points back
+        to an ot.Sample, with the float32 precision.
+
+        The conversion starts from the double precision sample given to the
+        constructor, so that the peak memory is not reduced: only the memory
+        held by the algorithm afterwards is, once the caller releases its
+        sample.
+
+        Parameters
+        ----------
+        compactStorage : bool
+            If True, use the compact storage.
+        """
+        if self.pvalues is not None:
+            raise ValueError("The compact storage must be set before run().")
+        if compactStorage and not self.compactStorage:
+            self._points = np.array(self.sample, dtype=np.float32)
+            self._numberOfPoints = self._points.shape[0]
+            self._description = self.sample.getDescription()
+            self.sample = None
+        elif not compactStorage and self.compactStorage:
+            self.sample = ot.Sample(np.asarray(self._getPoints(), dtype=float))
+            self.sample.setDescription(self._description)
+            self._sampleIsOwned = True
+            self._points = None
+            self._numberOfPoints = 0
+            self._description = None
+        self.compactStorage = compactStorage
+
+    def getCompactStorage(self):
+        """
+        Return the compact storage mode.
+
+        Returns
+        -------
+        compactStorage : bool
+            True if the storage is compact.
+        """
+        return self.compactStorage
+
+    def setThresholdAlgorithm(self, thresholdAlgorithm):
+        """
+        Set the algorithm which computes the thresholds.
+
+        By default, the thresholds are computed with the minimum volume
+        level sets of the distribution. Another algorithm, e.g. an
+        ImportanceSamplingThresholdAlgorithm for high alpha levels, only
+        computes the thresholds: then there are no level sets and the
+        points are classified by comparing their PDF to the thresholds.
+
+        Parameters
+        ----------
+        thresholdAlgorithm : object or None
+            An object with a computeThresholds(distribution, alphaLevels)
+            method which returns the threshold of each alpha level.
+            If None, use the minimum volume level sets.
+        """
+        self.thresholdAlgorithm = thresholdAlgorithm
+
+    def getThresholdAlgorithm(self):
+        """
+        Return the algorithm which computes the thresholds.
+
+        Returns
+        -------
+        thresholdAlgorithm : object or None
+            The algorithm, or None for the minimum volume level sets.
+        """
+        return self.thresholdAlgorithm
 
     def getMode(self):
         """
@@ -108,6 +437,116 @@ class HighDensityRegionAlgorithm:
         """
         return self.idx_mode
 
+    def computeModes(self, numberOfModes):
+        """
+        Return the indices of the points with highest density.
+
+        The points are selected with a partial sort of the PDF of the
+        sample computed by run(), without any other density evaluation.
+
+        Parameters
+        ----------
+        numberOfModes : int
+            The number of points.
+
+        Returns
+        -------
+        indices : list(int)
+            The indices of the points in the sample, by decreasing density.
+        """
+        size = self.sample_pdf.size
+        if numberOfModes < 1 or numberOfModes > size:
+            raise ValueError(
+                "The number of modes must be in [1, %d], but is %d."
+                % (size, numberOfModes)
+            )
+        if numberOfModes < size:
+            indices = np.argpartition(-self.sample_pdf, numberOfModes - 1)
+            indices = indices[:numberOfModes]
+        else:
+            indices = np.arange(size)
+        indices = indices[np.argsort(-self.sample_pdf[indices], kind="stable")]
+        return [int(i) for i in indices]
+
+    def computeLocalModes(
+        self, maximumIterations=100, tolerance=1.0e-6, numberOfJobs=1, batchSize=256
+    ):
+        """
+        Return the indices of the points which represent the local modes.
+
+        A mean shift is started from every point of the sample. If the
+        distribution is a Gaussian kernel density, e.g. built by
+        ot.KernelSmoothing, the mean shift uses its kernels. Otherwise,
+        it uses Gaussian kernels centered on the sample with the Silverman
+        bandwidth. The points which converge to the same local mode,
+        within half a bandwidth, form a cluster and the point of the
+        cluster which has highest PDF represents the local mode.
+
+        Parameters
+        ----------
+        maximumIterations : int
+            The maximum number of mean shift iterations.
+        tolerance : float
+            The tolerance on the move of the points, relative to the bandwidth.
+        numberOfJobs : int
+            The number of threads which share the batches of seeds.
+        batchSize : int
+            The number of seeds updated together.
+
+        Returns
+        -------
+        indices : list(int)
+            The indices of the points in the sample, by decreasing density.
+        """
+        parameters = GetGaussianKernelParameters(self.distribution)
+        if parameters is None:
+            centers = np.array(self._getPoints(), dtype=float)
+            bandwidth = ComputeSilvermanBandwidth(centers)
+            weights = None
+        else:
+            centers, bandwidth, weights = parameters
+
+        def mean_shift(seeds):
+            return ComputeGaussianMeanShift(
+                seeds, centers, bandwidth, weights, maximumIterations, tolerance
+            )
+
+        seeds = np.array(self._getPoints(), dtype=float)
+        batches = [
+            seeds[start : start + batchSize]
+            for start in range(0, seeds.shape[0], batchSize)
+        ]
+        if numberOfJobs > 1:
+            with ThreadPoolExecutor(max_workers=numberOfJobs) as executor:
+                converged = list(executor.map(mean_shift, batches))
+        else:
+            converged = [mean_shift(batch) for batch in batches]
+        converged = np.vstack(converged) / bandwidth
+
+        # Merge the points of neighbouring cells, then the cells which are
+        # closer than half a bandwidth
+        cells, cell_of_point = np.unique(
+            np.round(converged / 0.25), axis=0, return_inverse=True
+        )
+        cell_of_point = np.ravel(cell_of_point)
+        cells = cells * 0.25
+        cluster_of_cell = np.full(cells.shape[0], -1)
+        number_of_clusters = 0
+        for k in range(cells.shape[0]):
+            if cluster_of_cell[k] >= 0:
+                continue
+            distance = np.sqrt(np.sum((cells - cells[k]) ** 2, axis=1))
+            cluster_of_cell[(distance < 0.5) & (cluster_of_cell < 0)] = number_of_clusters
+            number_of_clusters += 1
+        cluster_of_point = cluster_of_cell[cell_of_point]
+
+        # The representative of each cluster is its point of highest PDF
+        order = np.argsort(-self.sample_pdf, kind="stable")
+        clusters, first = np.unique(cluster_of_point[order], return_index=True)
+        indices = order[np.sort(first)]
+        self.local_mode_indices = [int(i) for i in indices]
+        return self.local_mode_indices
+
     def computeIndices(self, outlierFlag=True):
         """
         Get inlier or outlier indices.
@@ -129,7 +568,8 @@ class HighDensityRegionAlgorithm:
         Returns
         -------
         indices : list(int)
-            The indices of selected points in the sample.
+            The indices of selected points in the sample: a new list, which
+            update() does not extend, or an int32 array in compact storage.
         """
         if outlierFlag:
             # Compute outliers
@@ -137,7 +577,125 @@ class HighDensityRegionAlgorithm:
         else:
             # Compute inliers
             indices = self.inlier_indices
-        return indices
+        if self.compactStorage:
+            return indices
+        return list(indices)
+
+    def computeLevelMembership(self):
+        """
+        Return the innermost high density region which contains each point.
+
+        The membership is computed with a single search of the PDF of the
+        sample, computed by run(), in the sorted p-values: there is no
+        other density evaluation. The outlier p-value is used for the
+        outlier alpha level, so that the points in no region are the
+        outliers.
+
+        Returns
+        -------
+        labels : np.array(n, int)
+            For each point, the index in alphaLevels of the smallest region
+            which contains it, or -1 if it is in none of them.
+        """
+        pvalues = np.array(self.pvalues, dtype=float)
+        pvalues[np.array(self.alphaLevels) == self.outlierAlpha] = self.outlierPvalue
+        # The regions which contain a point are those with a p-value lower
+        # than its PDF: the innermost one has the greatest p-value
+        order = np.argsort(pvalues, kind="stable")
+        count = np.searchsorted(pvalues[order], self.sample_pdf, side="right")
+        labels = np.full(self.sample_pdf.size, -1, dtype=int)
+        inside = count > 0
+        labels[inside] = order[count[inside] - 1]
+        return labels
+
+    def computeOutlierScores(self):
+        """
+        Return the outlier score of each point.
+
+        The score of a point is the alpha level of the innermost high
+        density region which contains it, or 1 if it is in none of them:
+        the greater the score, the more extreme the point.
+        See computeLevelMembership().
+
+        Returns
+        -------
+        scores : np.array(n)
+            The score of each point in the sample.
+        """
+        labels = self.computeLevelMembership()
+        alphas = np.append(np.array(self.alphaLevels, dtype=float), 1.0)
+        # The label -1 selects the last alpha, equal to 1
+        return alphas[labels]
+
+    def computeOutlierRanking(self, numberOfPoints=None):
+        """
+        Return the indices of the points, from the most extreme.
+
+        The points are sorted by increasing PDF, computed by run().
+
+        Parameters
+        ----------
+        numberOfPoints : int
+            The number of indices. If None, all the points are ranked.
+
+        Returns
+        -------
+        indices : list(int)
+            The indices of the points in the sample, by increasing density.
+        """
+        size = self.sample_pdf.size
+        if numberOfPoints is None:
+            numberOfPoints = size
+        if numberOfPoints < 0 or numberOfPoints > size:
+            raise ValueError(
+                "The number of points must be in [0, %d], but is %d."
+                % (size, numberOfPoints)
+            )
+        if numberOfPoints < size:
+            indices = np.argpartition(self.sample_pdf, numberOfPoints)[:numberOfPoints]
+        else:
+            indices = np.arange(size)
+        indices = indices[np.argsort(self.sample_pdf[indices], kind="stable")]
+        return [int(i) for i in indices]
+
+    def computeResultColumns(self):
+        """
+        Return the results of each point as columns.
+
+        Each column is a contiguous array, computed with whole-array
+        operations, ready for a columnar export (see ExportToNPZ() and
+        ExportToParquet()).
+
+        Returns
+        -------
+        columns : dict(str, np.array(n))
+            The "pdf", the "label" of the innermost region (see
+            computeLevelMembership()), the "outlier" flag, the outlier
+            "score" (see computeOutlierScores()) and one column per
+            component of the sample, named from its description.
+
+        Raises
+        ------
+        ValueError
+            If the description of a component is the name of a result
+            column or of another component.
+        """
+        labels = self.computeLevelMembership()
+        columns = {
+            "pdf": np.ascontiguousarray(self.sample_pdf, dtype=float),
+            "label": labels.astype(np.int32),
+            "outlier": labels == -1,
+            "score": self.computeOutlierScores(),
+        }
+        data = np.asarray(self._getPoints())
+        for k, name in enumerate(self._getDescription()):
+            if name in columns:
+                raise ValueError(
+                    "The component %d is named %s, which is already the name "
+                    "of a column. Change the description of the sample." % (k, name)
+                )
+            columns[name] = np.ascontiguousarray(data[:, k])
+        return columns
 
     def setnumberOfPointsInXAxis(self, numberOfPointsInXAxis):
         self.numberOfPointsInXAxis = numberOfPointsInXAxis
@@ -151,35 +709,188 @@ class HighDensityRegionAlgorithm:
     def getnumberOfPointsInYAxis(self):
         return self.numberOfPointsInYAxis
 
-    def _inliers_outliers(self, sample, inliers=True):
-        """Inliers or outliers cloud drawing."""
+    def _computeBounds(self):
+        """Return the minimum and maximum of each column of the sample."""
+        data = np.asarray(self._getPoints(), dtype=float)
+        return np.min(data, axis=0), np.max(data, axis=0)
+
+    def _computeGridAxes(self, indices, numbersOfPoints, bounds):
+        """Return the regular coordinates of a grid along the given columns."""
+        lower, upper = bounds
+        return [
+            np.linspace(lower[k], upper[k], numberOfPoints + 2)
+            for k, numberOfPoints in zip(indices, numbersOfPoints)
+        ]
+
+    def _computeContourGrid(self, j, i, bounds):
+        """
+        Return the grid and the PDF of the marginal (j, i) on the grid.
+
+        The grid is regular, with the X coordinate varying first, as for
+        the ot.Box experiment. The result is cached until the next run().
+        """
+        key = (j, i, self.numberOfPointsInXAxis, self.numberOfPointsInYAxis)
+        if key not in self._contour_grids:
+            x, y = self._computeGridAxes(
+                [j, i],
+                [self.numberOfPointsInXAxis, self.numberOfPointsInYAxis],
+                bounds,
+            )
+            xx, yy = np.meshgrid(x, y)
+            xy = np.column_stack((np.ravel(xx), np.ravel(yy)))
+            marginal = self.distribution.getMarginal([j, i])
+            data = np.ravel(marginal.computePDF(xy))
+            self._contour_grids[key] = (x, y, data)
+        return self._contour_grids[key]
+
+    def computeDensityLookupTable(self, numberOfPointsPerAxis=100):
+        """
+        Return the density tabulated on a grid, to score new points.
+
+        The PDF is computed once on a regular grid of the bounding box of
+        the sample, as the contour grids of draw(). New points in the box
+        are scored by multilinear interpolation, at a cost which does not
+        depend on the size of the sample of a kernel smoothing, and
+        points outside the box by the PDF of the distribution. The grid
+        has (numberOfPointsPerAxis + 2)^d nodes: this is intended for
+        reduced spaces of dimension 2 or 3. Along a constant component of
+        the sample, the box is widened by the standard deviation of the
+        marginal distribution on each side.
+
+        Parameters
+        ----------
+        numberOfPointsPerAxis : int
+            The number of interior points of the grid along each axis.
+
+        Returns
+        -------
+        table : DensityLookupTable
+            The tabulated density, with the thresholds of the alpha levels.
+        """
+        if self.pvalues is None:
+            raise ValueError(
+                "The run() method must be called before computeDensityLookupTable()."
+            )
+        lower, upper = self._computeBounds()
+        # A constant component would give a grid of zero width
+        flat = upper == lower
+        if np.any(flat):
+            width = np.array(self.distribution.getStandardDeviation())[flat]
+            width[~(width > 0.0)] = 1.0
+            lower[flat] -= width
+            upper[flat] += width
+        axes = self._computeGridAxes(
+            range(self.dim), [numberOfPointsPerAxis] * self.dim, (lower, upper)
+        )
+        nodes = np.column_stack(
+            [np.ravel(coordinates) for coordinates in np.meshgrid(*axes, indexing="ij")]
+        )
+        values = self._computeSamplePDF(nodes).reshape([axis.size for axis in axes])
+        pvalues = np.array(self.pvalues, dtype=float)
+        pvalues[np.array(self.alphaLevels) == self.outlierAlpha] = self.outlierPvalue
+        return DensityLookupTable(
+            self.distribution, axes, values, pvalues, self.alphaLevels
+        )
+
+    def _computeInlierGroups(self, colorByLevel=False):
+        """Return the indices, the color and the legend of each group of inliers."""
+        if not colorByLevel:
+            legend = "Inliers at alpha=%.4f" % (self.outlierAlpha)
+            return [(self.inlier_indices, self.inlier_color, legend)]
+        labels = self.computeLevelMembership()
+        colors = self.level_colors
+        if colors is None:
+            colors = ot.Drawable.BuildDefaultPalette(len(self.alphaLevels))
+        groups = []
+        for i in range(len(self.alphaLevels)):
+            indices = [int(k) for k in np.where(labels == i)[0]]
+            legend = "Inliers at alpha=%.4f" % (self.alphaLevels[i])
+            groups.append((indices, colors[i], legend))
+        return groups
+
+    def _inliers_outliers(self, sample, inliers=True, colorByLevel=False):
+        """Inliers or outliers clouds drawing."""
         # Perform selection
         if inliers:
-            idx = self.inlier_indices
-            legend = "Inliers at alpha=%.4f" % (self.outlierAlpha)
-            marker_color = self.inlier_color
+            groups = self._computeInlierGroups(colorByLevel)
         else:
-            idx = self.outlier_indices
             legend = "Outliers at alpha=%.4f" % (self.outlierAlpha)
-            marker_color = self.outlier_color
-
-        sample_selection = sample[idx, :]
+            groups = [(self.outlier_indices, self.outlier_color, legend)]
 
-        if sample_selection.getSize() == 0:
-            return
+        clouds = []
+        for idx, marker_color, legend in groups:
+            sample_selection = np.asarray(sample[np.asarray(idx, dtype=int)], dtype=float)
+            if sample_selection.shape[0] > 0:
+                clouds.append(
+                    ot.Cloud(sample_selection, marker_color, self.data_marker, legend)
+                )
+        return clouds
 
-        cloud = ot.Cloud(sample_selection, marker_color, self.data_marker, legend)
-        return cloud
-
-    def _drawInliers(self, sample):
+    def _drawInliers(self, sample, colorByLevel=False):
         """Draw inliers."""
-        return self._inliers_outliers(sample, inliers=True)
+        return self._inliers_outliers(sample, True, colorByLevel)
 
     def _drawOutliers(self, sample):
         """Draw outliers."""
         return self._inliers_outliers(sample, inliers=False)
 
-    def draw(self, drawInliers=False, drawOutliers=True):
+    def _drawPanel(self, i, j, bounds, drawInliers, drawOutliers, colorByLevel):
+        """
+        Return the graph of the cell (i, j), with i >= j, of the matrix plot.
+
+        The diagonal cells show the marginal PDF, the lower cells the
+        contours of the bivariate marginal (j, i).
+        """
+        graph = ot.Graph("", "", "", True, "topright")
+        points = np.asarray(self._getPoints())
+        if i == j:  # diag
+            marginal_distribution = self.distribution.getMarginal(i)
+            curve = marginal_distribution.drawPDF()
+            graph.add(curve)
+            groups = []
+            if drawInliers:
+                groups = [
+                    (indices, color)
+                    for indices, color, _ in self._computeInlierGroups(colorByLevel)
+                ]
+            if drawOutliers:
+                groups.append((self.outlier_indices, self.outlier_color))
+            for indices, color in groups:
+                # The points on the X axis, as one (n, 2) array
+                marginal_data = np.zeros((len(indices), 2))
+                marginal_data[:, 0] = points[np.asarray(indices, dtype=int), i]
+                cloud = ot.Cloud(marginal_data)
+                cloud.setColor(color)
+                graph.add(cloud)
+
+        else:  # lower corners
+            # Label using percentage instead of probability
+            labels = ["%.0f %%" % (alpha * 100) for alpha in self.alphaLevels]
+            # Use a regular grid to compute probability response surface
+            x, y, data = self._computeContourGrid(j, i, bounds)
+            contour = ot.Contour(
+                ot.Sample(x[:, None]), ot.Sample(y[:, None]), ot.Sample(data[:, None])
+            )
+            contour.setLevels(self.pvalues)
+            contour.setLabels(labels)
+            contour.setColor(self.contour_color)
+
+            graph.add(contour)
+
+            sample_ij = points[:, [j, i]]
+
+            if drawInliers:
+                for cloud in self._drawInliers(sample_ij, colorByLevel):
+                    graph.add(cloud)
+
+            if drawOutliers:
+                for cloud in self._drawOutliers(sample_ij):
+                    graph.add(cloud)
+
+        graph.setLegends([""])
+        return graph
+
+    def draw(self, drawInliers=False, drawOutliers=True, colorByLevel=False):
         """
         Draw the high density regions.
 
@@ -189,96 +900,132 @@ class HighDensityRegionAlgorithm:
             If True, draw inliers points.
         drawOutliers : bool
             If True, draw outliers points.
+        colorByLevel : bool
+            If True, the inliers are colored by the innermost high density
+            region which contains them (see computeLevelMembership()),
+            with the colors in level_colors.
         """
-        plabels = self.sample.getDescription()
+        plabels = self._getDescription()
+
+        # Bounding box of all the columns
+        bounds = self._computeBounds()
 
         # Bivariate space
         grid = ot.GridLayout(self.dim, self.dim)
         # Axis are created and stored top to bottom, left to right
         for i in range(self.dim):
-            for j in range(self.dim):
-                if i >= j:  # lower triangle
-                    graph = ot.Graph("", "", "", True, "topright")
+            for j in range(i + 1):
+                graph = self._drawPanel(
+                    i, j, bounds, drawInliers, drawOutliers, colorByLevel
+                )
+                if j == 0 and i > 0:
+                    graph.setYTitle(plabels[i])
+                if i == self.dim - 1:
+                    graph.setXTitle(plabels[j])
+                grid.setGraph(i, j, graph)
 
-                if i == j:  # diag
-                    marginal_distribution = self.distribution.getMarginal(i)
-                    curve = marginal_distribution.drawPDF()
-                    graph.add(curve)
-                    if drawInliers:
-                        marginal_sample = self.sample[self.inlier_indices, i]
-                        data = ot.Sample(marginal_sample.getSize(), 2)
-                        data[:, 0] = marginal_sample
-                        cloud = ot.Cloud(data)
-                        cloud.setColor(self.inlier_color)
-                        graph.add(cloud)
-                    if drawOutliers:
-                        marginal_sample = self.sample[self.outlier_indices, i]
-                        data = ot.Sample(marginal_sample.getSize(), 2)
-                        data[:, 0] = marginal_sample
-                        cloud = ot.Cloud(data)
-                        cloud.setColor(self.outlier_color)
-                        graph.add(cloud)
-
-                elif i > j:  # lower corners
-                    # Use a regular grid to compute probability response surface
-                    X1min = self.sample[:, j].getMin()[0]
-                    X1max = self.sample[:, j].getMax()[0]
-                    X2min = self.sample[:, i].getMin()[0]
-                    X2max = self.sample[:, i].getMax()[0]
-
-                    xx = ot.Box(
-                        [self.numberOfPointsInXAxis], ot.Interval([X1min], [X1max])
-                    ).generate()
-
-                    yy = ot.Box(
-                        [self.numberOfPointsInXAxis], ot.Interval([X2min], [X2max])
-                    ).generate()
-
-                    xy = ot.Box(
-                        [self.numberOfPointsInXAxis, self.numberOfPointsInXAxis],
-                        ot.Interval([X1min, X2min], [X1max, X2max]),
-                    ).generate()
-
-                    data = self.distribution.getMarginal([j, i]).computePDF(xy)
-
-                    # Label using percentage instead of probability
-                    n_contours = len(self.alphaLevels)
-                    labels = [
-                        "%.0f %%" % (self.alphaLevels[i] * 100)
-                        for i in range(n_contours)
-                    ]
-
-                    contour = ot.Contour(
-                        xx, yy, data, self.pvalues, ot.Description(labels)
-                    )
-                    contour.setColor(self.contour_color)
+        return grid
 
-                    graph.add(contour)
+    def drawWithMatplotlib(
+        self, drawInliers=False, drawOutliers=True, figure=None, colorByLevel=False
+    ):
+        """
+        Draw the high density regions directly with matplotlib.
 
-                    sample_ij = self.sample[:, [j, i]]
+        This is the same matrix plot as draw(), without OpenTURNS
+        drawables: each cloud is a single scatter and each contour is
+        drawn from the cached grid of the pair.
 
-                    if drawInliers:
-                        cloud = self._drawInliers(sample_ij)
+        Parameters
+        ----------
+        drawInliers : bool
+            If True, draw inliers points.
+        drawOutliers : bool
+            If True, draw outliers points.
+        figure : matplotlib.figure.Figure
+            The figure. If None, a new figure is created.
+        colorByLevel : bool
+            If True, the inliers are colored by the innermost high density
+            region which contains them (see computeLevelMembership()),
+            with the colors in level_colors.
 
-                        if cloud is not None:
-                            graph.add(cloud)
+        Returns
+        -------
+        figure : matplotlib.figure.Figure
+            The figure, with the plots in the lower triangle of a
+            d x d matrix of axes.
+        """
+        if figure is None:
+            figure = plt.figure()
+        axes = figure.subplots(self.dim, self.dim, squeeze=False)
+        plabels = self._getDescription()
+        data = np.asarray(self._getPoints(), dtype=float)
+        bounds = self._computeBounds()
+        marker = ConvertMarkerToMatplotlib(self.data_marker)
+        contour_color = ConvertColorToMatplotlib(self.contour_color)
+        selections = []
+        if drawInliers:
+            for indices, color, _ in self._computeInlierGroups(colorByLevel):
+                selections.append((np.array(indices, dtype=int), color))
+        if drawOutliers:
+            selections.append(
+                (np.array(self.outlier_indices, dtype=int), self.outlier_color)
+            )
 
-                    if drawOutliers:
-                        cloud = self._drawOutliers(sample_ij)
-                        if cloud is not None:
-                            graph.add(cloud)
+        # Contour levels must be increasing
+        levels, first = np.unique(self.pvalues, return_index=True)
+        level_labels = {
+            level: "%.0f %%" % (self.alphaLevels[k] * 100)
+            for level, k in zip(levels, first)
+        }
+        nbPoints = ot.ResourceMap.GetAsUnsignedInteger("Distribution-DefaultPointNumber")
 
+        for i in range(self.dim):
+            for j in range(self.dim):
+                ax = axes[i, j]
+                if i < j:
+                    ax.set_visible(False)
+                    continue
+                if i == j:  # diag
+                    x = np.linspace(bounds[0][i], bounds[1][i], nbPoints)
+                    marginal_distribution = self.distribution.getMarginal(i)
+                    pdf = np.ravel(marginal_distribution.computePDF(x[:, None]))
+                    ax.plot(x, pdf, color=contour_color)
+                    for indices, color in selections:
+                        if indices.size > 0:
+                            ax.scatter(
+                                data[indices, i],
+                                np.zeros(indices.size),
+                                c=ConvertColorToMatplotlib(color),
+                                marker=marker,
+                                s=10,
+                            )
+                else:  # lower corners
+                    x, y, pdf = self._computeContourGrid(j, i, bounds)
+                    contour = ax.contour(
+                        x,
+                        y,
+                        pdf.reshape(y.size, x.size),
+                        levels=levels,
+                        colors=contour_color,
+                    )
+                    ax.clabel(contour, fmt=level_labels)
+                    for indices, color in selections:
+                        if indices.size > 0:
+                            ax.scatter(
+                                data[indices, j],
+                                data[indices, i],
+                                c=ConvertColorToMatplotlib(color),
+                                marker=marker,
+                                s=10,
+                            )
                 if j == 0 and i > 0:
-                    graph.setYTitle(plabels[i])
+                    ax.set_ylabel(plabels[i])
                 if i == self.dim - 1:
-                    graph.setXTitle(plabels[j])
+                    ax.set_xlabel(plabels[j])
 
-                if i >= j:  # lower triangle
-                    graph.setLegends([""])
-                    grid.setGraph(i, j, graph)
+        return figure
 
-        return grid
-    
     def getOutlierAlpha(self):
         """
         Return alpha level of outliers. 
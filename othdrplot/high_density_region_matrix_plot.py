@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Component to create HighDensityRegionMatrixPlot.
+"""
+import numpy as np
+import openturns as ot
+
+
+class HighDensityRegionMatrixPlot:
+    """A matrix plot of the HDR whose panels are computed on demand."""
+
+    def __init__(
+        self, algorithm, drawInliers=False, drawOutliers=True, colorByLevel=False
+    ):
+        """
+        Lazy matrix plot of a high density region.
+
+        HighDensityRegionAlgorithm.draw() computes the d (d + 1) / 2 panels
+        of the matrix plot, with one contour grid per pair of components.
+        Here, a panel is only computed when it is accessed or drawn, and
+        is cached. The pairs can be ranked by the separation of the
+        outliers, so that only the most informative pages are drawn in
+        high dimension.
+
+        Parameters
+        ----------
+        algorithm : HighDensityRegionAlgorithm
+            The algorithm, after run().
+        drawInliers : bool
+            If True, draw inliers points.
+        drawOutliers : bool
+            If True, draw outliers points.
+        colorByLevel : bool
+            If True, the inliers are colored by the innermost high density
+            region which contains them.
+        """
+        if algorithm.pvalues is None:
+            raise ValueError("The run() method of the algorithm must be called first.")
+        self.algorithm = algorithm
+        self.drawInliers = drawInliers
+        self.drawOutliers = drawOutliers
+        self.colorByLevel = colorByLevel
+        self.dim = algorithm.dim
+        self._bounds = None
+        self._panels = {}
+
+    def getPanel(self, i, j):
+        """
+        Return the panel of the row i and the column j, with i >= j.
+
+        Parameters
+        ----------
+        i : int
+            The index of the component of the Y axis.
+        j : int
+            The index of the component of the X axis.
+
+        Returns
+        -------
+        graph : ot.Graph
+            The marginal PDF if i == j, the contours of the pair otherwise.
+        """
+        if j > i or i >= self.dim or j < 0:
+            raise ValueError(
+                "The panel (%d, %d) is not in the lower triangle of dimension %d."
+                % (i, j, self.dim)
+            )
+        if (i, j) not in self._panels:
+            if self._bounds is None:
+                self._bounds = self.algorithm._computeBounds()
+            graph = self.algorithm._drawPanel(
+                i,
+                j,
+                self._bounds,
+                self.drawInliers,
+                self.drawOutliers,
+                self.colorByLevel,
+            )
+            plabels = self.algorithm._getDescription()
+            graph.setXTitle(plabels[j])
+            if i != j:
+                graph.setYTitle(plabels[i])
+            self._panels[(i, j)] = graph
+        return self._panels[(i, j)]
+
+    def getNumberOfComputedPanels(self):
+        """
+        Return the number of panels computed so far.
+
+        Returns
+        -------
+        numberOfPanels : int
+            The number of cached panels.
+        """
+        return len(self._panels)
+
+    def computePairSeparations(self):
+        """
+        Return the separation of the outliers in each pair of components.
+
+        The separation of the pair (i, j) is the mean squared Mahalanobis
+        distance of the outliers to the inliers, with the mean and the
+        covariance of the inliers in the pair. All the pairs are computed
+        with one product of the matrix of the standardized outliers.
+
+        Returns
+        -------
+        separations : np.array(d, d)
+            The symmetric matrix of the separations, with a zero diagonal.
+        """
+        data = np.asarray(self.algorithm._getPoints(), dtype=float)
+        inliers = data[np.asarray(self.algorithm.inlier_indices, dtype=int)]
+        outliers = data[np.asarray(self.algorithm.outlier_indices, dtype=int)]
+        separations = np.zeros((self.dim, self.dim))
+        if inliers.shape[0] < 2 or outliers.shape[0] == 0:
+            return separations
+        std = np.std(inliers, axis=0, ddof=1)
+        std = np.where(std > 0.0, std, 1.0)
+        z = (outliers - np.mean(inliers, axis=0)) / std
+        correlation = np.corrcoef(inliers, rowvar=False).reshape(self.dim, self.dim)
+        correlation = np.clip(np.nan_to_num(correlation), -0.999999, 0.999999)
+        cross = z.T.dot(z) / outliers.shape[0]
+        squares = np.diag(cross)
+        separations = (
+            squares[:, None] + squares[None, :] - 2.0 * correlation * cross
+        ) / (1.0 - correlation ** 2)
+        np.fill_diagonal(separations, 0.0)
+        return separations
+
+    def computePairRanking(self, numberOfPairs=None):
+        """
+        Return the pairs of components sorted by decreasing separation.
+
+        Parameters
+        ----------
+        numberOfPairs : int
+            The number of pairs. If None, return all the pairs.
+
+        Returns
+        -------
+        pairs : list(tuple(int, int))
+            The pairs (i, j), with i > j, the most separated first.
+        """
+        rows, columns = np.tril_indices(self.dim, -1)
+        separations = self.computePairSeparations()[rows, columns]
+        order = np.argsort(-separations, kind="stable")[:numberOfPairs]
+        return [(int(rows[k]), int(columns[k])) for k in order]
+
+    def drawPanels(self, panels, numberOfColumns=3):
+        """
+        Draw a selection of panels.
+
+        Parameters
+        ----------
+        panels : list(tuple(int, int))
+            The panels (i, j), with i >= j.
+        numberOfColumns : int
+            The number of columns of the layout.
+
+        Returns
+        -------
+        grid : ot.GridLayout
+            The panels, by rows.
+        """
+        if len(panels) == 0:
+            raise ValueError("The number of panels is zero.")
+        numberOfColumns = min(numberOfColumns, len(panels))
+        numberOfRows = -(-len(panels) // numberOfColumns)
+        grid = ot.GridLayout(numberOfRows, numberOfColumns)
+        for k, (i, j) in enumerate(panels):
+            grid.setGraph(k // numberOfColumns, k % numberOfColumns, self.getPanel(i, j))
+        return grid
+
+    def getNumberOfPages(self, pageSize=6):
+        """
+        Return the number of pages of the pairs of components.
+
+        Parameters
+        ----------
+        pageSize : int
+            The number of pairs per page.
+
+        Returns
+        -------
+        numberOfPages : int
+            The number of pages.
+        """
+        numberOfPairs = self.dim * (self.dim - 1) // 2
+        return -(-numberOfPairs // pageSize)
+
+    def drawPage(self, pageIndex, pageSize=6, numberOfColumns=3):
+        """
+        Draw a page of the pairs of components, ranked by separation.
+
+        Parameters
+        ----------
+        pageIndex : int
+            The index of the page, the most separated pairs on page 0.
+        pageSize : int
+            The number of pairs per page.
+        numberOfColumns : int
+            The number of columns of the layout.
+
+        Returns
+        -------
+        grid : ot.GridLayout
+            The panels of the page.
+        """
+        numberOfPages = self.getNumberOfPages(pageSize)
+        if pageIndex < 0 or pageIndex >= numberOfPages:
+            raise ValueError(
+                "The page index must be in [0, %d], but is %d."
+                % (numberOfPages - 1, pageIndex)
+            )
+        pairs = self.computePairRanking()
+        start = pageIndex * pageSize
+        return self.drawPanels(pairs[start : start + pageSize], numberOfColumns)
+
+    def draw(self):
+        """
+        Draw the full matrix plot.
+
+        Returns
+        -------
+        grid : ot.GridLayout
+            The d x d matrix plot, with the computed panels reused.
+        """
+        grid = ot.GridLayout(self.dim, self.dim)
+        for i in range(self.dim):
+            for j in range(i + 1):
+                grid.setGraph(i, j, self.getPanel(i, j))
+        return grid
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Component to create ImportanceSamplingThresholdAlgorithm.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import openturns as ot
+from .gaussian_kernel_density import GetGaussianKernelParameters, ComputeGaussianKernelPDF
+
+
+def _sampleGaussianKernels(size, centers, bandwidth, weights):
+    """Return a sample of a Gaussian kernel density, with the OpenTURNS generator."""
+    cumulated = np.cumsum(weights)
+    uniform = np.array(ot.RandomGenerator.Generate(size)) * cumulated[-1]
+    kernel_indices = np.minimum(np.searchsorted(cumulated, uniform), len(weights) - 1)
+    normal = np.array(ot.Normal(centers.shape[1]).getSample(size))
+    return centers[kernel_indices] + normal * bandwidth
+
+
+def _sampleChunk(task):
+    """Return the PDF values and the importance weights of one chunk."""
+    distribution, proposal, size, defensiveWeight, seed = task
+    ot.RandomGenerator.SetSeed(seed)
+    proposal_size = int(round(defensiveWeight * size))
+    density_size = size - proposal_size
+    ratio = proposal_size / float(size)
+    if distribution is None:
+        # A Gaussian kernel density and its widened kernels
+        centers, bandwidth, weights, widened_bandwidth = proposal
+        x = _sampleGaussianKernels(density_size, centers, bandwidth, weights)
+        if proposal_size > 0:
+            x = np.vstack(
+                (
+                    x,
+                    _sampleGaussianKernels(
+                        proposal_size, centers, widened_bandwidth, weights
+                    ),
+                )
+            )
+        pdf = ComputeGaussianKernelPDF(x, centers, bandwidth, weights)
+    else:
+        x = ot.Sample(distribution.getSample(density_size))
+        if proposal_size > 0:
+            x.add(proposal.getSample(proposal_size))
+        pdf = np.ravel(distribution.computePDF(x))
+    if proposal_size == 0:
+        # Plain Monte-Carlo: the proposal PDF is not needed
+        return pdf, np.ones(size)
+    if distribution is None:
+        proposal_pdf = ComputeGaussianKernelPDF(x, centers, widened_bandwidth, weights)
+    else:
+        proposal_pdf = np.ravel(proposal.computePDF(x))
+    mixture_pdf = (1.0 - ratio) * pdf + ratio * proposal_pdf
+    return pdf, pdf / mixture_pdf
+
+
+class ImportanceSamplingThresholdAlgorithm:
+    """Estimate the density thresholds of high alpha levels."""
+
+    def __init__(
+        self,
+        sampleSize=10000,
+        wideningFactor=2.0,
+        defensiveWeight=0.5,
+        confidenceLevel=0.95,
+        chunkSize=100000,
+        numberOfJobs=1,
+        seed=None,
+    ):
+        """
+        Density thresholds by importance sampling.
+
+        The threshold of an alpha level is the quantile of level 1 - alpha
+        of the PDF f(X), where X has the PDF f. When alpha is close to 1,
+        this quantile depends on the points in the tails of f, which are
+        rare in a sample of f. The points are rather sampled from the
+        defensive mixture g = (1 - w) f + w h, where h is a widened
+        proposal and w is the defensive weight, and the quantile is
+        computed from the distribution of f(X) weighted by f(X) / g(X).
+        These weights are lower than 1 / (1 - w).
+
+        If the distribution is a Gaussian kernel density, e.g. built by
+        ot.KernelSmoothing, the proposal has the same centers and wider
+        kernels, so that its standard deviation is the one of the density
+        multiplied by the widening factor. The density and the sample are
+        then computed with numpy. Otherwise, the proposal is the
+        normal distribution with the same mean and a covariance
+        multiplied by the square of the widening factor.
+
+        The error of the threshold is estimated from the standard error
+        of the estimate of the probability 1 - alpha: it is the half
+        width of the interval between the quantiles of the probabilities
+        at the bounds of its confidence interval.
+
+        The sample is made of chunks of chunkSize points, which are
+        generated and evaluated in a pool of processes. Each chunk has
+        its own random stream, derived from the seed and the index of the
+        chunk: the same seed gives the same thresholds whatever the
+        number of jobs.
+
+        Parameters
+        ----------
+        sampleSize : int
+            The number of points, i.e. of evaluations of the density.
+        wideningFactor : float
+            The factor of the standard deviation of the proposal.
+            Must be greater or equal to 1.
+        defensiveWeight : float
+            The weight of the proposal in the mixture, in [0, 1).
+        confidenceLevel : float
+            The level of the confidence interval of the thresholds.
+        chunkSize : int
+            The number of points of each chunk.
+        numberOfJobs : int
+            The number of processes. If 1, no process is created.
+        seed : int
+            The seed of the random streams of the chunks. If None, it is
+            generated by the OpenTURNS random generator.
+        """
+        if sampleSize < 2:
+            raise ValueError("The sample size must be at least 2, but is %d." % (sampleSize))
+        if chunkSize < 1:
+            raise ValueError("The chunk size must be at least 1, but is %d." % (chunkSize))
+        if wideningFactor < 1.0:
+            raise ValueError(
+                "The widening factor must be greater or equal to 1, but is %s."
+                % (wideningFactor)
+            )
+        if defensiveWeight < 0.0 or defensiveWeight >= 1.0:
+            raise ValueError(
+                "The defensive weight must be in [0, 1), but is %s." % (defensiveWeight)
+            )
+        self.sampleSize = sampleSize
+        self.wideningFactor = wideningFactor
+        self.defensiveWeight = defensiveWeight
+        self.confidenceLevel = confidenceLevel
+        self.chunkSize = chunkSize
+        self.numberOfJobs = numberOfJobs
+        self.seed = seed
+
+        # Computed by computeThresholds()
+        self.thresholds = None
+        self.thresholdErrors = None
+        self.probabilityErrors = None
+
+    def _computeProposal(self, distribution):
+        """
+        Return the distribution and the proposal sent to the chunks.
+
+        Without defensive weight, as for plain Monte-Carlo, no point is
+        sampled from the proposal, which is not built.
+        """
+        parameters = GetGaussianKernelParameters(distribution)
+        if parameters is not None:
+            centers, bandwidth, weights = parameters
+            if self.defensiveWeight == 0.0:
+                return None, (centers, bandwidth, weights, None)
+            # Widen the kernels so that the standard deviation of the
+            # proposal is the one of the density times the widening factor
+            mean = weights.dot(centers) / np.sum(weights)
+            variance = weights.dot((centers - mean) ** 2) / np.sum(weights)
+            variance += bandwidth ** 2
+            widened_bandwidth = np.sqrt(
+                bandwidth ** 2 + (self.wideningFactor ** 2 - 1.0) * variance
+            )
+            return None, (centers, bandwidth, weights, widened_bandwidth)
+        if self.defensiveWeight == 0.0:
+            return distribution, None
+        covariance = ot.CovarianceMatrix(
+            np.array(distribution.getCovariance()) * self.wideningFactor ** 2
+        )
+        return distribution, ot.Normal(distribution.getMean(), covariance)
+
+    def _sample(self, distribution):
+        """Return the PDF values and the importance weights of the whole sample."""
+        if self.seed is None:
+            # Reproducible with the seed of the OpenTURNS generator
+            seed = int(ot.RandomGenerator.IntegerGenerate(1, 2 ** 31 - 1)[0])
+        else:
+            seed = self.seed
+        distribution, proposal = self._computeProposal(distribution)
+        sizes = [
+            min(self.chunkSize, self.sampleSize - start)
+            for start in range(0, self.sampleSize, self.chunkSize)
+        ]
+        # One independent stream per chunk, whatever the number of jobs
+        seeds = [
+            int(child.generate_state(1)[0])
+            for child in np.random.SeedSequence(seed).spawn(len(sizes))
+        ]
+        tasks = [
+            (distribution, proposal, size, self.defensiveWeight, chunk_seed)
+            for size, chunk_seed in zip(sizes, seeds)
+        ]
+        if self.numberOfJobs > 1:
+            with ProcessPoolExecutor(max_workers=self.numberOfJobs) as executor:
+                chunks = list(executor.map(_sampleChunk, tasks))
+        else:
+            # Do not change the state of the generator of the caller
+            state = ot.RandomGenerator.GetState()
+            chunks = [_sampleChunk(task) for task in tasks]
+            ot.RandomGenerator.SetState(state)
+        pdf = np.concatenate([chunk[0] for chunk in chunks])
+        weights = np.concatenate([chunk[1] for chunk in chunks])
+        return pdf, weights
+
+    def _computeQuantiles(self, pdf, weights, alphaLevels):
+        """Return the thresholds and their errors from a weighted sample of the PDF."""
+        size = pdf.size
+        order = np.argsort(pdf, kind="stable")
+        sorted_pdf = pdf[order]
+        sorted_weights = weights[order]
+        cumulated = np.cumsum(sorted_weights) / size
+
+        def quantile(probability):
+            k = np.searchsorted(cumulated, probability)
+            return sorted_pdf[np.clip(k, 0, size - 1)]
+
+        z = ot.Normal().computeQuantile(0.5 + 0.5 * self.confidenceLevel)[0]
+        probabilities = 1.0 - np.array(alphaLevels, dtype=float)
+        thresholds = quantile(probabilities)
+        probabilityErrors = np.zeros(len(alphaLevels))
+        for i in range(len(alphaLevels)):
+            # Standard error of the weighted CDF at the threshold
+            below = np.where(sorted_pdf <= thresholds[i], sorted_weights, 0.0)
+            probabilityErrors[i] = np.std(below) / np.sqrt(size)
+        lower = quantile(probabilities - z * probabilityErrors)
+        upper = quantile(probabilities + z * probabilityErrors)
+        return thresholds, 0.5 * (upper - lower), probabilityErrors
+
+    def computeThresholds(self, distribution, alphaLevels):
+        """
+        Return the density thresholds of the alpha levels.
+
+        Parameters
+        ----------
+        distribution : ot.Distribution
+            The distribution.
+        alphaLevels : list(float)
+            The alpha levels.
+
+        Returns
+        -------
+        thresholds : np.array(k)
+            The threshold of each alpha level: the region where the PDF
+            is greater than the threshold has the probability alpha.
+        """
+        pdf, weights = self._sample(distribution)
+        (
+            self.thresholds,
+            self.thresholdErrors,
+            self.probabilityErrors,
+        ) = self._computeQuantiles(pdf, weights, alphaLevels)
+        return self.thresholds
+
+    def getThresholdErrors(self):
+        """
+        Return the estimated errors of the thresholds.
+
+        Returns
+        -------
+        thresholdErrors : np.array(k)
+            The half width of the confidence interval of each threshold.
+        """
+        return self.thresholdErrors
+
+    def getProbabilityErrors(self):
+        """
+        Return the standard errors of the probabilities of the regions.
+
+        Returns
+        -------
+        probabilityErrors : np.array(k)
+            The standard error of the estimate of 1 - alpha at each threshold.
+        """
+        return self.probabilityErrors
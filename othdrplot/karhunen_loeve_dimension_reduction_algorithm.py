@@ -3,7 +3,12 @@
 """
 Reduces the dimensionnality of a process sample with K-L decomposition.
 """
+import numpy as np
 import openturns as ot
+from .process_sample_conversion import (
+    ConvertProcessSampleToArray,
+    ConvertArrayToProcessSample,
+)
 
 
 class KarhunenLoeveDimensionReductionAlgorithm:
@@ -20,22 +25,148 @@ class KarhunenLoeveDimensionReductionAlgorithm:
         """
         self.processSample = processSample
         self.numberOfComponents = numberOfComponents
+        # Compute the modes on one vertex out of decimationFactor
+        self.decimationFactor = 1
 
     def run(self):
         """
         Run high density region algorithm.
         """
         # KL decomposition
-        threshold = 0.0
-        algo = ot.KarhunenLoeveSVDAlgorithm(self.processSample, threshold)
-        algo.setNbModes(self.numberOfComponents)
-        algo.run()
-        karhunenLoeveResult = algo.getResult()
-        self.reducedComponents = karhunenLoeveResult.project(self.processSample)
+        if self.decimationFactor > 1:
+            # The trajectories are converted once, for the modes and the
+            # projection
+            trajectories = ConvertProcessSampleToArray(self.processSample)
+            self.karhunenLoeveResult = self._computeMultiResolutionResult(trajectories)
+            projection = np.array(self.karhunenLoeveResult.getProjectionMatrix())
+            self.reducedComponents = ot.Sample(trajectories.dot(projection.T))
+        else:
+            threshold = 0.0
+            algo = ot.KarhunenLoeveSVDAlgorithm(self.processSample, threshold)
+            algo.setNbModes(self.numberOfComponents)
+            algo.run()
+            self.karhunenLoeveResult = algo.getResult()
+            self.reducedComponents = self.karhunenLoeveResult.project(
+                self.processSample
+            )
         numberOfComponents = self.reducedComponents.getDimension()
         labels = ["C" + str(i) for i in range(numberOfComponents)]
         self.reducedComponents.setDescription(labels)
 
+    def _computeMultiResolutionResult(self, trajectories):
+        """Return the K-L result computed on a decimated mesh."""
+        mesh = self.processSample.getMesh()
+        if mesh.getDimension() != 1:
+            raise ValueError(
+                "The multi-resolution decomposition requires a mesh of "
+                "dimension 1, but the dimension is %d." % (mesh.getDimension())
+            )
+        vertices = np.ravel(mesh.getVertices())
+        order = np.argsort(vertices, kind="stable")
+        # One vertex out of decimationFactor, and the last one
+        coarse = np.unique(np.append(order[:: self.decimationFactor], order[-1]))
+        coarse = coarse[np.argsort(vertices[coarse], kind="stable")]
+        if coarse.size <= self.numberOfComponents:
+            raise ValueError(
+                "The decimated mesh has %d vertices, which is not greater "
+                "than the number of components %d."
+                % (coarse.size, self.numberOfComponents)
+            )
+        # Weighted SVD of the centered trajectories on the decimated mesh,
+        # with the trapezoidal weights of its vertices
+        coarseVertices = vertices[coarse]
+        halfLengths = 0.5 * np.diff(coarseVertices)
+        coarseWeights = np.append(halfLengths, 0.0) + np.insert(halfLengths, 0, 0.0)
+        sqrtWeights = np.sqrt(coarseWeights)
+        coarseTrajectories = trajectories[:, coarse]
+        centered = coarseTrajectories - np.mean(coarseTrajectories, axis=0)
+        _, singularValues, rightVectors = np.linalg.svd(
+            centered * sqrtWeights, full_matrices=False
+        )
+        # The refinement searches the modes in the space spanned by twice
+        # as many coarse modes
+        numberOfCoarseModes = min(2 * self.numberOfComponents, singularValues.size)
+        coarseModes = rightVectors[:numberOfCoarseModes] / sqrtWeights
+        variances = singularValues ** 2
+        selectionRatio = np.sum(variances[: self.numberOfComponents]) / np.sum(
+            variances
+        )
+
+        # Lift the modes to the fine mesh and orthonormalize them for the
+        # weights of the fine mesh
+        weights = np.array(mesh.computeWeights())
+        modes = np.array([np.interp(vertices, vertices[coarse], mode) for mode in coarseModes])
+        gram = (modes * weights).dot(modes.T)
+        modes = np.linalg.solve(np.linalg.cholesky(gram), modes)
+
+        # Refinement: eigen decomposition of the covariance of the
+        # trajectories projected on the lifted modes, at full resolution
+        centered = trajectories - np.mean(trajectories, axis=0)
+        coefficients = (centered * weights).dot(modes.T)
+        covariance = coefficients.T.dot(coefficients) / (trajectories.shape[0] - 1.0)
+        eigenvalues, rotation = np.linalg.eigh(covariance)
+        eigenvalues = eigenvalues[::-1][: self.numberOfComponents]
+        rotation = rotation[:, ::-1][:, : self.numberOfComponents]
+        modes = rotation.T.dot(modes)
+        # The modes are defined up to their sign: make the value of largest
+        # magnitude of each mode positive
+        largest = np.argmax(np.abs(modes), axis=1)
+        modes *= np.sign(modes[np.arange(largest.size), largest])[:, None]
+
+        projection = modes * weights / np.sqrt(eigenvalues)[:, None]
+        modesAsProcessSample = ConvertArrayToProcessSample(mesh, modes)
+        functions = [
+            ot.Function(ot.P1LagrangeEvaluation(modesAsProcessSample.getField(i)))
+            for i in range(modes.shape[0])
+        ]
+        return ot.KarhunenLoeveResult(
+            ot.RankMCovarianceModel(eigenvalues, ot.Basis(functions)),
+            0.0,
+            eigenvalues,
+            functions,
+            modesAsProcessSample,
+            ot.Matrix(projection),
+            selectionRatio,
+        )
+
+    def setDecimationFactor(self, decimationFactor):
+        """
+        Set the decimation factor of the multi-resolution decomposition.
+
+        If the factor is greater than 1, the modes are computed by a
+        weighted SVD on a mesh made of one vertex out of decimationFactor,
+        lifted to the full mesh by linear interpolation and
+        orthonormalized. A refinement step then rotates them in the space
+        they span and updates the eigenvalues, from the covariance of the
+        trajectories at full resolution. The trajectories are projected on
+        the full mesh with the projection matrix. The cost of the SVD is
+        divided by the square of the factor. The sign of each mode is set
+        so that its value of largest magnitude is positive. The mesh must
+        have dimension 1.
+
+        Parameters
+        ----------
+        decimationFactor : int
+            The decimation factor. If 1, the modes are computed on the
+            full mesh.
+        """
+        if decimationFactor < 1:
+            raise ValueError(
+                "The decimation factor must be at least 1, but is %d." % (decimationFactor)
+            )
+        self.decimationFactor = int(decimationFactor)
+
+    def getDecimationFactor(self):
+        """
+        Return the decimation factor of the multi-resolution decomposition.
+
+        Returns
+        -------
+        decimationFactor : int
+            The decimation factor.
+        """
+        return self.decimationFactor
+
     def getReducedComponents(self):
         """
         Returns the reduced components.
@@ -46,3 +177,14 @@ class KarhunenLoeveDimensionReductionAlgorithm:
             The n points in the d-dimensional reduced space.
         """
         return self.reducedComponents
+
+    def getKarhunenLoeveResult(self):
+        """
+        Returns the result of the K-L decomposition.
+
+        Returns
+        -------
+        karhunenLoeveResult : ot.KarhunenLoeveResult
+            The modes, eigenvalues and projection of the decomposition.
+        """
+        return self.karhunenLoeveResult
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Helpers to draw HDR results directly with matplotlib.
+"""
+import numpy as np
+import openturns as ot
+from matplotlib.collections import LineCollection
+
+# Marker names of OpenTURNS and their matplotlib equivalent
+_MARKERS = {
+    "square": "s",
+    "fsquare": "s",
+    "circle": "o",
+    "fcircle": "o",
+    "bullet": "o",
+    "dot": ".",
+    "triangleup": "^",
+    "ftriangleup": "^",
+    "diamond": "D",
+    "fdiamond": "D",
+    "plus": "+",
+    "times": "x",
+    "star": "*",
+}
+
+
+def ConvertColorToMatplotlib(color):
+    """
+    Return a matplotlib color from an OpenTURNS color.
+
+    Parameters
+    ----------
+    color : str
+        An OpenTURNS color name, e.g. "firebrick3", or a hexadecimal code.
+
+    Returns
+    -------
+    color : str
+        The hexadecimal code of the color, possibly with transparency.
+    """
+    if color.startswith("#"):
+        return color
+    return ot.Drawable.ConvertFromName(color)
+
+
+def ConvertMarkerToMatplotlib(marker):
+    """
+    Return a matplotlib marker from an OpenTURNS marker name.
+
+    Parameters
+    ----------
+    marker : str
+        An OpenTURNS marker name, e.g. "fsquare".
+
+    Returns
+    -------
+    marker : str
+        The matplotlib marker.
+    """
+    return _MARKERS.get(marker, "o")
+
+
+def DrawTrajectoryCollection(
+    axes, t, trajectories, color, label=None, rasterized=False, linewidth=1.0
+):
+    """
+    Draw a set of trajectories with a single LineCollection.
+
+    Parameters
+    ----------
+    axes : matplotlib.axes.Axes
+        The axes.
+    t : np.array(m)
+        The abscissas of the vertices.
+    trajectories : np.array(n, m)
+        The values of the trajectories, one per row.
+    color : str
+        The OpenTURNS or matplotlib color of the curves.
+    label : str
+        The legend of the collection.
+    rasterized : bool
+        If True, the collection is rasterized in vector outputs.
+    linewidth : float
+        The width of the curves.
+
+    Returns
+    -------
+    collection : matplotlib.collections.LineCollection
+        The collection, or None if there is no trajectory.
+    """
+    trajectories = np.asarray(trajectories)
+    if trajectories.shape[0] == 0:
+        return None
+    segments = np.empty(trajectories.shape + (2,), dtype=trajectories.dtype)
+    segments[:, :, 0] = t
+    segments[:, :, 1] = trajectories
+    collection = LineCollection(
+        segments,
+        colors=ConvertColorToMatplotlib(color),
+        label=label,
+        linewidths=linewidth,
+        rasterized=rasterized,
+    )
+    axes.add_collection(collection)
+    axes.autoscale_view()
+    return collection
+
+
+def SelectEvenlySpaced(indices, maximumNumber):
+    """
+    Return at most maximumNumber evenly spaced items of a list of indices.
+
+    Parameters
+    ----------
+    indices : sequence of int
+        The indices.
+    maximumNumber : int or None
+        The maximum number of indices. If None, all the indices are kept.
+
+    Returns
+    -------
+    selection : np.array(int)
+        The selected indices, in the same order.
+    """
+    indices = np.asarray(indices, dtype=int)
+    if maximumNumber is None or indices.size <= maximumNumber:
+        return indices
+    positions = np.linspace(0, indices.size - 1, maximumNumber)
+    return indices[np.round(positions).astype(int)]
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Component to create MonteCarloThresholdAlgorithm.
+"""
+from .importance_sampling_threshold_algorithm import (
+    ImportanceSamplingThresholdAlgorithm,
+)
+
+
+class MonteCarloThresholdAlgorithm(ImportanceSamplingThresholdAlgorithm):
+    """Estimate the density thresholds by parallel Monte-Carlo sampling."""
+
+    def __init__(
+        self,
+        sampleSize=1000000,
+        chunkSize=100000,
+        numberOfJobs=1,
+        seed=None,
+        confidenceLevel=0.95,
+    ):
+        """
+        Density thresholds by Monte-Carlo sampling.
+
+        The threshold of an alpha level is the quantile of level 1 - alpha
+        of the PDF f(X), where X has the PDF f, estimated from a sample of
+        the distribution. This is the estimate of the minimum volume level
+        sets by sampling, with the sample generated and evaluated by
+        chunks in a pool of processes. Each chunk has its own random
+        stream, derived from the seed and the index of the chunk: the same
+        seed gives the same thresholds whatever the number of jobs.
+
+        Parameters
+        ----------
+        sampleSize : int
+            The number of points, i.e. of evaluations of the density.
+        chunkSize : int
+            The number of points of each chunk.
+        numberOfJobs : int
+            The number of processes. If 1, no process is created.
+        seed : int
+            The seed of the random streams of the chunks. If None, it is
+            generated by the OpenTURNS random generator.
+        confidenceLevel : float
+            The level of the confidence interval of the thresholds.
+        """
+        super(MonteCarloThresholdAlgorithm, self).__init__(
+            sampleSize,
+            wideningFactor=1.0,
+            defensiveWeight=0.0,
+            confidenceLevel=confidenceLevel,
+            chunkSize=chunkSize,
+            numberOfJobs=numberOfJobs,
+            seed=seed,
+        )
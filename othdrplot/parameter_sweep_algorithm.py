@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Component to create ParameterSweepAlgorithm.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import time
+import numpy as np
+import openturns as ot
+from .high_density_region_algorithm import HighDensityRegionAlgorithm
+from .karhunen_loeve_dimension_reduction_algorithm import (
+    KarhunenLoeveDimensionReductionAlgorithm,
+)
+from .monte_carlo_threshold_algorithm import MonteCarloThresholdAlgorithm
+
+
+def _runDensityConfiguration(task):
+    """Fit one distribution and run the HDR for each set of alpha levels."""
+    reducedComponents, bandwidthFactor, alphaLevelsList, sampleSize, seed = task
+    sample = ot.Sample(reducedComponents)
+    start = time.time()
+    ks = ot.KernelSmoothing()
+    bandwidth = ks.computeSilvermanBandwidth(sample) * bandwidthFactor
+    distribution = ks.build(sample, bandwidth)
+    fit_time = time.time() - start
+    rows = []
+    for alphaLevels in alphaLevelsList:
+        start = time.time()
+        algo = HighDensityRegionAlgorithm(sample, distribution, list(alphaLevels))
+        algo.setThresholdAlgorithm(MonteCarloThresholdAlgorithm(sampleSize, seed=seed))
+        algo.run()
+        rows.append(
+            {
+                "numberOfComponents": sample.getDimension(),
+                "bandwidthFactor": bandwidthFactor,
+                "alphaLevels": tuple(algo.alphaLevels),
+                "outlierAlpha": algo.getOutlierAlpha(),
+                "pvalues": algo.pvalues.copy(),
+                "outlierIndices": list(algo.computeIndices()),
+                "fitTime": fit_time,
+                "hdrTime": time.time() - start,
+            }
+        )
+    return rows
+
+
+class ParameterSweepAlgorithm:
+    """Run the functional HDR for a grid of parameters."""
+
+    def __init__(
+        self,
+        processSample,
+        componentNumbers,
+        alphaLevelsList,
+        bandwidthFactors=[1.0],
+        numberOfJobs=1,
+        seed=0,
+        thresholdSampleSize=10000,
+    ):
+        """
+        Sensitivity of the outliers to the parameters of the HDR.
+
+        The configurations are all the combinations of the number of
+        components, the bandwidth factor and the alpha levels. The K-L
+        decomposition is computed once, with the largest number of
+        components: since the modes are sorted by decreasing eigenvalue,
+        the reduced components of a smaller number of components are the
+        first columns. A kernel smoothing is fitted once for each number
+        of components and bandwidth factor, and shared by all the alpha
+        levels. These independent fits are run in a pool of processes.
+        The thresholds are estimated with a MonteCarloThresholdAlgorithm,
+        whose random streams only depend on the seed: the results do not
+        depend on the number of jobs.
+
+        Parameters
+        ----------
+        processSample : ot.ProcessSample
+            The collection of processes.
+        componentNumbers : list(int)
+            The numbers of components of the K-L decomposition.
+        alphaLevelsList : list(list(float))
+            The sets of alpha levels.
+        bandwidthFactors : list(float)
+            The factors of the Silverman bandwidth of the kernel smoothing.
+        numberOfJobs : int
+            The number of processes. If 1, no process is created.
+        seed : int
+            The seed of the Monte-Carlo estimate of the thresholds.
+        thresholdSampleSize : int
+            The sample size of the Monte-Carlo estimate of the thresholds.
+        """
+        if len(componentNumbers) == 0:
+            raise ValueError("The number of component numbers is zero.")
+        if len(alphaLevelsList) == 0:
+            raise ValueError("The number of alpha levels sets is zero.")
+        if len(bandwidthFactors) == 0:
+            raise ValueError("The number of bandwidth factors is zero.")
+        self.processSample = processSample
+        self.componentNumbers = list(componentNumbers)
+        self.alphaLevelsList = [list(alphaLevels) for alphaLevels in alphaLevelsList]
+        self.bandwidthFactors = list(bandwidthFactors)
+        self.numberOfJobs = numberOfJobs
+        self.seed = seed
+        self.thresholdSampleSize = thresholdSampleSize
+
+        # Computed by the algorithm
+        self.reducedComponents = None
+        self.reductionTime = None
+        self.results = None
+
+    def run(self):
+        """Run all the configurations."""
+        start = time.time()
+        reduction = KarhunenLoeveDimensionReductionAlgorithm(
+            self.processSample, max(self.componentNumbers)
+        )
+        reduction.run()
+        self.reducedComponents = reduction.getReducedComponents()
+        self.reductionTime = time.time() - start
+
+        reducedComponents = np.array(self.reducedComponents)
+        tasks = [
+            (
+                reducedComponents[:, :numberOfComponents],
+                bandwidthFactor,
+                self.alphaLevelsList,
+                self.thresholdSampleSize,
+                self.seed,
+            )
+            for numberOfComponents in self.componentNumbers
+            for bandwidthFactor in self.bandwidthFactors
+        ]
+        if self.numberOfJobs > 1:
+            with ProcessPoolExecutor(max_workers=self.numberOfJobs) as executor:
+                task_rows = list(executor.map(_runDensityConfiguration, tasks))
+        else:
+            task_rows = [_runDensityConfiguration(task) for task in tasks]
+        self.results = [row for rows in task_rows for row in rows]
+
+    def getResults(self):
+        """
+        Return one row per configuration.
+
+        Returns
+        -------
+        results : list(dict)
+            For each configuration, the keys are "numberOfComponents",
+            "bandwidthFactor", "alphaLevels", "outlierAlpha", "pvalues",
+            "outlierIndices", "fitTime" (the time to fit the
+            distribution, shared by the alpha levels) and "hdrTime".
+        """
+        return self.results
+
+    def getReducedComponents(self):
+        """
+        Returns the reduced components with the largest number of components.
+
+        Returns
+        -------
+        reducedComponents : ot.Sample(n, d)
+            The n points in the d-dimensional reduced space.
+        """
+        return self.reducedComponents
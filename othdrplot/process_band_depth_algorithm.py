@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Component to create ProcessBandDepthAlgorithm.
+"""
+import numpy as np
+import openturns as ot
+from .process_sample_conversion import (
+    ConvertProcessSampleToArray,
+    ConvertArrayToProcessSample,
+)
+
+
+def ComputeModifiedBandDepth(trajectories, blockSize=8):
+    """
+    Return the modified band depth of each trajectory.
+
+    The modified band depth of a curve is the proportion of time that it
+    spends in the band delimited by two curves of the sample, averaged
+    over all the pairs of curves. At each vertex, the number of pairs
+    whose band contains the value of a curve is computed from the number
+    of values strictly lower and strictly greater, so that the cost is
+    one sort per vertex instead of a loop over the pairs.
+
+    Parameters
+    ----------
+    trajectories : np.array(n, m)
+        The values of the n trajectories on the m vertices, one per row.
+    blockSize : int
+        The number of vertices sorted together.
+
+    Returns
+    -------
+    depth : np.array(n)
+        The modified band depth of each trajectory, in [0, 1].
+    """
+    trajectories = np.asarray(trajectories, dtype=float)
+    if trajectories.ndim != 2:
+        raise ValueError(
+            "Expect a 2 dimension array, but dimension is %d" % (trajectories.ndim)
+        )
+    size, nbVertices = trajectories.shape
+    if size < 2:
+        raise ValueError("The number of trajectories must be at least 2, but is %d." % (size))
+    numberOfPairs = size * (size - 1) / 2.0
+    depth = np.zeros(size)
+    position = np.arange(size)
+    for start in range(0, nbVertices, blockSize):
+        # One row per vertex, so that the sorts are contiguous
+        block = np.ascontiguousarray(trajectories[:, start : start + blockSize].T)
+        order = np.argsort(block, axis=1)
+        sorted_values = np.take_along_axis(block, order, axis=1)
+        # The first and last positions of each run of equal values
+        first = np.ones(block.shape, dtype=bool)
+        first[:, 1:] = sorted_values[:, 1:] != sorted_values[:, :-1]
+        last = np.ones(block.shape, dtype=bool)
+        last[:, :-1] = first[:, 1:]
+        below = np.maximum.accumulate(np.where(first, position, 0), axis=1)
+        upper = np.where(last, position, size - 1)[:, ::-1]
+        above = size - 1 - np.minimum.accumulate(upper, axis=1)[:, ::-1]
+        # The pairs which are not entirely below or entirely above
+        count = numberOfPairs - 0.5 * below * (below - 1) - 0.5 * above * (above - 1)
+        # Back to the order of the trajectories
+        np.put_along_axis(count, order, count.copy(), axis=1)
+        depth += np.sum(count, axis=0)
+    return depth / (numberOfPairs * nbVertices)
+
+
+class ProcessBandDepthAlgorithm:
+    """Detect outlier trajectories with the modified band depth."""
+
+    def __init__(self, processSample, alphaLevels=[0.5, 0.9]):
+        """
+        Functional outliers based on the modified band depth.
+
+        This is an alternative to ProcessHighDensityRegionAlgorithm which
+        requires neither a dimension reduction nor a density fit: the
+        depth is computed directly on the trajectories. The central region
+        of an alpha level is made of the fraction alpha of the deepest
+        trajectories. The outliers are the trajectories which are not in
+        the central region of the maximum alpha level. The central curve
+        is the deepest trajectory.
+
+        Parameters
+        ----------
+        processSample : ot.ProcessSample
+            The collection of processes.
+        alphaLevels : list(float)
+            The list of alpha levels of the central regions.
+        """
+        if len(alphaLevels) == 0:
+            raise ValueError("The number of alpha levels is zero.")
+        dim = processSample.getDimension()
+        if dim != 1:
+            raise ValueError(
+                "The dimension of the process sample must be equal to 1, but "
+                "current dimension is %d." % (dim)
+            )
+        self.processSample = processSample
+        self.alphaLevels = alphaLevels
+        self.alphaLevels.sort(reverse=True)
+        self.outlierAlpha = float(np.max(self.alphaLevels))
+
+        # Graphical style
+        self.outlier_color = "firebrick3"
+        self.inlier_color = "forestgreen"
+        self.central_color = "black"
+        self.confidence_band_color = "#87cefa"
+
+        # Computed by the algorithm
+        self.trajectories = None
+        self.depth = None
+        self.depthThresholds = None
+        self.outlierDepthThreshold = None
+        self.idx_mode = None
+        self.outlier_indices = None
+        self.inlier_indices = None
+
+    def run(self):
+        """Compute the depths, the thresholds and the outliers."""
+        self.trajectories = ConvertProcessSampleToArray(self.processSample)
+        self.depth = ComputeModifiedBandDepth(self.trajectories)
+        size = self.depth.size
+        sorted_depth = np.sort(self.depth)[::-1]
+        # The threshold of alpha is the depth of the last curve of the
+        # fraction alpha of the deepest curves
+        self.depthThresholds = np.zeros(len(self.alphaLevels))
+        for i in range(len(self.alphaLevels)):
+            k = min(max(int(np.ceil(self.alphaLevels[i] * size)), 1), size)
+            self.depthThresholds[i] = sorted_depth[k - 1]
+        self.outlierDepthThreshold = float(np.min(self.depthThresholds))
+        self.idx_mode = int(np.argmax(self.depth))
+
+        flag = self.depth >= self.outlierDepthThreshold
+        self.outlier_indices = [int(i) for i in np.where(~flag)[0]]
+        self.inlier_indices = [int(i) for i in np.where(flag)[0]]
+
+    def getDepth(self):
+        """
+        Return the modified band depth of each trajectory.
+
+        Returns
+        -------
+        depth : np.array(n)
+            The depths, in [0, 1].
+        """
+        return self.depth
+
+    def getMode(self):
+        """
+        Return the index of the deepest trajectory.
+
+        Returns
+        -------
+        index : int
+            The index of the central curve in the process sample.
+        """
+        return self.idx_mode
+
+    def getOutlierAlpha(self):
+        """
+        Return alpha level of outliers.
+
+        Returns
+        -------
+        outlierAlpha : float
+            The alpha level of outliers.
+        """
+        return self.outlierAlpha
+
+    def computeIndices(self, outlierFlag=True):
+        """
+        Get inlier or outlier indices.
+
+        Parameters
+        ----------
+        outlierFlag : bool
+            If False, compute indices of inlier trajectories.
+            If True, compute indices of outlier trajectories.
+
+        Returns
+        -------
+        indices : list(int)
+            The indices of selected trajectories in the process sample.
+        """
+        if outlierFlag:
+            return self.outlier_indices
+        return self.inlier_indices
+
+    def computeCentralRegion(self, alpha=None):
+        """
+        Return the band of the central region of an alpha level.
+
+        Parameters
+        ----------
+        alpha : float
+            One of the alpha levels. If None, the outlier alpha level.
+
+        Returns
+        -------
+        lower : np.array(m)
+            The minimum of the trajectories of the central region at each vertex.
+        upper : np.array(m)
+            The maximum of the trajectories of the central region at each vertex.
+        """
+        if alpha is None:
+            alpha = self.outlierAlpha
+        index = [i for i in range(len(self.alphaLevels)) if self.alphaLevels[i] == alpha]
+        if len(index) == 0:
+            raise ValueError("The alpha level %s is not in %s" % (alpha, self.alphaLevels))
+        central = self.trajectories[self.depth >= self.depthThresholds[index[0]]]
+        return np.min(central, axis=0), np.max(central, axis=0)
+
+    def draw(self, drawInliers=False, drawOutliers=True, discreteMean=False, bounds=True):
+        """
+        Plot outlier trajectories based on the band depth.
+
+        Parameters
+        ----------
+        drawInliers : bool
+            If True, plots the inlier curves.
+        drawOutliers : bool
+            If True, draw the outliers curves.
+        discreteMean : bool
+            If False, the central curve is the deepest curve.
+            If True, the central curve is the mean of the process sample.
+        bounds : bool
+            If True, plots the band of the central region of the outlier
+            alpha level.
+
+        Returns
+        -------
+        graph : ot.Graph
+            The plot of outlier trajectories.
+        """
+        graph = ot.Graph(
+            r"Outliers at $\alpha$=%.2f" % (self.outlierAlpha), "", "", True, "topright"
+        )
+        mesh = self.processSample.getMesh()
+        t = np.ravel(mesh.getVertices())
+
+        def drawTrajectories(indices, color):
+            """Add the trajectories of the indices."""
+            if len(indices) == 0:
+                return
+            subset = ConvertArrayToProcessSample(mesh, self.trajectories[indices])
+            subset_graph = subset.drawMarginal(0)
+            subset_graph.setColors([color])
+            graph.add(subset_graph)
+
+        if drawOutliers:
+            drawTrajectories(self.outlier_indices, self.outlier_color)
+        if drawInliers:
+            drawTrajectories(self.inlier_indices, self.inlier_color)
+
+        if bounds:
+            lower, upper = self.computeCentralRegion()
+            polygons = [
+                ot.Polygon(
+                    [
+                        [t[i], lower[i]],
+                        [t[i + 1], lower[i + 1]],
+                        [t[i + 1], upper[i + 1]],
+                        [t[i], upper[i]],
+                    ],
+                    self.confidence_band_color,
+                    self.confidence_band_color,
+                )
+                for i in range(t.size - 1)
+            ]
+            band = ot.PolygonArray(polygons)
+            band.setLegend(r"Central region at $\alpha$=%.2f" % (self.outlierAlpha))
+            graph.add(band)
+
+        if discreteMean:
+            central = np.mean(self.trajectories, axis=0)
+        else:
+            central = self.trajectories[self.idx_mode]
+        curve = ot.Curve(t[:, None], central[:, None], "Central curve")
+        curve.setColor(self.central_color)
+        graph.add(curve)
+        return graph
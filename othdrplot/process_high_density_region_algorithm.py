@@ -5,7 +5,18 @@ Component to create ProcessHighDensityRegionAlgorithm.
 """
 import numpy as np
 import openturns as ot
+import matplotlib.pyplot as plt
 from .high_density_region_algorithm import HighDensityRegionAlgorithm
+from .process_sample_conversion import (
+    ConvertProcessSampleToArray,
+    ConvertArrayToProcessSample,
+)
+from .matplotlib_rendering import (
+    ConvertColorToMatplotlib,
+    DrawTrajectoryCollection,
+    SelectEvenlySpaced,
+)
+from .trajectory_decimation import DecimateTrajectories
 
 
 class ProcessHighDensityRegionAlgorithm(HighDensityRegionAlgorithm):
@@ -47,6 +58,7 @@ class ProcessHighDensityRegionAlgorithm(HighDensityRegionAlgorithm):
                 "current dimension is %d." % (dim)
             )
         self.processSample = processSample
+        self.mesh = processSample.getMesh()
 
         # Graphical style
         self.central_color = "black"
@@ -58,10 +70,150 @@ class ProcessHighDensityRegionAlgorithm(HighDensityRegionAlgorithm):
         self.confidence_band_color = ot.Drawable.ConvertFromRGBA(
             r, g, b, self.default_confidence_band_alpha
         )
+        # Rasterize the trajectories drawn with matplotlib above this
+        # number of values
+        self.rasterizationThreshold = 100000
         super(ProcessHighDensityRegionAlgorithm, self).__init__(reducedComponents, reducedDistribution, alphaLevels)
+        self._processSampleIsOwned = False
+        self._trajectories = None
+        self._numberOfTrajectories = 0
+
+    def _getTrajectories(self):
+        """Return the array of trajectories, float32 in compact storage."""
+        if self._trajectories is None:
+            self._trajectories = ConvertProcessSampleToArray(self.processSample)
+            self._numberOfTrajectories = self._trajectories.shape[0]
+        return self._trajectories[: self._numberOfTrajectories]
+
+    def setCompactStorage(self, compactStorage):
+        """
+        Set the compact storage mode.
+
+        In addition to the compact storage of HighDensityRegionAlgorithm,
+        the trajectories are converted once to a contiguous float32 array,
+        which halves the memory, and the processSample attribute is set to
+        None: only the mesh is kept. The trajectories appended by update()
+        are stored in this array, whose capacity grows geometrically. It
+        must be set before run(). As for the sample, the conversion starts
+        from the double precision process sample, so that the peak memory
+        is not reduced.
+
+        Without compact storage, the first draw, export or band computation
+        converts the trajectories to a float64 array, which is kept next to
+        the process sample and extended by update(): the trajectories are
+        then held twice.
+
+        Parameters
+        ----------
+        compactStorage : bool
+            If True, use the compact storage.
+        """
+        wasCompact = self.compactStorage
+        super(ProcessHighDensityRegionAlgorithm, self).setCompactStorage(
+            compactStorage
+        )
+        if compactStorage and not wasCompact:
+            self._trajectories = ConvertProcessSampleToArray(
+                self.processSample, np.float32
+            )
+            self._numberOfTrajectories = self._trajectories.shape[0]
+            self.processSample = None
+        elif not compactStorage and wasCompact:
+            self.processSample = ConvertArrayToProcessSample(
+                self.mesh, self._getTrajectories()
+            )
+            self._processSampleIsOwned = True
+            self._trajectories = None
+            self._numberOfTrajectories = 0
+
+    def update(self, newProcessSample, newReducedComponents, distribution=None):
+        """
+        Append new trajectories and score them against the current thresholds.
+
+        Parameters
+        ----------
+        newProcessSample : ot.ProcessSample
+            The new trajectories, on the same mesh as the process sample.
+        newReducedComponents : ot.Sample
+            The new trajectories in the reduced space.
+        distribution : ot.Distribution
+            If not None, a distribution refitted in the reduced space.
+            See HighDensityRegionAlgorithm.update().
+        """
+        if newProcessSample.getSize() != newReducedComponents.getSize():
+            raise ValueError(
+                "The number of new trajectories is %d but "
+                "the number of new reduced components is %d."
+                % (newProcessSample.getSize(), newReducedComponents.getSize())
+            )
+        nbVertices = self.mesh.getVerticesNumber()
+        if newProcessSample.getMesh().getVerticesNumber() != nbVertices:
+            raise ValueError(
+                "The number of vertices of the new trajectories is %d but "
+                "the number of vertices of the process sample is %d."
+                % (newProcessSample.getMesh().getVerticesNumber(), nbVertices)
+            )
+        super(ProcessHighDensityRegionAlgorithm, self).update(
+            newReducedComponents, distribution
+        )
+        if not self.compactStorage:
+            # Do not modify the process sample of the caller
+            if not self._processSampleIsOwned:
+                self.processSample = ot.ProcessSample(self.processSample)
+                self._processSampleIsOwned = True
+            for i in range(newProcessSample.getSize()):
+                self.processSample.add(newProcessSample[i])
+        if self._trajectories is not None:
+            # Only the new trajectories are converted
+            self._trajectories = self._appendRows(
+                self._trajectories,
+                self._numberOfTrajectories,
+                ConvertProcessSampleToArray(
+                    newProcessSample, self._trajectories.dtype
+                ),
+            )
+            self._numberOfTrajectories += newProcessSample.getSize()
+
+    def _computeInlierBand(self):
+        """Return the minimum and the maximum of the inliers at each vertex."""
+        trajectories = self._getTrajectories()
+        inliers = trajectories[np.asarray(self.computeIndices(False), dtype=int)]
+        if inliers.shape[0] == 0:
+            nan = np.full(trajectories.shape[1], np.nan)
+            return nan, nan.copy()
+        return np.min(inliers, axis=0), np.max(inliers, axis=0)
+
+    def computeVertexColumns(self):
+        """
+        Return the results of each vertex of the mesh as columns.
+
+        Returns
+        -------
+        columns : dict(str, np.array(m))
+            The "vertex" coordinate, the "band_lower" and "band_upper"
+            envelope of the inliers, as in draw(), the "mode" trajectory
+            and the "mean" of the trajectories.
+        """
+        trajectories = self._getTrajectories()
+        band_lower, band_upper = self._computeInlierBand()
+        return {
+            "vertex": np.ravel(self.mesh.getVertices()),
+            "band_lower": np.asarray(band_lower, dtype=float),
+            "band_upper": np.asarray(band_upper, dtype=float),
+            "mode": np.array(trajectories[self.getMode()], dtype=float),
+            "mean": np.mean(trajectories, axis=0, dtype=float),
+        }
 
     def draw(
-        self, drawInliers=False, drawOutliers=True, discreteMean=False, bounds=True
+        self,
+        drawInliers=False,
+        drawOutliers=True,
+        discreteMean=False,
+        bounds=True,
+        numberOfModes=1,
+        colorByLevel=False,
+        maximumNumberOfInliers=None,
+        numberOfBuckets=None,
     ):
         """
         Plot outlier trajectories based on HDR.
@@ -80,6 +232,23 @@ class ProcessHighDensityRegionAlgorithm(HighDensityRegionAlgorithm):
             If True, plots the bounds of the confidence interval.
             These bounds are made of the mininimum and maximum at
             each time.
+        numberOfModes : int
+            The maximum number of central curves when discreteMean is False.
+            If greater than 1, the central curves are the curves which
+            represent the local modes (see computeLocalModes()).
+        colorByLevel : bool
+            If True, the inlier curves are colored by the innermost high
+            density region which contains them (see computeLevelMembership()),
+            with the colors in level_colors.
+        maximumNumberOfInliers : int
+            The maximum number of inlier curves drawn in each color. The
+            drawn curves are evenly spaced in the list of inliers. If None,
+            all the inliers are drawn.
+        numberOfBuckets : int
+            If not None, the inlier and outlier curves are decimated to
+            their minimum and maximum in this number of buckets of vertices
+            (see DecimateTrajectories()), e.g. the width of the plot in
+            pixels. The bounds and the central curves are not decimated.
 
         Returns
         -------
@@ -96,33 +265,41 @@ class ProcessHighDensityRegionAlgorithm(HighDensityRegionAlgorithm):
         )
 
         # Get the mesh
-        mesh = self.processSample.getMesh()
+        mesh = self.mesh
         t = np.ravel(mesh.getVertices())
 
+        # The subsets of trajectories are built from the array, without
+        # copying the whole process sample
+        trajectories = self._getTrajectories()
+
+        def convert_subset(indices):
+            """Return the process sample of the drawn trajectories."""
+            subset = trajectories[indices]
+            if numberOfBuckets is None:
+                return ConvertArrayToProcessSample(mesh, subset)
+            vertices, subset = DecimateTrajectories(t, subset, numberOfBuckets)
+            simplices = [[i, i + 1] for i in range(vertices.size - 1)]
+            decimated_mesh = ot.Mesh(ot.Sample(vertices[:, None]), simplices)
+            return ConvertArrayToProcessSample(decimated_mesh, subset)
+
         # Plot outlier trajectories
         outlier_indices = self.computeIndices()
-        if len(outlier_indices) > 0:
-            outlier_process_sample = ot.ProcessSample(mesh, len(outlier_indices), 1)
-            index = 0
-            for i in outlier_indices:
-                outlier_process_sample[index] = self.processSample[i]
-                index += 1
-            if drawOutliers:
-                outlier_graph = outlier_process_sample.drawMarginal(0)
-                outlier_graph.setColors([self.outlier_color])
-                graph.add(outlier_graph)
+        if drawOutliers and len(outlier_indices) > 0:
+            outlier_process_sample = convert_subset(outlier_indices)
+            outlier_graph = outlier_process_sample.drawMarginal(0)
+            outlier_graph.setColors([self.outlier_color])
+            graph.add(outlier_graph)
 
         # Plot inlier trajectories
         inlier_indices = self.computeIndices(False)
-        if len(inlier_indices):
-            inlier_process_sample = ot.ProcessSample(mesh, len(inlier_indices), 1)
-            index = 0
-            for i in inlier_indices:
-                inlier_process_sample[index] = self.processSample[i]
-                index += 1
-            if drawInliers:
+        if drawInliers:
+            for indices, color, _ in self._computeInlierGroups(colorByLevel):
+                if len(indices) == 0:
+                    continue
+                indices = SelectEvenlySpaced(indices, maximumNumberOfInliers)
+                inlier_process_sample = convert_subset(indices)
                 inlier_graph = inlier_process_sample.drawMarginal(0)
-                inlier_graph.setColors([self.inlier_color])
+                inlier_graph.setColors([color])
                 graph.add(inlier_graph)
 
         # Plot inlier bounds
@@ -138,14 +315,11 @@ class ProcessHighDensityRegionAlgorithm(HighDensityRegionAlgorithm):
             bounds_poly.setLegend(legend)
             return bounds_poly
 
-        if bounds:
-            inlier_min = inlier_process_sample.computeQuantilePerComponent(0.0)
-            inlier_max = inlier_process_sample.computeQuantilePerComponent(1.0)
-            min_values = inlier_min.getValues()
-            max_values = inlier_max.getValues()
+        if bounds and len(inlier_indices) > 0:
+            min_values, max_values = self._computeInlierBand()
             nbVertices = mesh.getVerticesNumber()
-            lower_bound = [[t[i], min_values[i, 0]] for i in range(nbVertices)]
-            upper_bound = [[t[i], max_values[i, 0]] for i in range(nbVertices)]
+            lower_bound = [[t[i], min_values[i]] for i in range(nbVertices)]
+            upper_bound = [[t[i], max_values[i]] for i in range(nbVertices)]
 
             outlierAlpha = np.max(self.alphaLevels)
             bounds = fill_between(
@@ -158,13 +332,156 @@ class ProcessHighDensityRegionAlgorithm(HighDensityRegionAlgorithm):
 
         # Plot central curve
         if discreteMean:
-            central_field = self.processSample.computeMean()
+            central_field = np.mean(trajectories, axis=0, dtype=float)
+            curve = ot.Curve(t[:, None], central_field[:, None], "Central curve")
+            curve.setColor(self.central_color)
+            graph.add(curve)
         else:
-            mode_index = self.getMode()
-            central_field = self.processSample[mode_index]
-
-        curve = ot.Curve(t[:, None], central_field, "Central curve")
-        curve.setColor(self.central_color)
-        graph.add(curve)
+            if numberOfModes > 1:
+                if self.local_mode_indices is None:
+                    self.computeLocalModes()
+                mode_indices = self.local_mode_indices[:numberOfModes]
+            else:
+                mode_indices = [self.getMode()]
+            for rank, mode_index in enumerate(mode_indices):
+                central_field = np.array(trajectories[mode_index], dtype=float)
+                central_field = central_field[:, None]
+                if rank == 0:
+                    curve = ot.Curve(t[:, None], central_field, "Central curve")
+                else:
+                    curve = ot.Curve(
+                        t[:, None], central_field, "Central curve %d" % (rank + 1)
+                    )
+                    curve.setLineStyle("dashed")
+                curve.setColor(self.central_color)
+                graph.add(curve)
 
         return graph
+
+    def drawWithMatplotlib(
+        self,
+        drawInliers=False,
+        drawOutliers=True,
+        discreteMean=False,
+        bounds=True,
+        numberOfModes=1,
+        axes=None,
+        maximumNumberOfInliers=None,
+        rasterized=None,
+        numberOfBuckets=None,
+        colorByLevel=False,
+    ):
+        """
+        Plot outlier trajectories directly with matplotlib.
+
+        This is the same plot as draw(), without OpenTURNS drawables:
+        each set of trajectories is a single LineCollection and the
+        bounds are drawn with fill_between.
+
+        Parameters
+        ----------
+        drawInliers : bool
+            If True, plots the inlier curves.
+        drawOutliers : bool
+            If True, draw the outliers curves.
+        discreteMean : bool
+            If False, the central curve is the curve in the process sample
+            which has highest density.
+            If True, the central curve is the mean of the process sample.
+        bounds : bool
+            If True, plots the bounds of the confidence interval.
+        numberOfModes : int
+            The maximum number of central curves when discreteMean is False.
+        axes : matplotlib.axes.Axes
+            The axes. If None, new axes are created.
+        maximumNumberOfInliers : int
+            The maximum number of inlier curves drawn in each color. The
+            drawn curves are evenly spaced in the list of inliers. If None,
+            all the inliers are drawn. The bounds are always computed from
+            all the inliers.
+        rasterized : bool
+            If True, the trajectories are rasterized in vector outputs.
+            If None, they are rasterized if the number of drawn values
+            is greater than rasterizationThreshold.
+        numberOfBuckets : int
+            If not None, the inlier and outlier curves are decimated to
+            their minimum and maximum in this number of buckets of vertices
+            (see DecimateTrajectories()). The bounds and the central curves
+            are not decimated.
+        colorByLevel : bool
+            If True, the inlier curves are colored by the innermost high
+            density region which contains them (see computeLevelMembership()),
+            with the colors in level_colors.
+
+        Returns
+        -------
+        axes : matplotlib.axes.Axes
+            The plot of outlier trajectories.
+        """
+        if axes is None:
+            _, axes = plt.subplots()
+        trajectories = self._getTrajectories()
+        t = np.ravel(self.mesh.getVertices())
+        outlierAlpha = self.getOutlierAlpha()
+        axes.set_title(r"Outliers at $\alpha$=%.2f" % (outlierAlpha))
+
+        selections = []
+        if drawOutliers:
+            selections.append(
+                (np.array(self.outlier_indices, dtype=int), self.outlier_color)
+            )
+        if drawInliers:
+            for indices, color, _ in self._computeInlierGroups(colorByLevel):
+                selections.append(
+                    (SelectEvenlySpaced(indices, maximumNumberOfInliers), color)
+                )
+        if rasterized is None:
+            numberOfDrawnVertices = t.size
+            if numberOfBuckets is not None:
+                numberOfDrawnVertices = min(t.size, 2 * numberOfBuckets)
+            numberOfValues = sum(indices.size for indices, _ in selections)
+            numberOfValues *= numberOfDrawnVertices
+            rasterized = numberOfValues > self.rasterizationThreshold
+        for indices, color in selections:
+            t_drawn, drawn = t, trajectories[indices]
+            if numberOfBuckets is not None:
+                t_drawn, drawn = DecimateTrajectories(t, drawn, numberOfBuckets)
+            DrawTrajectoryCollection(axes, t_drawn, drawn, color, rasterized=rasterized)
+
+        if bounds and len(self.inlier_indices) > 0:
+            min_values, max_values = self._computeInlierBand()
+            axes.fill_between(
+                t,
+                min_values,
+                max_values,
+                color=ConvertColorToMatplotlib(self.confidence_band_color),
+                label=r"Conf. interval at $\alpha$=%.2f" % (outlierAlpha),
+            )
+
+        central_color = ConvertColorToMatplotlib(self.central_color)
+        if discreteMean:
+            axes.plot(
+                t, np.mean(trajectories, axis=0), color=central_color, label="Central curve"
+            )
+        else:
+            if numberOfModes > 1:
+                if self.local_mode_indices is None:
+                    self.computeLocalModes()
+                mode_indices = self.local_mode_indices[:numberOfModes]
+            else:
+                mode_indices = [self.getMode()]
+            for rank, mode_index in enumerate(mode_indices):
+                if rank == 0:
+                    axes.plot(
+                        t, trajectories[mode_index], color=central_color, label="Central curve"
+                    )
+                else:
+                    axes.plot(
+                        t,
+                        trajectories[mode_index],
+                        color=central_color,
+                        linestyle="dashed",
+                        label="Central curve %d" % (rank + 1),
+                    )
+        axes.legend(loc="upper right")
+        return axes
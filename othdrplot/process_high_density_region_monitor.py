@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Component to create ProcessHighDensityRegionMonitor.
+"""
+import numpy as np
+import openturns as ot
+from .high_density_region_algorithm import HighDensityRegionAlgorithm
+from .karhunen_loeve_dimension_reduction_algorithm import (
+    KarhunenLoeveDimensionReductionAlgorithm,
+)
+from .process_sample_conversion import (
+    ConvertProcessSampleToArray,
+    ConvertArrayToProcessSample,
+)
+
+
+class ProcessHighDensityRegionMonitor:
+    """Monitor outlier trajectories over a sliding window."""
+
+    def __init__(
+        self,
+        processSample,
+        numberOfComponents,
+        windowSize=None,
+        alphaLevels=[0.5, 0.9],
+        refreshPeriod=None,
+        distributionFactory=None,
+    ):
+        """
+        Online outlier detection on the last trajectories of a stream.
+
+        The window keeps the last windowSize trajectories. Each new
+        trajectory is projected on the current K-L basis with a matrix
+        product and scored with the current reduced distribution. The K-L
+        decomposition, the distribution fit and the level sets are
+        recomputed on the window every refreshPeriod arrivals only.
+
+        Parameters
+        ----------
+        processSample : ot.ProcessSample
+            The initial trajectories. Only the last windowSize trajectories
+            are kept.
+        numberOfComponents : int
+            The number of components of the K-L decomposition.
+        windowSize : int
+            The maximum number of trajectories in the window.
+            If None, the size of the initial process sample.
+        alphaLevels : list(float)
+            The list of alpha levels for minimum volume level set algorithm.
+        refreshPeriod : int
+            The number of arrivals between two refits of the window.
+            If None, the window size.
+        distributionFactory : ot.DistributionFactory
+            The factory which fits the reduced components.
+            If None, use ot.KernelSmoothing().
+        """
+        # Check input
+        dim = processSample.getDimension()
+        if dim != 1:
+            raise ValueError(
+                "The dimension of the process sample must be equal to 1, but "
+                "current dimension is %d." % (dim)
+            )
+        if windowSize is None:
+            windowSize = processSample.getSize()
+        if windowSize < 2:
+            raise ValueError("The window size must be at least 2, but is %d." % (windowSize))
+        if refreshPeriod is None:
+            refreshPeriod = windowSize
+        if refreshPeriod < 1:
+            raise ValueError(
+                "The refresh period must be at least 1, but is %d." % (refreshPeriod)
+            )
+        if distributionFactory is None:
+            distributionFactory = ot.KernelSmoothing()
+
+        self.mesh = processSample.getMesh()
+        self.numberOfComponents = numberOfComponents
+        self.windowSize = windowSize
+        self.alphaLevels = alphaLevels
+        self.refreshPeriod = refreshPeriod
+        self.distributionFactory = distributionFactory
+        self.outlierCallback = None
+
+        # The window is a circular buffer: the oldest trajectory is at
+        # self._start and the buffer holds self._count trajectories
+        nbVertices = self.mesh.getVerticesNumber()
+        self._trajectories = np.zeros((windowSize, nbVertices))
+        self._reducedComponents = np.zeros((windowSize, numberOfComponents))
+        self._pdf = np.zeros(windowSize)
+        self._start = 0
+        self._count = 0
+        initial_trajectories = ConvertProcessSampleToArray(processSample)
+        for values in initial_trajectories[-windowSize:]:
+            self._push(values)
+
+        # Computed by the algorithm
+        self.projectionMatrix = None
+        self.distribution = None
+        self.hdr = None
+        self.numberOfArrivals = 0
+        self.numberOfArrivalsSinceRefresh = 0
+        self.outlier_events = []
+
+    def _push(self, values):
+        """Insert a trajectory in the window, evicting the oldest if full."""
+        if self._count < self.windowSize:
+            position = (self._start + self._count) % self.windowSize
+            self._count += 1
+        else:
+            position = self._start
+            self._start = (self._start + 1) % self.windowSize
+        self._trajectories[position] = values
+        return position
+
+    def _window(self):
+        """Return the positions of the window in the buffer, oldest first."""
+        return (self._start + np.arange(self._count)) % self.windowSize
+
+    def run(self):
+        """Fit the K-L basis, the reduced distribution and the level sets."""
+        positions = self._window()
+        processSample = ConvertArrayToProcessSample(
+            self.mesh, self._trajectories[positions]
+        )
+        reduction = KarhunenLoeveDimensionReductionAlgorithm(
+            processSample, self.numberOfComponents
+        )
+        reduction.run()
+        karhunenLoeveResult = reduction.getKarhunenLoeveResult()
+        self.projectionMatrix = np.array(karhunenLoeveResult.getProjectionMatrix())
+        numberOfComponents = self.projectionMatrix.shape[0]
+        if numberOfComponents != self._reducedComponents.shape[1]:
+            self._reducedComponents = np.zeros((self.windowSize, numberOfComponents))
+        reducedComponents = reduction.getReducedComponents()
+        self._reducedComponents[positions] = np.array(reducedComponents)
+
+        self.distribution = self.distributionFactory.build(reducedComponents)
+        self.hdr = HighDensityRegionAlgorithm(
+            reducedComponents, self.distribution, list(self.alphaLevels)
+        )
+        self.hdr.run()
+        self._pdf[positions] = self.hdr.sample_pdf
+        self.numberOfArrivalsSinceRefresh = 0
+
+    def addTrajectory(self, trajectory):
+        """
+        Add a new trajectory to the window and score it.
+
+        Parameters
+        ----------
+        trajectory : sequence of float
+            The values of the trajectory at the vertices of the mesh.
+
+        Returns
+        -------
+        isOutlier : bool
+            True if the trajectory is an outlier for the current thresholds.
+        """
+        if self.hdr is None:
+            raise ValueError("The run() method must be called before addTrajectory().")
+        values = np.ravel(np.array(trajectory, dtype=float))
+        if values.size != self._trajectories.shape[1]:
+            raise ValueError(
+                "The number of values of the trajectory is %d but "
+                "the number of vertices of the mesh is %d."
+                % (values.size, self._trajectories.shape[1])
+            )
+        reduced_point = self.projectionMatrix.dot(values)
+        pdf = self.distribution.computePDF(reduced_point)
+        position = self._push(values)
+        self._reducedComponents[position] = reduced_point
+        self._pdf[position] = pdf
+
+        arrival = self.numberOfArrivals
+        self.numberOfArrivals += 1
+        isOutlier = bool(pdf < self.hdr.getOutlierPValue())
+        if isOutlier:
+            self.outlier_events.append((arrival, pdf))
+            if self.outlierCallback is not None:
+                self.outlierCallback(arrival, values, pdf)
+
+        self.numberOfArrivalsSinceRefresh += 1
+        if self.numberOfArrivalsSinceRefresh >= self.refreshPeriod:
+            self.run()
+        return isOutlier
+
+    def setOutlierCallback(self, outlierCallback):
+        """
+        Set the function called on each outlier arrival.
+
+        Parameters
+        ----------
+        outlierCallback : callable or None
+            The function called as outlierCallback(arrival, values, pdf),
+            where arrival is the index of the trajectory in the stream,
+            values is the array of values and pdf is its density in the
+            reduced space.
+        """
+        self.outlierCallback = outlierCallback
+
+    def getOutlierEvents(self):
+        """
+        Return the outlier arrivals.
+
+        Returns
+        -------
+        outlierEvents : list(tuple(int, float))
+            The index in the stream and the reduced density of each
+            outlier trajectory.
+        """
+        return self.outlier_events
+
+    def getModeTrajectory(self):
+        """
+        Return the trajectory of the window which has highest density.
+
+        Returns
+        -------
+        mode : ot.Field
+            The mode trajectory.
+        """
+        positions = self._window()
+        position = positions[int(np.argmax(self._pdf[positions]))]
+        values = ot.Sample(self._trajectories[position][:, None])
+        return ot.Field(self.mesh, values)
+
+    def getWindowProcessSample(self):
+        """
+        Return the trajectories in the window, oldest first.
+
+        Returns
+        -------
+        processSample : ot.ProcessSample
+            The trajectories in the window.
+        """
+        return ConvertArrayToProcessSample(
+            self.mesh, self._trajectories[self._window()]
+        )
+
+    def getReducedComponents(self):
+        """
+        Return the trajectories of the window in the reduced space.
+
+        Returns
+        -------
+        reducedComponents : ot.Sample
+            The reduced components of the window, oldest first.
+        """
+        return ot.Sample(self._reducedComponents[self._window()])
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Component to create ProcessHighDensityRegionPipeline.
+"""
+from collections import OrderedDict
+import openturns as ot
+from .karhunen_loeve_dimension_reduction_algorithm import (
+    KarhunenLoeveDimensionReductionAlgorithm,
+)
+from .process_high_density_region_algorithm import ProcessHighDensityRegionAlgorithm
+from .reduced_distribution_factory import ReducedDistributionFactory
+from .cross_validation_kernel_smoothing import CrossValidationKernelSmoothing
+
+
+class ProcessHighDensityRegionPipeline:
+    """Chain the dimension reduction, the density fit and the HDR."""
+
+    def __init__(
+        self,
+        processSample,
+        numberOfComponents=2,
+        distributionFactory="KernelSmoothing",
+        alphaLevels=[0.5, 0.9],
+        cacheSize=8,
+    ):
+        """
+        Functional HDR with memoized stages.
+
+        The pipeline runs the Karhunen-Loeve reduction, the fit of the
+        distribution of the reduced components and the
+        ProcessHighDensityRegionAlgorithm. The output of each stage is
+        stored in a least recently used cache, keyed on the parameters
+        of the stage and of the previous stages. Hence, changing only the
+        alpha levels reuses the reduction and the distribution, and
+        drawing reuses all the stages. Setting the process sample clears
+        the cache.
+
+        The reduction, the distribution and the algorithm returned by the
+        getters are the objects of the cache: they must not be modified.
+
+        Parameters
+        ----------
+        processSample : ot.ProcessSample
+            The collection of processes.
+        numberOfComponents : int
+            The number of components of the K-L decomposition.
+        distributionFactory : str or factory
+            The factory which fits the reduced components: an object with a
+            build(sample) method, or one of "KernelSmoothing",
+            "ReducedDistributionFactory" and "CrossValidationKernelSmoothing".
+        alphaLevels : list(float)
+            The list of alpha levels for minimum volume level set algorithm.
+        cacheSize : int
+            The maximum number of stage outputs in the cache.
+        """
+        if cacheSize < 1:
+            raise ValueError("The cache size must be at least 1, but is %d." % (cacheSize))
+        self._processSample = processSample
+        self.numberOfComponents = numberOfComponents
+        self.alphaLevels = list(alphaLevels)
+        self.cacheSize = cacheSize
+        # Each factory object set gets a new number, used as cache key
+        self._numberOfFactoryObjects = 0
+        self.setDistributionFactory(distributionFactory)
+
+        self._cache = OrderedDict()
+        self.numberOfCacheHits = 0
+        self.numberOfCacheMisses = 0
+
+    def setProcessSample(self, processSample):
+        """
+        Set the process sample and clear the cache.
+
+        Parameters
+        ----------
+        processSample : ot.ProcessSample
+            The collection of processes.
+        """
+        self._processSample = processSample
+        self.clearCache()
+
+    def getProcessSample(self):
+        """
+        Return the process sample.
+
+        Returns
+        -------
+        processSample : ot.ProcessSample
+            The collection of processes.
+        """
+        return self._processSample
+
+    def setNumberOfComponents(self, numberOfComponents):
+        """
+        Set the number of components of the K-L decomposition.
+
+        Parameters
+        ----------
+        numberOfComponents : int
+            The number of components.
+        """
+        self.numberOfComponents = numberOfComponents
+
+    def getNumberOfComponents(self):
+        """
+        Return the number of components of the K-L decomposition.
+
+        Returns
+        -------
+        numberOfComponents : int
+            The number of components.
+        """
+        return self.numberOfComponents
+
+    def setDistributionFactory(self, distributionFactory):
+        """
+        Set the factory which fits the reduced components.
+
+        Parameters
+        ----------
+        distributionFactory : str or factory
+            An object with a build(sample) method, or one of
+            "KernelSmoothing", "ReducedDistributionFactory" and
+            "CrossValidationKernelSmoothing". An object is a new cache
+            key each time it is set: set it again after changing its
+            parameters.
+        """
+        if isinstance(distributionFactory, str):
+            factories = {
+                "KernelSmoothing": ot.KernelSmoothing,
+                "ReducedDistributionFactory": ReducedDistributionFactory,
+                "CrossValidationKernelSmoothing": CrossValidationKernelSmoothing,
+            }
+            if distributionFactory not in factories:
+                raise ValueError(
+                    "Unknown distribution factory %s. Expect one of %s."
+                    % (distributionFactory, list(factories))
+                )
+            self._factoryKey = distributionFactory
+            self._factory = factories[distributionFactory]()
+        else:
+            self._numberOfFactoryObjects += 1
+            self._factoryKey = ("object", self._numberOfFactoryObjects)
+            self._factory = distributionFactory
+        self.distributionFactory = distributionFactory
+
+    def getDistributionFactory(self):
+        """
+        Return the factory which fits the reduced components.
+
+        Returns
+        -------
+        distributionFactory : str or factory
+            The factory.
+        """
+        return self.distributionFactory
+
+    def setAlphaLevels(self, alphaLevels):
+        """
+        Set the alpha levels.
+
+        Parameters
+        ----------
+        alphaLevels : list(float)
+            The list of alpha levels for minimum volume level set algorithm.
+        """
+        self.alphaLevels = list(alphaLevels)
+
+    def getAlphaLevels(self):
+        """
+        Return the alpha levels.
+
+        Returns
+        -------
+        alphaLevels : list(float)
+            The list of alpha levels.
+        """
+        return self.alphaLevels
+
+    def _memoize(self, key, compute):
+        """Return the cached output of a stage, or compute and cache it."""
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.numberOfCacheHits += 1
+            return self._cache[key]
+        self.numberOfCacheMisses += 1
+        value = compute()
+        self._cache[key] = value
+        if len(self._cache) > self.cacheSize:
+            self._cache.popitem(last=False)
+        return value
+
+    def _reductionKey(self):
+        """Return the cache key of the reduction stage."""
+        return ("reduction", self.numberOfComponents)
+
+    def _distributionKey(self):
+        """Return the cache key of the distribution stage."""
+        return ("distribution", self.numberOfComponents, self._factoryKey)
+
+    def _hdrKey(self):
+        """Return the cache key of the HDR stage."""
+        alphaLevels = tuple(sorted(self.alphaLevels, reverse=True))
+        return ("hdr", self.numberOfComponents, self._factoryKey, alphaLevels)
+
+    def _computeReduction(self):
+        """Run the K-L reduction."""
+        reduction = KarhunenLoeveDimensionReductionAlgorithm(
+            self._processSample, self.numberOfComponents
+        )
+        reduction.run()
+        return reduction
+
+    def getReduction(self):
+        """
+        Return the K-L reduction of the process sample.
+
+        Returns
+        -------
+        reduction : KarhunenLoeveDimensionReductionAlgorithm
+            The reduction, after run().
+        """
+        return self._memoize(self._reductionKey(), self._computeReduction)
+
+    def getReducedComponents(self):
+        """
+        Return the reduced components.
+
+        Returns
+        -------
+        reducedComponents : ot.Sample(n, d)
+            The n points in the d-dimensional reduced space.
+        """
+        return self.getReduction().getReducedComponents()
+
+    def getDistribution(self):
+        """
+        Return the distribution of the reduced components.
+
+        Returns
+        -------
+        distribution : ot.Distribution
+            The distribution fitted by the factory.
+        """
+        return self._memoize(
+            self._distributionKey(),
+            lambda: self._factory.build(self.getReducedComponents()),
+        )
+
+    def _computeHighDensityRegionAlgorithm(self):
+        """Run the HDR algorithm."""
+        algo = ProcessHighDensityRegionAlgorithm(
+            self._processSample,
+            self.getReducedComponents(),
+            self.getDistribution(),
+            list(self.alphaLevels),
+        )
+        algo.run()
+        return algo
+
+    def getProcessHighDensityRegionAlgorithm(self):
+        """
+        Return the HDR algorithm of the current parameters.
+
+        Returns
+        -------
+        algo : ProcessHighDensityRegionAlgorithm
+            The algorithm, after run().
+        """
+        return self._memoize(self._hdrKey(), self._computeHighDensityRegionAlgorithm)
+
+    def run(self):
+        """Run the stages which are not in the cache."""
+        self.getProcessHighDensityRegionAlgorithm()
+
+    def computeIndices(self, outlierFlag=True):
+        """
+        Get inlier or outlier indices.
+
+        Parameters
+        ----------
+        outlierFlag : bool
+            If False, compute indices of inlier trajectories.
+            If True, compute indices of outlier trajectories.
+
+        Returns
+        -------
+        indices : list(int)
+            The indices of selected trajectories in the process sample,
+            in a new list.
+        """
+        algo = self.getProcessHighDensityRegionAlgorithm()
+        return list(algo.computeIndices(outlierFlag))
+
+    def draw(self, **options):
+        """
+        Plot outlier trajectories, reusing all the stages.
+
+        Parameters
+        ----------
+        options : dict
+            The options of ProcessHighDensityRegionAlgorithm.draw().
+
+        Returns
+        -------
+        graph : ot.Graph
+            The plot of outlier trajectories.
+        """
+        return self.getProcessHighDensityRegionAlgorithm().draw(**options)
+
+    def clearCache(self):
+        """Remove all the stage outputs from the cache."""
+        self._cache.clear()
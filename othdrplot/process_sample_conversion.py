@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF.
+"""
+Conversions between process samples and arrays of trajectories.
+"""
+import numpy as np
+import openturns as ot
+
+
+def ConvertProcessSampleToArray(processSample, dtype=float):
+    """
+    Return the values of a process sample as an array of trajectories.
+
+    Parameters
+    ----------
+    processSample : ot.ProcessSample
+        A collection of n processes of dimension 1 on a mesh with m vertices.
+    dtype : numpy dtype
+        The type of the values, e.g. np.float32 to halve the memory.
+
+    Returns
+    -------
+    trajectories : np.array(n, m)
+        The values of the trajectories, one per row.
+    """
+    if processSample.getDimension() != 1:
+        raise ValueError(
+            "The dimension of the process sample must be equal to 1, but "
+            "current dimension is %d." % (processSample.getDimension())
+        )
+    size = processSample.getSize()
+    nbVertices = processSample.getMesh().getVerticesNumber()
+    trajectories = np.empty((size, nbVertices), dtype=dtype)
+    for i in range(size):
+        trajectories[i] = np.ravel(processSample.getField(i).getValues())
+    return trajectories
+
+
+def ConvertArrayToProcessSample(mesh, trajectories):
+    """
+    Return a process sample from an array of trajectories.
+
+    Parameters
+    ----------
+    mesh : ot.Mesh
+        The mesh with m vertices.
+    trajectories : np.array(n, m)
+        The values of the trajectories, one per row.
+
+    Returns
+    -------
+    processSample : ot.ProcessSample
+        The collection of n processes of dimension 1.
+    """
+    trajectories = np.asarray(trajectories, dtype=float)
+    if trajectories.ndim != 2:
+        raise ValueError(
+            "Expect a 2 dimension array, but dimension is %d" % (trajectories.ndim)
+        )
+    size, nbVertices = trajectories.shape
+    if nbVertices != mesh.getVerticesNumber():
+        raise ValueError(
+            "The number of values per trajectory is %d but "
+            "the number of vertices of the mesh is %d."
+            % (nbVertices, mesh.getVerticesNumber())
+        )
+    processSample = ot.ProcessSample(mesh, size, 1)
+    for i in range(size):
+        processSample.setField(ot.Field(mesh, ot.Sample(trajectories[i][:, None])), i)
+    return processSample
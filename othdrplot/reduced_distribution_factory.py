@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Component to create ReducedDistributionFactory.
+"""
+import numpy as np
+import openturns as ot
+
+
+def _logSumExp(a, axis):
+    """Return log(sum(exp(a))) along an axis, without overflow."""
+    a_max = np.max(a, axis=axis, keepdims=True)
+    return np.squeeze(a_max, axis=axis) + np.log(
+        np.sum(np.exp(a - a_max), axis=axis)
+    )
+
+
+def _computeNormalLogPDF(x, mean, covariance):
+    """Return the log-PDF of a multivariate normal at each row of x."""
+    dim = x.shape[1]
+    cholesky = np.linalg.cholesky(covariance)
+    z = np.linalg.solve(cholesky, (x - mean).T)
+    log_determinant = 2.0 * np.sum(np.log(np.diag(cholesky)))
+    return -0.5 * (np.sum(z ** 2, axis=0) + dim * np.log(2.0 * np.pi) + log_determinant)
+
+
+class ReducedDistributionFactory:
+    """Fit a distribution in the reduced space."""
+
+    def __init__(
+        self,
+        numberOfMixtureComponents=5,
+        validationFraction=0.2,
+        likelihoodTolerance=0.05,
+        candidates=["Mixture", "Normal", "KernelSmoothing"],
+    ):
+        """
+        Select and fit a distribution for a low dimension sample.
+
+        The candidates are a Gaussian mixture fitted by the EM algorithm,
+        a multivariate normal distribution and a kernel smoothing. Each
+        candidate is fitted on a training subsample and scored by its
+        mean log-PDF on the remaining validation points. The cost of the
+        evaluation of the PDF is proportional to the number of Gaussian
+        terms: the number of mixture components, 1 for the normal
+        distribution and the training size for the kernel smoothing.
+        Among the candidates with a score within likelihoodTolerance of
+        the best score, the cheapest is selected and fitted on the whole
+        sample.
+
+        Parameters
+        ----------
+        numberOfMixtureComponents : int
+            The number of components of the Gaussian mixture.
+        validationFraction : float
+            The fraction of the sample used for validation, in (0, 1).
+        likelihoodTolerance : float
+            The tolerance on the mean log-PDF of the validation points.
+        candidates : list(str)
+            The names of the candidates, among "Mixture", "Normal" and
+            "KernelSmoothing".
+        """
+        if numberOfMixtureComponents < 1:
+            raise ValueError(
+                "The number of mixture components must be at least 1, but is %d."
+                % (numberOfMixtureComponents)
+            )
+        if validationFraction <= 0.0 or validationFraction >= 1.0:
+            raise ValueError(
+                "The validation fraction must be in (0, 1), but is %s."
+                % (validationFraction)
+            )
+        for name in candidates:
+            if name not in ["Mixture", "Normal", "KernelSmoothing"]:
+                raise ValueError("Unknown candidate %s." % (name))
+        self.numberOfMixtureComponents = numberOfMixtureComponents
+        self.validationFraction = validationFraction
+        self.likelihoodTolerance = likelihoodTolerance
+        self.candidates = candidates
+
+        # Parameters of the EM algorithm
+        self.maximumIterations = 200
+        self.relativeTolerance = 1.0e-8
+        self.covarianceRegularization = 1.0e-6
+
+        # Computed by build()
+        self.selectedModel = None
+        self.validationScores = {}
+        self.evaluationCosts = {}
+
+    def buildMixture(self, sample):
+        """
+        Fit a Gaussian mixture by the EM algorithm.
+
+        The initial means are points of the sample selected at random
+        with the OpenTURNS random generator.
+
+        Parameters
+        ----------
+        sample : ot.Sample
+            The sample.
+
+        Returns
+        -------
+        distribution : ot.Mixture
+            The mixture of multivariate normal distributions.
+        """
+        x = np.array(sample)
+        size, dim = x.shape
+        n_components = min(self.numberOfMixtureComponents, size)
+        regularization = self.covarianceRegularization * np.diag(
+            np.var(x, axis=0) + 1.0
+        )
+
+        # Initialization
+        start = np.array(
+            ot.KPermutationsDistribution(n_components, size).getRealization(),
+            dtype=int,
+        )
+        means = x[start]
+        covariances = np.array(
+            [np.atleast_2d(np.cov(x, rowvar=False)) + regularization] * n_components
+        )
+        weights = np.full(n_components, 1.0 / n_components)
+
+        previous_loglikelihood = -np.inf
+        for _ in range(self.maximumIterations):
+            # E step
+            log_density = np.column_stack(
+                [
+                    np.log(weights[k]) + _computeNormalLogPDF(x, means[k], covariances[k])
+                    for k in range(n_components)
+                ]
+            )
+            log_norm = _logSumExp(log_density, axis=1)
+            responsibilities = np.exp(log_density - log_norm[:, None])
+            loglikelihood = np.mean(log_norm)
+
+            # M step
+            counts = np.sum(responsibilities, axis=0) + 10.0 * np.finfo(float).eps
+            weights = counts / size
+            means = responsibilities.T.dot(x) / counts[:, None]
+            for k in range(n_components):
+                centered = x - means[k]
+                covariances[k] = (
+                    (responsibilities[:, k, None] * centered).T.dot(centered) / counts[k]
+                    + regularization
+                )
+            if abs(loglikelihood - previous_loglikelihood) <= self.relativeTolerance * abs(
+                loglikelihood
+            ):
+                break
+            previous_loglikelihood = loglikelihood
+
+        atoms = [
+            ot.Normal(ot.Point(means[k]), ot.CovarianceMatrix(covariances[k]))
+            for k in range(n_components)
+        ]
+        distribution = ot.Mixture(atoms, weights)
+        distribution.setDescription(sample.getDescription())
+        return distribution
+
+    def _buildCandidate(self, name, sample):
+        """Fit one of the candidates."""
+        if name == "Mixture":
+            return self.buildMixture(sample)
+        if name == "Normal":
+            return ot.NormalFactory().build(sample)
+        return ot.KernelSmoothing().build(sample)
+
+    def _computeEvaluationCost(self, name, sample_size):
+        """Return the number of Gaussian terms of the PDF of a candidate."""
+        if name == "Mixture":
+            return min(self.numberOfMixtureComponents, sample_size)
+        if name == "Normal":
+            return 1
+        return sample_size
+
+    def build(self, sample):
+        """
+        Select a distribution and fit it on the sample.
+
+        Parameters
+        ----------
+        sample : ot.Sample
+            The sample, e.g. the reduced components.
+
+        Returns
+        -------
+        distribution : ot.Distribution
+            The selected distribution, fitted on the whole sample.
+        """
+        size = sample.getSize()
+        validation_size = int(round(self.validationFraction * size))
+        if validation_size < 1 or validation_size >= size - 1:
+            raise ValueError(
+                "The sample of size %d is too small for a validation fraction %s."
+                % (size, self.validationFraction)
+            )
+        permutation = ot.KPermutationsDistribution(size, size).getRealization()
+        permutation = [int(i) for i in permutation]
+        validation_sample = sample[permutation[:validation_size]]
+        training_sample = sample[permutation[validation_size:]]
+
+        self.validationScores = {}
+        self.evaluationCosts = {}
+        for name in self.candidates:
+            distribution = self._buildCandidate(name, training_sample)
+            log_pdf = np.ravel(distribution.computeLogPDF(validation_sample))
+            self.validationScores[name] = float(np.mean(log_pdf))
+            self.evaluationCosts[name] = self._computeEvaluationCost(
+                name, training_sample.getSize()
+            )
+
+        # The cheapest candidate among the best ones
+        best_score = max(self.validationScores.values())
+        admissible = [
+            name
+            for name in self.candidates
+            if self.validationScores[name] >= best_score - self.likelihoodTolerance
+        ]
+        self.selectedModel = min(admissible, key=lambda name: self.evaluationCosts[name])
+        return self._buildCandidate(self.selectedModel, sample)
+
+    def getSelectedModel(self):
+        """
+        Return the name of the distribution selected by the last build().
+
+        Returns
+        -------
+        selectedModel : str
+            "Mixture", "Normal" or "KernelSmoothing".
+        """
+        return self.selectedModel
+
+    def getValidationScores(self):
+        """
+        Return the mean validation log-PDF of each candidate.
+
+        Returns
+        -------
+        validationScores : dict(str, float)
+            The score of each candidate in the last build().
+        """
+        return self.validationScores
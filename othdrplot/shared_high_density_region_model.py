@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Component to create SharedHighDensityRegionModel.
+"""
+import mmap
+import os
+import sys
+from multiprocessing import shared_memory
+import numpy as np
+from .gaussian_kernel_density import GetGaussianKernelParameters, ComputeGaussianKernelPDF
+
+# Before Python 3.13, SharedMemory registers every block it attaches in the
+# resource tracker, which is shared by the processes of a pool
+_ATTACH_UNTRACKED = sys.version_info < (3, 13) and os.name == "posix"
+if _ATTACH_UNTRACKED:
+    import _posixshmem
+
+
+class _UntrackedSharedMemory(shared_memory.SharedMemory):
+    """
+    A POSIX shared memory block attached without the resource tracker.
+
+    The block is opened and mapped as SharedMemory(name) does, but it is
+    not registered: the registration of the exporting process is the only
+    one, so the tracker never sees a block unregistered twice.
+    """
+
+    def __init__(self, name):
+        self._name = "/" + name
+        self._fd = _posixshmem.shm_open(self._name, os.O_RDWR, mode=0o600)
+        self._size = os.fstat(self._fd).st_size
+        self._mmap = mmap.mmap(self._fd, self._size)
+        self._buf = memoryview(self._mmap)
+
+
+class SharedHighDensityRegionModel:
+    """A fitted HDR model stored in shared memory."""
+
+    def __init__(self, sharedMemory, descriptor, isOwner):
+        """
+        Fitted HDR model in a shared memory block.
+
+        Use Export() to copy a fitted model into a new block, and Attach()
+        to map it in another process from its descriptor. All the arrays
+        are read-only views of the block: the workers of a pool use a
+        single copy of the model instead of a pickled copy each.
+
+        Parameters
+        ----------
+        sharedMemory : multiprocessing.shared_memory.SharedMemory
+            The block.
+        descriptor : dict
+            The name of the block, the offset, shape and type of each
+            array and the alpha levels.
+        isOwner : bool
+            If True, the block was created by this object.
+        """
+        self.sharedMemory = sharedMemory
+        self.descriptor = descriptor
+        self.isOwner = isOwner
+        self.alphaLevels = list(descriptor["alphaLevels"])
+        self.outlierAlpha = float(np.max(self.alphaLevels))
+        self.arrays = {}
+        for key, (offset, shape, dtype) in descriptor["arrays"].items():
+            array = np.ndarray(shape, dtype=dtype, buffer=sharedMemory.buf, offset=offset)
+            array.flags.writeable = False
+            self.arrays[key] = array
+
+    @staticmethod
+    def Export(algorithm, karhunenLoeveResult=None):
+        """
+        Copy a fitted HDR model into a new shared memory block.
+
+        The model is made of the kernel centers, the bandwidth and the
+        weights of the distribution, the thresholds of the alpha levels
+        and, for a process model, the projection matrix of the K-L
+        decomposition. The block must be released with unlink() when the
+        model is not used anymore. It is registered in the resource tracker
+        of the exporting process only, which releases it if this process
+        exits before unlink().
+
+        Parameters
+        ----------
+        algorithm : HighDensityRegionAlgorithm
+            The algorithm, after run(). Its distribution must be a Gaussian
+            kernel density with independent components, e.g. built by
+            ot.KernelSmoothing. Other distributions, such as the Gaussian
+            mixtures with full covariances of ReducedDistributionFactory,
+            cannot be exported.
+        karhunenLoeveResult : ot.KarhunenLoeveResult
+            The K-L decomposition which gives the reduced components of the
+            trajectories. If None, the model scores points of the reduced
+            space only.
+
+        Returns
+        -------
+        model : SharedHighDensityRegionModel
+            The model, owner of the block.
+        """
+        if algorithm.pvalues is None:
+            raise ValueError("The run() method must be called before Export().")
+        parameters = GetGaussianKernelParameters(algorithm.distribution)
+        if parameters is None:
+            raise ValueError(
+                "The distribution %s is not a Gaussian kernel density with "
+                "independent components: only such densities, e.g. built by "
+                "ot.KernelSmoothing, can be exported."
+                % (algorithm.distribution.getImplementation().getClassName())
+            )
+        centers, bandwidth, weights = parameters
+        # The outlier threshold is the one which classifies the sample
+        pvalues = np.array(algorithm.pvalues, dtype=float)
+        pvalues[np.array(algorithm.alphaLevels) == algorithm.outlierAlpha] = (
+            algorithm.outlierPvalue
+        )
+        arrays = {
+            "centers": np.ascontiguousarray(centers, dtype=float),
+            "bandwidth": np.ascontiguousarray(bandwidth, dtype=float),
+            "weights": np.ascontiguousarray(weights, dtype=float),
+            "pvalues": pvalues,
+        }
+        if karhunenLoeveResult is not None:
+            projection = np.array(karhunenLoeveResult.getProjectionMatrix())
+            if projection.shape[0] != centers.shape[1]:
+                raise ValueError(
+                    "The number of K-L components is %d but "
+                    "the dimension of the distribution is %d."
+                    % (projection.shape[0], centers.shape[1])
+                )
+            arrays["projection"] = np.ascontiguousarray(projection)
+
+        # Pack the arrays, aligned on 64 bytes
+        layout = {}
+        size = 0
+        for key, array in arrays.items():
+            layout[key] = (size, array.shape, array.dtype.str)
+            size += -(-array.nbytes // 64) * 64
+        sharedMemory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for key, array in arrays.items():
+            offset, shape, dtype = layout[key]
+            target = np.ndarray(shape, dtype=dtype, buffer=sharedMemory.buf, offset=offset)
+            target[...] = array
+        descriptor = {
+            "name": sharedMemory.name,
+            "arrays": layout,
+            "alphaLevels": [float(alpha) for alpha in algorithm.alphaLevels],
+        }
+        return SharedHighDensityRegionModel(sharedMemory, descriptor, True)
+
+    @staticmethod
+    def Attach(descriptor):
+        """
+        Map a model exported by another process.
+
+        The block is not registered in the resource tracker: it belongs to
+        the exporting process, which releases it.
+
+        Parameters
+        ----------
+        descriptor : dict
+            The descriptor of the model, see getDescriptor().
+
+        Returns
+        -------
+        model : SharedHighDensityRegionModel
+            The read-only model.
+        """
+        if sys.version_info >= (3, 13):
+            sharedMemory = shared_memory.SharedMemory(name=descriptor["name"], track=False)
+        elif _ATTACH_UNTRACKED:
+            sharedMemory = _UntrackedSharedMemory(descriptor["name"])
+        else:
+            sharedMemory = shared_memory.SharedMemory(name=descriptor["name"])
+        return SharedHighDensityRegionModel(sharedMemory, descriptor, False)
+
+    def getDescriptor(self):
+        """
+        Return the descriptor to send to the workers.
+
+        Returns
+        -------
+        descriptor : dict
+            A small picklable dictionary, see Attach().
+        """
+        return self.descriptor
+
+    def getThresholds(self):
+        """
+        Return the thresholds of the alpha levels.
+
+        Returns
+        -------
+        pvalues : np.array(k)
+            The threshold of each alpha level.
+        """
+        return self.arrays["pvalues"]
+
+    def computeReducedComponents(self, trajectories):
+        """
+        Return the reduced components of trajectories.
+
+        Parameters
+        ----------
+        trajectories : np.array(n, m)
+            The values of the trajectories on the vertices of the mesh of
+            the K-L decomposition, one per row.
+
+        Returns
+        -------
+        reducedComponents : np.array(n, d)
+            The projection of the trajectories on the K-L modes.
+        """
+        if "projection" not in self.arrays:
+            raise ValueError("The model has no K-L decomposition.")
+        return np.asarray(trajectories, dtype=float).dot(self.arrays["projection"].T)
+
+    def computePDF(self, points):
+        """
+        Return the PDF of points of the reduced space.
+
+        Parameters
+        ----------
+        points : np.array(n, d)
+            The points.
+
+        Returns
+        -------
+        pdf : np.array(n)
+            The density at each point.
+        """
+        return ComputeGaussianKernelPDF(
+            points,
+            self.arrays["centers"],
+            self.arrays["bandwidth"],
+            self.arrays["weights"],
+        )
+
+    def computeLevelMembership(self, points):
+        """
+        Return the innermost high density region which contains each point.
+
+        Parameters
+        ----------
+        points : np.array(n, d)
+            The points of the reduced space.
+
+        Returns
+        -------
+        labels : np.array(n, int)
+            For each point, the index in alphaLevels of the smallest region
+            which contains it, or -1 if it is in none of them.
+        """
+        pvalues = self.arrays["pvalues"]
+        order = np.argsort(pvalues, kind="stable")
+        count = np.searchsorted(pvalues[order], self.computePDF(points), side="right")
+        labels = np.full(count.size, -1, dtype=int)
+        inside = count > 0
+        labels[inside] = order[count[inside] - 1]
+        return labels
+
+    def computeOutlierFlags(self, points):
+        """
+        Return True for the outliers.
+
+        Parameters
+        ----------
+        points : np.array(n, d)
+            The points of the reduced space.
+
+        Returns
+        -------
+        flag : np.array(n, bool)
+            True if the point is not in the region of the outlier alpha level.
+        """
+        outlierPvalue = self.arrays["pvalues"][self.alphaLevels.index(self.outlierAlpha)]
+        return self.computePDF(points) < outlierPvalue
+
+    def close(self):
+        """Unmap the block from this process."""
+        self.arrays = {}
+        self.sharedMemory.close()
+
+    def unlink(self):
+        """Unmap and release the block. Only the exporting process may call it."""
+        if not self.isOwner:
+            raise ValueError("Only the exporting process may release the block.")
+        self.close()
+        self.sharedMemory.unlink()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Envelope preserving decimation of trajectories for drawing.
+"""
+import numpy as np
+
+
+def DecimateTrajectories(vertices, trajectories, numberOfBuckets):
+    """
+    Reduce the number of values of trajectories, keeping their extrema.
+
+    The vertices are split into buckets of consecutive vertices, e.g. one
+    per pixel of the plot. In each bucket, each trajectory is replaced by
+    its minimum and its maximum, in their order of occurrence, placed at
+    the first and the last vertex of the bucket. Hence, the drawn curves
+    have the same envelope as the original ones in each bucket. All the
+    trajectories share the decimated vertices, so that they can still be
+    stored in a process sample.
+
+    Parameters
+    ----------
+    vertices : np.array(m)
+        The increasing vertices of the mesh.
+    trajectories : np.array(n, m)
+        The values of the trajectories, one per row.
+    numberOfBuckets : int
+        The maximum number of buckets. The buckets have the same number of
+        vertices, except the last one. If the number of vertices is not
+        greater than twice the number of buckets, the trajectories are
+        returned unchanged.
+
+    Returns
+    -------
+    decimatedVertices : np.array(p)
+        The decimated vertices, with p <= 2 * numberOfBuckets.
+    decimatedTrajectories : np.array(n, p)
+        The decimated trajectories.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    trajectories = np.asarray(trajectories)
+    if numberOfBuckets < 1:
+        raise ValueError(
+            "The number of buckets must be at least 1, but is %d." % (numberOfBuckets)
+        )
+    if trajectories.ndim != 2 or trajectories.shape[1] != vertices.size:
+        raise ValueError(
+            "The trajectories must have shape (n, %d), but have shape %s."
+            % (vertices.size, trajectories.shape)
+        )
+    numberOfVertices = vertices.size
+    if numberOfVertices <= 2 * numberOfBuckets:
+        return vertices, trajectories
+    # Buckets of equal size, the last one padded with the last vertex
+    bucketSize = -(-numberOfVertices // numberOfBuckets)
+    numberOfBuckets = -(-numberOfVertices // bucketSize)
+    padding = numberOfBuckets * bucketSize - numberOfVertices
+    padded = np.pad(trajectories, ((0, 0), (0, padding)), mode="edge")
+    buckets = padded.reshape(trajectories.shape[0], numberOfBuckets, bucketSize)
+    argmin = np.argmin(buckets, axis=2)
+    argmax = np.argmax(buckets, axis=2)
+    minimum = np.take_along_axis(buckets, argmin[:, :, None], axis=2)[:, :, 0]
+    maximum = np.take_along_axis(buckets, argmax[:, :, None], axis=2)[:, :, 0]
+    minimumFirst = argmin <= argmax
+    decimated = np.empty((trajectories.shape[0], numberOfBuckets, 2), trajectories.dtype)
+    decimated[:, :, 0] = np.where(minimumFirst, minimum, maximum)
+    decimated[:, :, 1] = np.where(minimumFirst, maximum, minimum)
+    first = np.arange(numberOfBuckets) * bucketSize
+    last = np.minimum(first + bucketSize, numberOfVertices) - 1
+    decimatedVertices = np.column_stack((vertices[first], vertices[last]))
+    return (
+        np.ravel(decimatedVertices),
+        decimated.reshape(trajectories.shape[0], 2 * numberOfBuckets),
+    )
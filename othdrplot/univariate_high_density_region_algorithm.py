@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 - EDF-CERFACS.
+"""
+Component to create UnivariateHighDensityRegionAlgorithm.
+"""
+import numpy as np
+import openturns as ot
+from .high_density_region_algorithm import HighDensityRegionAlgorithm
+
+
+class UnivariateHighDensityRegionAlgorithm(HighDensityRegionAlgorithm):
+    """Compute the Highest Density Region of a univariate sample."""
+
+    def __init__(self, sample, distribution, alphaLevels=[0.9, 0.5, 0.1]):
+        """
+        Compute a univariate High Density Region as a union of intervals.
+
+        The PDF is evaluated once on a regular grid. The bounds of the
+        intervals are the roots of the PDF minus the threshold, computed
+        by bisection from the sign changes on the grid. The first guess
+        of the threshold of each alpha level is the PDF value such that
+        the grid points with higher PDF hold the fraction alpha of the
+        mass. It is then refined by secant steps so that the CDF
+        increments over the intervals sum to alpha.
+
+        Parameters
+        ----------
+        sample : ot.Sample
+            A dimension 1 sample.
+        distribution : ot.Distribution
+            A dimension 1 distribution which fits the sample.
+        alphaLevels : list(float)
+            The list of alpha levels of the high density regions.
+        """
+        if sample.getDimension() != 1:
+            raise ValueError(
+                "Expect a 1 dimension sample, but dimension is %d"
+                % (sample.getDimension())
+            )
+        super(UnivariateHighDensityRegionAlgorithm, self).__init__(
+            sample, distribution, alphaLevels
+        )
+        # Number of points of the grid used to compute the thresholds
+        self.numberOfGridPoints = 2048
+        # The tails of this probability are not in the grid
+        self.tailProbability = 1.0e-6
+        # Maximum number of bisection steps for each bound
+        self.maximumBisectionIterations = 60
+        # Maximum number of secant steps for each threshold
+        self.maximumSecantIterations = 20
+        # Absolute tolerance on the mass of the regions
+        self.massTolerance = 1.0e-10
+
+        # Computed by the algorithm
+        self.intervals = []
+        self.outlier_intervals = None
+
+    def _computeGrid(self):
+        """Return the regular grid which covers the sample and the bulk of the distribution."""
+        data = np.ravel(self._getPoints())
+        lower = min(
+            np.min(data), self.distribution.computeQuantile(self.tailProbability)[0]
+        )
+        upper = max(
+            np.max(data),
+            self.distribution.computeQuantile(1.0 - self.tailProbability)[0],
+        )
+        return np.linspace(lower, upper, self.numberOfGridPoints)
+
+    def _computePDF(self, x):
+        """Return the PDF at the points of an array."""
+        return np.ravel(self.distribution.computePDF(np.reshape(x, (-1, 1))))
+
+    def _computeThreshold(self, grid_pdf, step, alpha):
+        """Return the PDF threshold of the region of mass alpha on the grid."""
+        # Trapezoidal weights
+        mass = grid_pdf * step
+        mass[0] *= 0.5
+        mass[-1] *= 0.5
+        order = np.argsort(-grid_pdf, kind="stable")
+        cumulated = np.cumsum(mass[order])
+        cumulated /= cumulated[-1]
+        k = int(np.searchsorted(cumulated, alpha))
+        k = min(k, order.size - 1)
+        if k == 0:
+            return grid_pdf[order[0]]
+        # Linear interpolation between the two consecutive levels
+        f_previous = grid_pdf[order[k - 1]]
+        f_current = grid_pdf[order[k]]
+        c_previous = cumulated[k - 1]
+        c_current = cumulated[k]
+        if c_current == c_previous:
+            return f_current
+        return f_previous + (alpha - c_previous) / (c_current - c_previous) * (
+            f_current - f_previous
+        )
+
+    def _computeIntervals(self, grid, grid_pdf, threshold):
+        """Return the intervals where the PDF is greater than the threshold."""
+        inside = grid_pdf >= threshold
+        changes = np.where(inside[1:] != inside[:-1])[0]
+        # Bisection on all the sign changes simultaneously
+        a = grid[changes]
+        b = grid[changes + 1]
+        a_inside = inside[changes]
+        for _ in range(self.maximumBisectionIterations):
+            if changes.size == 0:
+                break
+            middle = 0.5 * (a + b)
+            middle_inside = self._computePDF(middle) >= threshold
+            same_side = middle_inside == a_inside
+            a = np.where(same_side, middle, a)
+            b = np.where(same_side, b, middle)
+            if np.max(b - a) <= 4.0 * np.finfo(float).eps * np.max(np.abs(grid)):
+                break
+        roots = 0.5 * (a + b)
+        bounds = roots
+        if inside[0]:
+            bounds = np.concatenate(([grid[0]], bounds))
+        if inside[-1]:
+            bounds = np.concatenate((bounds, [grid[-1]]))
+        return np.reshape(bounds, (-1, 2))
+
+    def _computeMass(self, intervals):
+        """Return the probability of a union of intervals."""
+        if intervals.shape[0] == 0:
+            return 0.0
+        cdf = np.ravel(self.distribution.computeCDF(np.reshape(intervals, (-1, 1))))
+        return float(np.sum(cdf[1::2] - cdf[0::2]))
+
+    def _refineThreshold(self, grid, grid_pdf, alpha, threshold):
+        """Return the threshold and the intervals of the region of mass alpha."""
+        intervals = self._computeIntervals(grid, grid_pdf, threshold)
+        error = self._computeMass(intervals) - alpha
+        previous_threshold = threshold * (1.0 + 1.0e-3)
+        previous_error = None
+        for _ in range(self.maximumSecantIterations):
+            if abs(error) <= self.massTolerance:
+                break
+            if previous_error is None:
+                previous_intervals = self._computeIntervals(
+                    grid, grid_pdf, previous_threshold
+                )
+                previous_error = self._computeMass(previous_intervals) - alpha
+            if error == previous_error:
+                break
+            new_threshold = threshold - error * (threshold - previous_threshold) / (
+                error - previous_error
+            )
+            # Stay within the range of the PDF
+            new_threshold = min(max(new_threshold, 0.0), np.max(grid_pdf))
+            previous_threshold, previous_error = threshold, error
+            threshold = new_threshold
+            intervals = self._computeIntervals(grid, grid_pdf, threshold)
+            error = self._computeMass(intervals) - alpha
+        return threshold, intervals
+
+    def run(self):
+        """Compute the thresholds, the intervals and the inliers."""
+        self._applyPendingDistribution()
+        self.computeRegions()
+
+        # Compute the mode
+        self.sample_pdf = self._computeSamplePDF(self._getPoints())
+        self.idx_mode = int(np.argmax(self.sample_pdf))
+        self.local_mode_indices = None
+
+        # Compute inliers and outliers indices
+        flag = self.computeIntervalMembership(
+            np.ravel(self._getPoints()), self.outlier_intervals
+        )
+        self.outlier_indices = self._convertIndices(np.where(~flag)[0])
+        self.inlier_indices = self._convertIndices(np.where(flag)[0])
+        self.numberOfPointsSinceRefresh = 0
+
+    def computeRegions(self):
+        """
+        Compute the thresholds and the intervals only.
+
+        The PDF is only evaluated on the grid, not on the sample, so that
+        the number of PDF evaluations does not depend on the sample size. The points can then
+        be classified with computeIntervalMembership(). run() calls this
+        method.
+        """
+        grid = self._computeGrid()
+        grid_pdf = self._computePDF(grid)
+        step = grid[1] - grid[0]
+
+        n_contour_lines = len(self.alphaLevels)
+        self.pvalues = np.zeros(n_contour_lines)
+        self.intervals = []
+        self.levelsets = []
+        self._contour_grids = {}
+        for i in range(n_contour_lines):
+            threshold = self._computeThreshold(grid_pdf, step, self.alphaLevels[i])
+            threshold, intervals = self._refineThreshold(
+                grid, grid_pdf, self.alphaLevels[i], threshold
+            )
+            self.pvalues[i] = threshold
+            self.intervals.append(intervals)
+
+        # The outlier level is the maximum alpha level
+        k = int(np.argmax(self.alphaLevels))
+        self.outlierPvalue = self.pvalues[k]
+        self.outlier_intervals = self.intervals[k]
+
+    @staticmethod
+    def computeIntervalMembership(x, intervals):
+        """
+        Return True for the points which are in a union of intervals.
+
+        Parameters
+        ----------
+        x : np.array(n)
+            The points.
+        intervals : np.array(k, 2)
+            The lower and upper bounds of disjoint sorted intervals.
+
+        Returns
+        -------
+        flag : np.array(n, bool)
+            True if the point is in one of the intervals.
+        """
+        bounds = np.ravel(intervals)
+        position = np.searchsorted(bounds, x, side="right")
+        # Inside if after a lower bound, or exactly on an upper bound
+        flag = position % 2 == 1
+        on_upper = (position > 0) & (position % 2 == 0)
+        on_upper[on_upper] = bounds[position[on_upper] - 1] == x[on_upper]
+        return flag | on_upper
+
+    def getIntervals(self, alpha=None):
+        """
+        Return the high density region of an alpha level.
+
+        Parameters
+        ----------
+        alpha : float
+            One of the alpha levels. If None, the outlier alpha level.
+
+        Returns
+        -------
+        intervals : np.array(k, 2)
+            The lower and upper bounds of the disjoint intervals, sorted.
+        """
+        if alpha is None:
+            return self.outlier_intervals
+        index = [i for i in range(len(self.alphaLevels)) if self.alphaLevels[i] == alpha]
+        if len(index) == 0:
+            raise ValueError("The alpha level %s is not in %s" % (alpha, self.alphaLevels))
+        return self.intervals[index[0]]
+
+    def draw(self, drawInliers=False, drawOutliers=True):
+        """
+        Draw the PDF, the high density regions and the sample.
+
+        Parameters
+        ----------
+        drawInliers : bool
+            If True, draw inliers points.
+        drawOutliers : bool
+            If True, draw outliers points.
+
+        Returns
+        -------
+        graph : ot.Graph
+            The PDF, the intervals at the height of their threshold
+            and the sample on the X axis.
+        """
+        graph = self.distribution.drawPDF()
+        for i in range(len(self.alphaLevels)):
+            legend = "%.0f %%" % (self.alphaLevels[i] * 100)
+            for lower, upper in self.intervals[i]:
+                curve = ot.Curve(
+                    [[lower], [upper]], [[self.pvalues[i]], [self.pvalues[i]]], legend
+                )
+                curve.setColor(self.contour_color)
+                graph.add(curve)
+                legend = ""
+        data = np.ravel(self._getPoints())
+        if drawInliers and len(self.inlier_indices) > 0:
+            x = data[self.inlier_indices]
+            cloud = ot.Cloud(x[:, None], np.zeros((x.size, 1)))
+            cloud.setColor(self.inlier_color)
+            cloud.setPointStyle(self.data_marker)
+            graph.add(cloud)
+        if drawOutliers and len(self.outlier_indices) > 0:
+            x = data[self.outlier_indices]
+            cloud = ot.Cloud(x[:, None], np.zeros((x.size, 1)))
+            cloud.setColor(self.outlier_color)
+            cloud.setPointStyle(self.data_marker)
+            graph.add(cloud)
+        return graph
@@ -42,6 +42,9 @@ setup(
     ],
     include_package_data=True,
     package_data={"othdrplot": ["othdrplot/data/*.csv"]},
+    entry_points={
+        "console_scripts": ["othdrplot=othdrplot.command_line_interface:main"]
+    },
     license="LGPL",
     url="https://github.com/mbaudin47/othdrplot",
     author="Michaël Baudin and Pamphile Roy",
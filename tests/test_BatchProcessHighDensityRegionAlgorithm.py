@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for BatchProcessHighDensityRegionAlgorithm class.
+"""
+import unittest
+import numpy as np
+from numpy.testing import assert_equal, assert_allclose
+import openturns as ot
+import othdrplot as othdr
+
+
+class CheckBatchProcessHDR(unittest.TestCase):
+    def test_Batch(self):
+        ot.RandomGenerator.SetSeed(0)
+        mesh = ot.IntervalMesher([50]).build(ot.Interval(0.0, 2.0))
+        covarianceModel = ot.SquaredExponential([1.5], [0.7])
+        process = ot.GaussianProcess(covarianceModel, mesh)
+        numberOfModels = 4
+        trajectories = np.stack(
+            [
+                othdr.ConvertProcessSampleToArray(process.getSample(40))
+                for _ in range(numberOfModels)
+            ]
+        )
+        vertexWeights = np.array(mesh.computeWeights())
+        batch = othdr.BatchProcessHighDensityRegionAlgorithm(
+            trajectories, 2, [0.5, 0.9], vertexWeights, sampleSize=20000, seed=0
+        )
+        batch.run()
+        assert_equal(batch.getReducedComponents().shape, (numberOfModels, 40, 2))
+        results = batch.getResults()
+        assert_equal(len(results), numberOfModels)
+
+        for i in range(numberOfModels):
+            # Orthonormal modes
+            modes = batch.getModes()[i]
+            assert_allclose((modes * vertexWeights).dot(modes.T), np.eye(2), atol=1.0e-10)
+            # Same kernel smoothing as OpenTURNS
+            reducedComponents = ot.Sample(batch.getReducedComponents()[i])
+            ks = ot.KernelSmoothing()
+            assert_allclose(
+                batch.getBandwidths()[i], ks.computeSilvermanBandwidth(reducedComponents)
+            )
+            distribution = ks.build(reducedComponents)
+            pdf = np.ravel(distribution.computePDF(reducedComponents))
+            assert_allclose(batch.sample_pdf[i], pdf)
+            # Thresholds and outliers
+            thresholds = othdr.MonteCarloThresholdAlgorithm(200000, seed=0)
+            pvalues = thresholds.computeThresholds(distribution, [0.9, 0.5])
+            assert_allclose(results[i]["pvalues"], pvalues, rtol=5.0e-2)
+            outlierIndices = np.where(pdf < results[i]["outlierPvalue"])[0]
+            assert_equal(results[i]["outlierIndices"], outlierIndices)
+            assert_equal(results[i]["idx_mode"], int(np.argmax(pdf)))
+
+        self.assertRaises(
+            ValueError,
+            othdr.BatchProcessHighDensityRegionAlgorithm,
+            trajectories[0],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
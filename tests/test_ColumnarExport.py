@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for the columnar export of the HDR results.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from numpy.testing import assert_equal
+import openturns as ot
+import othdrplot as othdr
+
+try:
+    import pyarrow.parquet
+
+    haveArrow = True
+except ImportError:
+    haveArrow = False
+
+
+def runProcessHDR():
+    """Return the functional HDR of the El Nino data."""
+    ot.RandomGenerator.SetSeed(0)
+    fname = os.path.join(othdr.__path__[0], "..", "tests", "data", "npfda-elnino.dat")
+    data = np.loadtxt(fname)
+    mesh = ot.IntervalMesher([data.shape[1] - 1]).build(ot.Interval(0.0, 1.0))
+    processSample = othdr.ConvertArrayToProcessSample(mesh, data)
+    reduction = othdr.KarhunenLoeveDimensionReductionAlgorithm(processSample, 2)
+    reduction.run()
+    reducedComponents = reduction.getReducedComponents()
+    distribution = ot.KernelSmoothing().build(reducedComponents)
+    hdr = othdr.ProcessHighDensityRegionAlgorithm(
+        processSample, reducedComponents, distribution, [0.8, 0.5]
+    )
+    hdr.setThresholdAlgorithm(othdr.MonteCarloThresholdAlgorithm(10000, seed=0))
+    hdr.run()
+    return hdr, data
+
+
+class CheckColumnarExport(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_NPZ(self):
+        hdr, data = runProcessHDR()
+        filename = os.path.join(self.directory, "results.npz")
+        othdr.ExportToNPZ(hdr, filename)
+        results = np.load(filename)
+        assert_equal(results["pdf"], hdr.sample_pdf)
+        assert_equal(results["label"], hdr.computeLevelMembership())
+        assert_equal(np.where(results["outlier"])[0], hdr.computeIndices())
+        assert_equal(results["score"], hdr.computeOutlierScores())
+        assert_equal(results["C1"], np.array(hdr.sample)[:, 1])
+        assert_equal(results["pvalues"], hdr.pvalues)
+        # Per vertex arrays
+        inliers = data[hdr.computeIndices(False)]
+        assert_equal(results["band_lower"], np.min(inliers, axis=0))
+        assert_equal(results["band_upper"], np.max(inliers, axis=0))
+        assert_equal(results["mode"], data[hdr.getMode()])
+        assert_equal(results["vertex"].size, data.shape[1])
+
+    def test_ColumnNameCollision(self):
+        hdr, _ = runProcessHDR()
+        # A component named as a result column
+        hdr.sample.setDescription(["score", "C1"])
+        self.assertRaises(ValueError, hdr.computeResultColumns)
+        # A component named as a metadata
+        hdr.sample.setDescription(["C0", "pvalues"])
+        filename = os.path.join(self.directory, "results.npz")
+        self.assertRaises(ValueError, othdr.ExportToNPZ, hdr, filename)
+
+    @unittest.skipUnless(haveArrow, "pyarrow is not installed")
+    def test_Parquet(self):
+        hdr, data = runProcessHDR()
+        filename = os.path.join(self.directory, "points.parquet")
+        verticesFilename = os.path.join(self.directory, "vertices.parquet")
+        othdr.ExportToParquet(hdr, filename, verticesFilename)
+        points = pyarrow.parquet.read_table(filename)
+        assert_equal(points.num_rows, data.shape[0])
+        assert_equal(points.column("pdf").to_numpy(), hdr.sample_pdf)
+        vertices = pyarrow.parquet.read_table(verticesFilename)
+        assert_equal(vertices.num_rows, data.shape[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for the command line interface.
+"""
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from numpy.testing import assert_equal, assert_allclose
+import openturns as ot
+import othdrplot as othdr
+from othdrplot.command_line_interface import main, ReadTrajectoriesFile
+
+
+class CheckCommandLineInterface(unittest.TestCase):
+    def test_Main(self):
+        fname = os.path.join(othdr.__path__[0], "..", "tests", "data", "npfda-elnino.dat")
+        directory = tempfile.mkdtemp()
+        try:
+            for name in ["first.dat", "second.dat"]:
+                shutil.copy(fname, os.path.join(directory, name))
+            outputDirectory = os.path.join(directory, "results")
+            status = main(
+                [
+                    os.path.join(directory, "*.dat"),
+                    "--layout",
+                    "rows",
+                    "-o",
+                    outputDirectory,
+                    "--monte-carlo-size",
+                    "10000",
+                    "--jobs",
+                    "2",
+                ]
+            )
+            assert_equal(status, 0)
+            first = np.load(os.path.join(outputDirectory, "first.npz"))
+            second = np.load(os.path.join(outputDirectory, "second.npz"))
+            assert_equal(first["outlier_indices"], second["outlier_indices"])
+
+            # Same results as the classes
+            ot.RandomGenerator.SetSeed(0)
+            processSample = ReadTrajectoriesFile(fname, "rows")
+            assert_equal(processSample.getSize(), 54)
+            reduction = othdr.KarhunenLoeveDimensionReductionAlgorithm(processSample, 2)
+            reduction.run()
+            reducedComponents = reduction.getReducedComponents()
+            distribution = ot.KernelSmoothing().build(reducedComponents)
+            hdr = othdr.ProcessHighDensityRegionAlgorithm(
+                processSample, reducedComponents, distribution, [0.9, 0.5]
+            )
+            hdr.setThresholdAlgorithm(othdr.MonteCarloThresholdAlgorithm(10000, seed=0))
+            hdr.run()
+            assert_equal(first["outlier_indices"], hdr.computeIndices())
+            assert_allclose(first["pdf"], hdr.sample_pdf)
+            assert_equal(int(first["mode_index"]), hdr.getMode())
+            trajectories = othdr.ConvertProcessSampleToArray(processSample)
+            inliers = trajectories[hdr.computeIndices(False)]
+            assert_allclose(first["band_lower"], np.min(inliers, axis=0))
+            assert_allclose(first["band_upper"], np.max(inliers, axis=0))
+
+            # No matching file
+            assert_equal(main([os.path.join(directory, "*.csv")]), 1)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_MainSeveralDirectories(self):
+        fname = os.path.join(othdr.__path__[0], "..", "tests", "data", "npfda-elnino.dat")
+        directory = tempfile.mkdtemp()
+        try:
+            for subdirectory in ["a", "b"]:
+                os.makedirs(os.path.join(directory, subdirectory))
+                shutil.copy(fname, os.path.join(directory, subdirectory, "x.dat"))
+            with open(os.path.join(directory, "b", "bad.dat"), "w") as f:
+                f.write("not a number\n")
+            outputDirectory = os.path.join(directory, "results")
+            options = ["--layout", "rows", "-o", outputDirectory]
+            options += ["--monte-carlo-size", "1000"]
+
+            # The same base name in two directories, a file matched twice
+            # and a file which fails
+            output = io.StringIO()
+            errors = io.StringIO()
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+                status = main(
+                    [
+                        os.path.join(directory, "a", "x.dat"),
+                        os.path.join(directory, "*", "*.dat"),
+                    ]
+                    + options
+                )
+            assert_equal(status, 1)
+            assert_equal(len(output.getvalue().splitlines()), 2)
+            self.assertIn("bad.dat: failed", errors.getvalue())
+            first = np.load(os.path.join(outputDirectory, "a", "x.npz"))
+            second = np.load(os.path.join(outputDirectory, "b", "x.npz"))
+            assert_equal(first["outlier_indices"], second["outlier_indices"])
+
+            # Two files of the same directory with the same output name
+            shutil.copy(fname, os.path.join(directory, "a", "x.txt"))
+            with contextlib.redirect_stderr(io.StringIO()):
+                status = main([os.path.join(directory, "a", "x.*")] + options)
+            assert_equal(status, 1)
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for CrossValidationKernelSmoothing class.
+"""
+import os
+import unittest
+import numpy as np
+from numpy.testing import assert_equal, assert_almost_equal
+import openturns as ot
+import othdrplot as othdr
+
+
+class CheckCrossValidationKernelSmoothing(unittest.TestCase):
+    def test_GaussianMixture(self):
+        fname = os.path.join(othdr.__path__[0], "data", "gauss-mixture.csv")
+        sample = ot.Sample.ImportFromCSVFile(fname)
+        silverman = np.array(ot.KernelSmoothing().computeSilvermanBandwidth(sample))
+
+        ot.RandomGenerator.SetSeed(0)
+        factory = othdr.CrossValidationKernelSmoothing()
+        distribution = factory.build(sample)
+        bandwidth = np.array(factory.getBandwidth())
+        scores = factory.getScores()
+        assert_equal(scores.shape, (13,))
+        factor = factory.bandwidthFactors[int(np.argmax(scores))]
+        assert_almost_equal(bandwidth, factor * silverman)
+        assert_almost_equal(
+            np.array(distribution.getImplementation().getBandwidth()), bandwidth
+        )
+
+        # The bandwidth is cached
+        factory.build(sample)
+        assert_almost_equal(np.array(factory.getBandwidth()), bandwidth)
+
+        # Same folds with a pool of processes
+        ot.RandomGenerator.SetSeed(0)
+        factory = othdr.CrossValidationKernelSmoothing(numberOfJobs=2)
+        factory.build(sample)
+        assert_almost_equal(np.array(factory.getBandwidth()), bandwidth)
+        assert_almost_equal(factory.getScores(), scores)
+
+        # Binned approximation
+        ot.RandomGenerator.SetSeed(0)
+        factory = othdr.CrossValidationKernelSmoothing(binningThreshold=100)
+        factory.build(sample)
+        assert_almost_equal(factory.getScores(), scores, 1)
+
+        # The cache depends on the binning parameters
+        binnedScores = factory.getScores()
+        factory.numberOfBins = 8
+        ot.RandomGenerator.SetSeed(0)
+        factory.build(sample)
+        self.assertFalse(np.allclose(factory.getScores(), binnedScores))
+
+    def test_CandidateChunks(self):
+        ot.RandomGenerator.SetSeed(0)
+        sample = ot.Normal(2).getSample(200)
+        ot.RandomGenerator.SetSeed(0)
+        factory = othdr.CrossValidationKernelSmoothing(numberOfFolds=2)
+        factory.build(sample)
+        scores = factory.getScores()
+
+        # Fewer folds than processes: each fold is split in candidate chunks
+        ot.RandomGenerator.SetSeed(0)
+        factory = othdr.CrossValidationKernelSmoothing(numberOfFolds=2, numberOfJobs=5)
+        factory.build(sample)
+        assert_almost_equal(factory.getScores(), scores)
+
+    def test_CacheSize(self):
+        sample1 = ot.Normal(1).getSample(50)
+        sample2 = ot.Normal(1).getSample(50)
+        factory = othdr.CrossValidationKernelSmoothing(cacheSize=1)
+        factory.build(sample1)
+        factory.build(sample2)
+        self.assertEqual(len(factory._cache), 1)
+        with self.assertRaises(ValueError):
+            othdr.CrossValidationKernelSmoothing(cacheSize=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
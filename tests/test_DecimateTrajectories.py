@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for DecimateTrajectories function.
+"""
+import unittest
+import numpy as np
+from numpy.testing import assert_equal
+import othdrplot as othdr
+
+
+class CheckDecimateTrajectories(unittest.TestCase):
+    def test_Decimate(self):
+        generator = np.random.default_rng(0)
+        vertices = np.linspace(0.0, 1.0, 1003)
+        trajectories = np.cumsum(generator.standard_normal((5, 1003)), axis=1)
+        decimatedVertices, decimated = othdr.DecimateTrajectories(
+            vertices, trajectories, 100
+        )
+        # 92 buckets of 11 vertices
+        assert_equal(decimatedVertices.size, 2 * 92)
+        assert_equal(decimated.shape, (5, decimatedVertices.size))
+        assert_equal(decimatedVertices[0], 0.0)
+        assert_equal(decimatedVertices[-1], 1.0)
+        assert_equal(np.all(np.diff(decimatedVertices) >= 0.0), True)
+        # Same extrema in each bucket
+        assert_equal(np.min(decimated, axis=1), np.min(trajectories, axis=1))
+        assert_equal(np.max(decimated, axis=1), np.max(trajectories, axis=1))
+        bucket = trajectories[:, 110:121]
+        assert_equal(np.min(decimated[:, 20:22], axis=1), np.min(bucket, axis=1))
+        assert_equal(np.max(decimated[:, 20:22], axis=1), np.max(bucket, axis=1))
+
+        # Short trajectories are unchanged
+        decimatedVertices, decimated = othdr.DecimateTrajectories(
+            vertices[:100], trajectories[:, :100], 50
+        )
+        assert_equal(decimated, trajectories[:, :100])
+        self.assertRaises(
+            ValueError, othdr.DecimateTrajectories, vertices, trajectories, 0
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
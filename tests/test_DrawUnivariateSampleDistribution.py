@@ -19,8 +19,53 @@ class CheckDrawUnivariateSampleDistribution(unittest.TestCase):
 
         graph = othdr.DrawUnivariateSampleDistribution(sample, distribution)
         otv.View(graph)
+
+        # With high density regions
+        graph = othdr.DrawUnivariateSampleDistribution(
+            sample, distribution, [0.9, 0.5]
+        )
+        otv.View(graph)
+
+        # The outliers are those of the univariate HDR
+        algo = othdr.UnivariateHighDensityRegionAlgorithm(
+            sample, distribution, [0.9, 0.5]
+        )
+        algo.run()
+        clouds = [
+            drawable
+            for drawable in graph.getDrawables()
+            if drawable.getImplementation().getClassName() == "Cloud"
+        ]
+        self.assertEqual(len(clouds), 2)
+        self.assertEqual(clouds[1].getData().getSize(), len(algo.computeIndices()))
         return
 
+    def test_DrawUnivariateSampleDistributionLarge(self):
+        ot.RandomGenerator.SetSeed(0)
+        sample = ot.Normal().getSample(100000)
+        distribution = ot.Normal()
+
+        # Histogram strip only
+        graph = othdr.DrawUnivariateSampleDistribution(
+            sample, distribution, numberOfBins=50
+        )
+        drawables = graph.getDrawables()
+        self.assertEqual(len(drawables), 2)
+        self.assertLessEqual(drawables[1].getData().getSize(), 4 * 50)
+        otv.View(graph)
+
+        # Histogram strip and subsampled markers
+        graph = othdr.DrawUnivariateSampleDistribution(
+            sample, distribution, [0.9], numberOfBins=50, maximumNumberOfMarkers=200
+        )
+        numberOfMarkers = sum(
+            drawable.getData().getSize()
+            for drawable in graph.getDrawables()
+            if drawable.getImplementation().getClassName() == "Cloud"
+        )
+        self.assertEqual(numberOfMarkers, 200)
+        otv.View(graph)
+
 
 if __name__ == "__main__":
     unittest.main()
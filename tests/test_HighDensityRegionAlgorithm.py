@@ -4,7 +4,8 @@
 Test for ProcessHighDensityRegionAlgorithm class.
 """
 import os
-from numpy.testing import assert_equal
+import numpy as np
+from numpy.testing import assert_equal, assert_allclose
 import openturns as ot
 import othdrplot as othdr
 import unittest
@@ -161,7 +162,7 @@ class CheckHDRAlgo(unittest.TestCase):
         )
 
         # Dataset
-        ot.RandomGenerator_SetSeed(1976)
+        ot.RandomGenerator.SetSeed(1976)
         sample = ot.Normal().getSample(100)
 
         # Creation du kernel smoothing
@@ -182,6 +183,249 @@ class CheckHDRAlgo(unittest.TestCase):
         expected_outlierIndices = [16, 24, 33, 49, 71, 84]
         assert_equal(outlierIndices, expected_outlierIndices)
 
+    def test_update(self):
+        ot.RandomGenerator.SetSeed(0)
+        numberOfPointsForSampling = 500
+        ot.ResourceMap.SetAsBool("Distribution-MinimumVolumeLevelSetBySampling", True)
+        ot.ResourceMap.Set(
+            "Distribution-MinimumVolumeLevelSetSamplingSize",
+            str(numberOfPointsForSampling),
+        )
+
+        # Dataset
+        fname = os.path.join(othdrplot.__path__[0], "data", "gauss-mixture.csv")
+        sample = ot.Sample.ImportFromCSVFile(fname)
+        initial_size = 800
+        initial_sample = sample[:initial_size]
+        new_points = sample[initial_size:]
+
+        ks = ot.KernelSmoothing()
+        distribution = ks.build(initial_sample)
+
+        dp = othdr.HighDensityRegionAlgorithm(initial_sample, distribution)
+        dp.run()
+        initialOutlierIndices = dp.computeIndices()
+        numberOfInitialOutliers = len(initialOutlierIndices)
+        dp.update(new_points)
+        assert_equal(len(initialOutlierIndices), numberOfInitialOutliers)
+        assert_equal(initial_sample.getSize(), initial_size)
+        assert_equal(dp.sample.getSize(), sample.getSize())
+
+        # The new points are scored against the current threshold
+        pdf = np.ravel(distribution.computePDF(sample))
+        expected_outlierIndices = [
+            int(i) for i in np.where(pdf < dp.getOutlierPValue())[0]
+        ]
+        assert_equal(sorted(dp.computeIndices()), expected_outlierIndices)
+        assert_equal(dp.getMode(), int(np.argmax(pdf)))
+
+        # Refresh the thresholds with the refitted distribution when the
+        # drift budget is exhausted
+        dp.setDriftBudget(10)
+        dp.run()
+        pvalues = dp.pvalues.copy()
+        refitted = ks.build(sample)
+        dp.update(new_points[:5], refitted)
+        assert_equal(dp.numberOfPointsSinceRefresh, 5)
+        assert dp.distribution is distribution
+        assert_equal(dp.pvalues, pvalues)
+        dp.update(new_points[5:20])
+        assert_equal(dp.numberOfPointsSinceRefresh, 0)
+        assert dp.distribution is refitted
+        assert_equal(len(dp.levelsets), len(dp.alphaLevels))
+        assert_equal(
+            len(dp.computeIndices()) + len(dp.computeIndices(False)),
+            sample.getSize() + 20,
+        )
+
+        # The PDF and the indices are extended in place
+        dp.update(new_points[:1])
+        buffer = dp.sample_pdf.base
+        outlierIndices = dp.outlier_indices
+        dp.update(new_points[1:2])
+        self.assertIs(dp.sample_pdf.base, buffer)
+        self.assertIs(dp.outlier_indices, outlierIndices)
+        assert_equal(dp.sample_pdf.size, sample.getSize() + 22)
+
+    def test_computeModes(self):
+        ot.RandomGenerator.SetSeed(0)
+        numberOfPointsForSampling = 500
+        ot.ResourceMap.SetAsBool("Distribution-MinimumVolumeLevelSetBySampling", True)
+        ot.ResourceMap.Set(
+            "Distribution-MinimumVolumeLevelSetSamplingSize",
+            str(numberOfPointsForSampling),
+        )
+
+        # Dataset
+        fname = os.path.join(othdrplot.__path__[0], "data", "gauss-mixture.csv")
+        sample = ot.Sample.ImportFromCSVFile(fname)
+
+        ks = ot.KernelSmoothing()
+        distribution = ks.build(sample)
+
+        dp = othdr.HighDensityRegionAlgorithm(sample, distribution)
+        dp.run()
+
+        # Top-k modes
+        pdf = np.ravel(distribution.computePDF(sample))
+        modes = dp.computeModes(5)
+        assert_equal(modes, [int(i) for i in np.argsort(-pdf)[:5]])
+        assert_equal(modes[0], dp.getMode())
+
+        # Local modes: one per component of the mixture
+        localModes = dp.computeLocalModes()
+        assert_equal(localModes, [424, 633])
+        assert_equal(dp.computeLocalModes(numberOfJobs=2), localModes)
+
+    def test_computeOutlierScores(self):
+        ot.RandomGenerator.SetSeed(0)
+        numberOfPointsForSampling = 500
+        ot.ResourceMap.SetAsBool("Distribution-MinimumVolumeLevelSetBySampling", True)
+        ot.ResourceMap.Set(
+            "Distribution-MinimumVolumeLevelSetSamplingSize",
+            str(numberOfPointsForSampling),
+        )
+
+        # Dataset
+        fname = os.path.join(othdrplot.__path__[0], "data", "gauss-mixture.csv")
+        sample = ot.Sample.ImportFromCSVFile(fname)
+
+        ks = ot.KernelSmoothing()
+        distribution = ks.build(sample)
+
+        dp = othdr.HighDensityRegionAlgorithm(sample, distribution, [0.9, 0.5, 0.1])
+        dp.run()
+
+        # Scores from the thresholds
+        pdf = np.ravel(distribution.computePDF(sample))
+        scores = dp.computeOutlierScores()
+        expected = np.ones(sample.getSize())
+        expected[pdf >= dp.getOutlierPValue()] = 0.9
+        for alpha, pvalue in zip(dp.alphaLevels[1:], dp.pvalues[1:]):
+            expected[pdf >= pvalue] = alpha
+        assert_equal(scores, expected)
+        assert_equal(np.where(scores == 1.0)[0], dp.computeIndices())
+
+        # Membership of the innermost region
+        labels = dp.computeLevelMembership()
+        assert_equal(np.where(labels == -1)[0], dp.computeIndices())
+        assert_equal(scores[labels >= 0], np.array(dp.alphaLevels)[labels[labels >= 0]])
+
+        # Ranking
+        ranking = dp.computeOutlierRanking()
+        assert_equal(ranking, np.argsort(pdf, kind="stable"))
+        assert_equal(dp.computeOutlierRanking(10), ranking[:10])
+
+    def test_computeDensityLookupTable(self):
+        ot.RandomGenerator.SetSeed(0)
+        numberOfPointsForSampling = 500
+        ot.ResourceMap.SetAsBool("Distribution-MinimumVolumeLevelSetBySampling", True)
+        ot.ResourceMap.Set(
+            "Distribution-MinimumVolumeLevelSetSamplingSize",
+            str(numberOfPointsForSampling),
+        )
+
+        # Dataset
+        fname = os.path.join(othdrplot.__path__[0], "data", "gauss-mixture.csv")
+        sample = ot.Sample.ImportFromCSVFile(fname)
+
+        ks = ot.KernelSmoothing()
+        distribution = ks.build(sample)
+
+        dp = othdr.HighDensityRegionAlgorithm(sample, distribution, [0.9, 0.5, 0.1])
+        dp.run()
+        table = dp.computeDensityLookupTable(200)
+
+        # Interpolated PDF in the box
+        points = np.array(sample)
+        pdf = table.computePDF(points)
+        assert_allclose(pdf, dp.sample_pdf, atol=1.0e-3 * np.max(dp.sample_pdf))
+        assert_equal(table.computeLevelMembership(points), dp.computeLevelMembership())
+        assert_equal(np.where(table.computeOutlierFlags(points))[0], dp.computeIndices())
+
+        # Exact PDF outside the box
+        points = np.array([[-100.0, 0.0], [0.0, 100.0]])
+        assert_equal(table.computePDF(points), np.ravel(distribution.computePDF(points)))
+
+    def test_DensityLookupTableMultilinear(self):
+        # A multilinear function is interpolated exactly
+        axes = [np.linspace(-1.0, 1.0, 5), np.linspace(0.0, 3.0, 7), np.linspace(2.0, 4.0, 4)]
+
+        def function(x):
+            return 1.0 + x[:, 0] + 2.0 * x[:, 1] * x[:, 2] + x[:, 0] * x[:, 1] * x[:, 2]
+
+        nodes = np.column_stack(
+            [np.ravel(coordinates) for coordinates in np.meshgrid(*axes, indexing="ij")]
+        )
+        values = function(nodes).reshape([axis.size for axis in axes])
+        distribution = ot.Normal(3)
+        table = othdr.DensityLookupTable(distribution, axes, values, [0.1], [0.5])
+        rng = np.random.default_rng(0)
+        points = table.lower + (table.upper - table.lower) * rng.random((1000, 3))
+        points[0] = table.upper
+        assert_allclose(table.computePDF(points), function(points))
+        # The PDF of the distribution outside the grid
+        points[1] = [2.0, 0.0, 3.0]
+        pdf = table.computePDF(points)
+        assert_allclose(pdf[0], function(points[:1])[0])
+        assert_equal(pdf[1], distribution.computePDF(points[1]))
+        assert_allclose(pdf[2:], function(points[2:]))
+
+    def test_computeDensityLookupTableConstantComponent(self):
+        ot.RandomGenerator.SetSeed(0)
+        points = np.column_stack((np.array(ot.Normal().getSample(100)), np.ones(100)))
+        sample = ot.Sample(points)
+        distribution = ot.Normal([0.0, 1.0], [1.0, 0.5], ot.CorrelationMatrix(2))
+        dp = othdr.HighDensityRegionAlgorithm(sample, distribution, [0.9, 0.5])
+        dp.run()
+        table = dp.computeDensityLookupTable(100)
+        assert_equal(table.lower[1], 0.5)
+        assert_equal(table.upper[1], 1.5)
+        pdf = table.computePDF(points)
+        assert_allclose(pdf, dp.sample_pdf, atol=1.0e-3 * np.max(dp.sample_pdf))
+        assert_equal(table.computeLevelMembership(points), dp.computeLevelMembership())
+
+        self.assertRaises(
+            ValueError,
+            othdr.DensityLookupTable,
+            distribution,
+            [np.zeros(3), np.zeros(3)],
+            np.zeros((3, 3)),
+            dp.pvalues,
+            dp.alphaLevels,
+        )
+
+    def test_drawWithMatplotlib(self):
+        ot.RandomGenerator.SetSeed(0)
+        numberOfPointsForSampling = 500
+        ot.ResourceMap.SetAsBool("Distribution-MinimumVolumeLevelSetBySampling", True)
+        ot.ResourceMap.Set(
+            "Distribution-MinimumVolumeLevelSetSamplingSize",
+            str(numberOfPointsForSampling),
+        )
+
+        # Dataset
+        fname = os.path.join(othdrplot.__path__[0], "data", "gauss-mixture-3D.csv")
+        sample = ot.Sample.ImportFromCSVFile(fname)
+
+        ks = ot.KernelSmoothing()
+        distribution = ks.build(sample)
+
+        dp = othdr.HighDensityRegionAlgorithm(sample, distribution, [0.8, 0.3])
+        dp.run()
+
+        figure = dp.drawWithMatplotlib(drawInliers=True)
+        axes = [ax for ax in figure.axes if ax.get_visible()]
+        assert_equal(len(axes), 6)
+        figure = dp.drawWithMatplotlib(drawOutliers=False)
+        assert_equal(len(figure.axes[0].collections), 0)
+        # One cloud per level of the inliers
+        figure = dp.drawWithMatplotlib(
+            drawInliers=True, drawOutliers=False, colorByLevel=True
+        )
+        labels = dp.computeLevelMembership()
+        assert_equal(len(figure.axes[0].collections), len(np.unique(labels[labels >= 0])))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for HighDensityRegionMatrixPlot class.
+"""
+import unittest
+from numpy.testing import assert_equal
+import openturns as ot
+import othdrplot as othdr
+
+
+class CheckHighDensityRegionMatrixPlot(unittest.TestCase):
+    def test_MatrixPlot(self):
+        ot.RandomGenerator.SetSeed(0)
+        # The most separated outliers are in the pair (3, 1)
+        dimension = 5
+        sample = ot.Normal(dimension).getSample(300)
+        for k in range(10):
+            sample[k, 1] = 3.0 * (-1.0) ** k
+            sample[k, 3] = -3.0 * (-1.0) ** k
+        distribution = ot.NormalFactory().build(sample)
+        hdr = othdr.HighDensityRegionAlgorithm(sample, distribution, [0.9, 0.5])
+        hdr.thresholdAlgorithm = othdr.MonteCarloThresholdAlgorithm(100000, seed=0)
+        hdr.run()
+
+        plot = othdr.HighDensityRegionMatrixPlot(hdr, drawInliers=True)
+        assert_equal(plot.getNumberOfComputedPanels(), 0)
+
+        # Ranking
+        separations = plot.computePairSeparations()
+        assert_equal(separations.shape, (dimension, dimension))
+        assert_equal(separations, separations.T)
+        pairs = plot.computePairRanking()
+        assert_equal(len(pairs), 10)
+        assert_equal(pairs[0], (3, 1))
+        assert_equal(plot.computePairRanking(3), pairs[:3])
+        assert_equal(plot.getNumberOfPages(4), 3)
+        self.assertRaises(ValueError, plot.drawPage, 3, 4)
+
+        # Panels are computed once
+        graph = plot.getPanel(2, 2)
+        assert_equal(plot.getNumberOfComputedPanels(), 1)
+        self.assertIs(plot.getPanel(2, 2), graph)
+        self.assertRaises(ValueError, plot.getPanel, 1, 2)
+
+        # The first page draws the contours of the off-diagonal panels
+        grid = plot.drawPage(0, 4, 2)
+        assert_equal(grid.getNbRows(), 2)
+        assert_equal(grid.getNbColumns(), 2)
+        assert_equal(plot.getNumberOfComputedPanels(), 5)
+        graph = grid.getGraph(0, 0)
+        contours = [
+            drawable
+            for drawable in graph.getDrawables()
+            if drawable.getImplementation().getClassName() == "Contour"
+        ]
+        assert_equal(len(contours), 1)
+        assert_equal(contours[0].getLevels(), hdr.pvalues)
+
+
+if __name__ == "__main__":
+    unittest.main()
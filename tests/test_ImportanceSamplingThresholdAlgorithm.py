@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for ImportanceSamplingThresholdAlgorithm class.
+"""
+import os
+import unittest
+import numpy as np
+from numpy.testing import assert_equal, assert_array_less
+import openturns as ot
+import othdrplot as othdr
+
+
+class CheckImportanceSamplingThreshold(unittest.TestCase):
+    def test_Normal(self):
+        # The threshold of alpha is (1 - alpha) / (2 pi)
+        ot.RandomGenerator.SetSeed(0)
+        alphaLevels = [0.999, 0.99, 0.5]
+        exact = (1.0 - np.array(alphaLevels)) / (2.0 * np.pi)
+        algo = othdr.ImportanceSamplingThresholdAlgorithm(10000)
+        thresholds = algo.computeThresholds(ot.Normal(2), alphaLevels)
+        errors = algo.getThresholdErrors()
+        assert_array_less(np.abs(thresholds - exact), 2.0 * errors)
+        assert_array_less(errors, 0.15 * exact)
+        assert_array_less(0.0, algo.getProbabilityErrors())
+
+    def test_HighDensityRegionAlgorithm(self):
+        ot.RandomGenerator.SetSeed(0)
+        fname = os.path.join(othdr.__path__[0], "data", "gauss-mixture.csv")
+        sample = ot.Sample.ImportFromCSVFile(fname)
+        distribution = ot.KernelSmoothing().build(sample)
+
+        hdr = othdr.HighDensityRegionAlgorithm(sample, distribution, [0.999, 0.5])
+        algo = othdr.ImportanceSamplingThresholdAlgorithm(20000)
+        hdr.setThresholdAlgorithm(algo)
+        hdr.run()
+        assert_equal(hdr.getThresholdAlgorithm() is algo, True)
+        assert_equal(hdr.pvalues, algo.thresholds)
+        assert_equal(hdr.getOutlierPValue(), hdr.pvalues[0])
+        assert_array_less(algo.getThresholdErrors(), 0.2 * hdr.pvalues)
+        pdf = np.ravel(distribution.computePDF(sample))
+        assert_equal(hdr.computeIndices(), np.where(pdf < hdr.getOutlierPValue())[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for KarhunenLoeveDimensionReductionAlgorithm class.
+"""
+import unittest
+import numpy as np
+from numpy.testing import assert_equal, assert_allclose
+import openturns as ot
+import othdrplot as othdr
+
+
+class CheckKarhunenLoeveDimensionReduction(unittest.TestCase):
+    def test_MultiResolution(self):
+        ot.RandomGenerator.SetSeed(0)
+        mesh = ot.IntervalMesher([400]).build(ot.Interval(0.0, 10.0))
+        covarianceModel = ot.SquaredExponential([1.5], [2.0])
+        process = ot.GaussianProcess(covarianceModel, mesh)
+        processSample = process.getSample(100)
+
+        reduction = othdr.KarhunenLoeveDimensionReductionAlgorithm(processSample, 3)
+        reduction.run()
+        expected_eigenvalues = np.array(
+            reduction.getKarhunenLoeveResult().getEigenvalues()
+        )
+
+        reduction = othdr.KarhunenLoeveDimensionReductionAlgorithm(processSample, 3)
+        reduction.setDecimationFactor(10)
+        assert_equal(reduction.getDecimationFactor(), 10)
+        reduction.run()
+        reducedComponents = reduction.getReducedComponents()
+        assert_equal(reducedComponents.getDescription(), ["C0", "C1", "C2"])
+        result = reduction.getKarhunenLoeveResult()
+        assert_equal(result.getMesh().getVerticesNumber(), 401)
+        assert_allclose(result.getEigenvalues(), expected_eigenvalues, rtol=1.0e-2)
+
+        # Exact components from the weighted SVD on the full mesh
+        trajectories = othdr.ConvertProcessSampleToArray(processSample)
+        weights = np.array(mesh.computeWeights())
+        centered = trajectories - np.mean(trajectories, axis=0)
+        _, singularValues, rightVectors = np.linalg.svd(
+            centered * np.sqrt(weights), full_matrices=False
+        )
+        scale = singularValues[:3, None] / np.sqrt(trajectories.shape[0] - 1.0)
+        projection = rightVectors[:3] * np.sqrt(weights) / scale
+        expected = trajectories.dot(projection.T)
+        # The modes, hence the components, are defined up to their sign
+        reducedComponents = np.array(reducedComponents)
+        signs = np.sign(np.sum(reducedComponents * expected, axis=0))
+        assert_allclose(reducedComponents * signs, expected, atol=1.0e-3)
+
+        # The modes are orthonormal on the full mesh
+        modes = othdr.ConvertProcessSampleToArray(result.getModesAsProcessSample())
+        assert_allclose((modes * weights).dot(modes.T), np.eye(3), atol=1.0e-10)
+
+        self.assertRaises(ValueError, reduction.setDecimationFactor, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
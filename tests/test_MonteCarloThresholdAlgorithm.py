@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for MonteCarloThresholdAlgorithm class.
+"""
+import os
+import unittest
+import numpy as np
+from numpy.testing import assert_equal, assert_array_less
+import openturns as ot
+import othdrplot as othdr
+
+
+class CheckMonteCarloThreshold(unittest.TestCase):
+    def test_Normal(self):
+        # The threshold of alpha is (1 - alpha) / (2 pi)
+        alphaLevels = [0.9, 0.5]
+        exact = (1.0 - np.array(alphaLevels)) / (2.0 * np.pi)
+        algo = othdr.MonteCarloThresholdAlgorithm(20000, 3000, seed=1)
+        thresholds = algo.computeThresholds(ot.Normal(2), alphaLevels)
+        assert_array_less(np.abs(thresholds - exact), 2.0 * algo.getThresholdErrors())
+
+    def test_CorrelatedNormal(self):
+        # Not a Gaussian kernel density: sampled with OpenTURNS
+        correlation = ot.CorrelationMatrix(2)
+        correlation[0, 1] = 0.5
+        distribution = ot.Normal([0.0] * 2, [1.0] * 2, correlation)
+        alphaLevels = [0.9, 0.5]
+        exact = (1.0 - np.array(alphaLevels)) / (2.0 * np.pi * np.sqrt(0.75))
+        algo = othdr.MonteCarloThresholdAlgorithm(20000, 3000, seed=1)
+        thresholds = algo.computeThresholds(distribution, alphaLevels)
+        assert_array_less(np.abs(thresholds - exact), 2.0 * algo.getThresholdErrors())
+        # Plain Monte-Carlo does not build the widened proposal
+        self.assertIsNone(algo._computeProposal(distribution)[1])
+        kernelSmoothing = ot.KernelSmoothing().build(distribution.getSample(100))
+        self.assertIsNone(algo._computeProposal(kernelSmoothing)[1][3])
+
+    def test_Reproducibility(self):
+        fname = os.path.join(othdr.__path__[0], "data", "gauss-mixture.csv")
+        sample = ot.Sample.ImportFromCSVFile(fname)
+        distribution = ot.KernelSmoothing().build(sample)
+        alphaLevels = [0.9, 0.5]
+
+        # The same seed gives the same thresholds with any number of jobs
+        thresholds = [
+            othdr.MonteCarloThresholdAlgorithm(
+                10000, 3000, numberOfJobs, seed=7
+            ).computeThresholds(distribution, alphaLevels)
+            for numberOfJobs in [1, 2]
+        ]
+        assert_equal(thresholds[0], thresholds[1])
+
+        # Without seed, the seed comes from the OpenTURNS generator
+        ot.RandomGenerator.SetSeed(0)
+        hdr = othdr.HighDensityRegionAlgorithm(sample, distribution, alphaLevels)
+        hdr.setThresholdAlgorithm(othdr.MonteCarloThresholdAlgorithm(10000, 3000))
+        hdr.run()
+        pvalues = hdr.pvalues
+        ot.RandomGenerator.SetSeed(0)
+        hdr.setThresholdAlgorithm(othdr.MonteCarloThresholdAlgorithm(10000, 3000, 2))
+        hdr.run()
+        assert_equal(hdr.pvalues, pvalues)
+
+
+if __name__ == "__main__":
+    unittest.main()
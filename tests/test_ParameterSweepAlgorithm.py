@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for ParameterSweepAlgorithm class.
+"""
+import unittest
+from numpy.testing import assert_equal
+import openturns as ot
+import othdrplot as othdr
+
+
+class CheckParameterSweep(unittest.TestCase):
+    def test_Sweep(self):
+        ot.RandomGenerator.SetSeed(0)
+        timeGrid = ot.RegularGrid(0.0, 0.1, 101)
+        covarianceModel = ot.SquaredExponential([1.5], [7.0])
+        process = ot.GaussianProcess(covarianceModel, timeGrid)
+        processSample = process.getSample(60)
+
+        sweep = othdr.ParameterSweepAlgorithm(
+            processSample, [1, 2], [[0.5, 0.9], [0.8]], [0.5, 1.0]
+        )
+        sweep.run()
+        results = sweep.getResults()
+        assert_equal(len(results), 8)
+        assert_equal(sweep.getReducedComponents().getDimension(), 2)
+
+        # Compare with a configuration computed by hand
+        reduction = othdr.KarhunenLoeveDimensionReductionAlgorithm(processSample, 1)
+        reduction.run()
+        reducedComponents = reduction.getReducedComponents()
+        ks = ot.KernelSmoothing()
+        distribution = ks.build(
+            reducedComponents, ks.computeSilvermanBandwidth(reducedComponents) * 0.5
+        )
+        hdr = othdr.HighDensityRegionAlgorithm(reducedComponents, distribution, [0.5, 0.9])
+        hdr.setThresholdAlgorithm(othdr.MonteCarloThresholdAlgorithm(10000, seed=0))
+        hdr.run()
+        row = results[0]
+        assert_equal(row["numberOfComponents"], 1)
+        assert_equal(row["bandwidthFactor"], 0.5)
+        assert_equal(row["alphaLevels"], (0.9, 0.5))
+        assert_equal(row["pvalues"], hdr.pvalues)
+        assert_equal(row["outlierIndices"], hdr.computeIndices())
+
+        # The results do not depend on the number of jobs
+        sweep = othdr.ParameterSweepAlgorithm(
+            processSample, [1, 2], [[0.5, 0.9], [0.8]], [0.5, 1.0], numberOfJobs=2
+        )
+        sweep.run()
+        for row, row_parallel in zip(results, sweep.getResults()):
+            assert_equal(row["numberOfComponents"], row_parallel["numberOfComponents"])
+            assert_equal(row["alphaLevels"], row_parallel["alphaLevels"])
+            assert_equal(row["pvalues"], row_parallel["pvalues"])
+            assert_equal(row["outlierIndices"], row_parallel["outlierIndices"])
+
+
+if __name__ == "__main__":
+    unittest.main()
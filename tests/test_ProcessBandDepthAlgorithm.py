@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for ProcessBandDepthAlgorithm class.
+"""
+import itertools
+import unittest
+import numpy as np
+from numpy.testing import assert_equal, assert_almost_equal
+import openturns as ot
+import openturns.viewer as otv
+import othdrplot as othdr
+
+
+class CheckProcessBandDepth(unittest.TestCase):
+    def test_ComputeModifiedBandDepth(self):
+        # Compare with the definition, with ties
+        ot.RandomGenerator.SetSeed(0)
+        trajectories = np.round(np.array(ot.Normal(7).getSample(12)), 1)
+        depth = othdr.ComputeModifiedBandDepth(trajectories, 3)
+        expected = np.zeros(12)
+        pairs = list(itertools.combinations(range(12), 2))
+        for i, j in pairs:
+            lower = np.minimum(trajectories[i], trajectories[j])
+            upper = np.maximum(trajectories[i], trajectories[j])
+            inside = (trajectories >= lower) & (trajectories <= upper)
+            expected += np.mean(inside, axis=1)
+        assert_almost_equal(depth, expected / len(pairs))
+
+    def test_ProcessBandDepthAlgorithm(self):
+        ot.RandomGenerator.SetSeed(0)
+        timeGrid = ot.RegularGrid(0.0, 0.1, 101)
+        covarianceModel = ot.SquaredExponential([1.5], [7.0])
+        process = ot.GaussianProcess(covarianceModel, timeGrid)
+        trajectories = othdr.ConvertProcessSampleToArray(process.getSample(50))
+        # A shifted trajectory
+        trajectories[7] += 30.0
+        processSample = othdr.ConvertArrayToProcessSample(timeGrid, trajectories)
+
+        algo = othdr.ProcessBandDepthAlgorithm(processSample, [0.5, 0.9])
+        algo.run()
+        outlier_indices = algo.computeIndices()
+        inlier_indices = algo.computeIndices(False)
+        assert_equal(len(outlier_indices), 5)
+        assert_equal(len(inlier_indices), 45)
+        self.assertIn(7, outlier_indices)
+        self.assertEqual(np.argmin(algo.getDepth()), 7)
+        self.assertEqual(algo.getMode(), np.argmax(algo.getDepth()))
+
+        # The central regions are nested
+        lower_50, upper_50 = algo.computeCentralRegion(0.5)
+        lower_90, upper_90 = algo.computeCentralRegion()
+        self.assertTrue(np.all(lower_90 <= lower_50))
+        self.assertTrue(np.all(upper_50 <= upper_90))
+
+        graph = algo.draw(drawInliers=True)
+        # One curve per trajectory, the band and the central curve
+        assert_equal(len(graph.getDrawables()), 50 + 2)
+        otv.View(graph)
+        graph = algo.draw(discreteMean=True, bounds=False)
+        otv.View(graph)
+
+
+if __name__ == "__main__":
+    unittest.main()
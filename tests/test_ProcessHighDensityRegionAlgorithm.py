@@ -10,6 +10,7 @@ from numpy.testing import assert_equal
 import openturns as ot
 import othdrplot as othdr
 import openturns.viewer as otv
+from matplotlib.collections import LineCollection
 
 
 def setup_HDRenv():
@@ -183,6 +184,130 @@ class CheckProcessHDRAlgo(unittest.TestCase):
         hdr.run()
         graph = hdr.draw()
         otv.View(graph)
+        graph = hdr.draw(numberOfModes=3)
+        otv.View(graph)
+        graph = hdr.draw(drawInliers=True, colorByLevel=True)
+        otv.View(graph)
+        labels = hdr.computeLevelMembership()
+        assert_equal(np.where(labels == -1)[0], hdr.computeIndices())
+
+        # Draw with matplotlib
+        axes = hdr.drawWithMatplotlib(drawInliers=True, numberOfModes=2)
+        numberOfCurves = sum(
+            len(collection.get_segments())
+            for collection in axes.collections
+            if isinstance(collection, LineCollection)
+        )
+        assert_equal(numberOfCurves, nbTrajectories)
+        axes = hdr.drawWithMatplotlib(
+            drawInliers=True,
+            drawOutliers=False,
+            maximumNumberOfInliers=10,
+            rasterized=True,
+        )
+        assert_equal(len(axes.collections[0].get_segments()), 10)
+        assert_equal(axes.collections[0].get_rasterized(), True)
+        axes = hdr.drawWithMatplotlib(
+            drawInliers=True, drawOutliers=False, bounds=False, colorByLevel=True
+        )
+        collections = [
+            collection
+            for collection in axes.collections
+            if isinstance(collection, LineCollection)
+        ]
+        assert_equal(len(collections), len(np.unique(labels[labels >= 0])))
+        assert_equal(
+            sum(len(collection.get_segments()) for collection in collections),
+            len(hdr.computeIndices(False)),
+        )
+
+        # Decimated curves, exact bounds and central curve
+        outlier_indices = hdr.computeIndices()
+        graph = hdr.draw(
+            drawInliers=True, maximumNumberOfInliers=10, numberOfBuckets=20
+        )
+        drawables = graph.getDrawables()
+        assert_equal(len(drawables), len(outlier_indices) + 10 + 2)
+        # 17 buckets of 6 vertices
+        assert_equal(drawables[0].getData().getSize(), 34)
+        assert_equal(drawables[-1].getData().getSize(), n + 1)
+        axes = hdr.drawWithMatplotlib(drawInliers=True, numberOfBuckets=20)
+        assert_equal(axes.collections[0].get_segments()[0].shape, (34, 2))
+
+    def test_CompactStorage(self):
+        setup_HDRenv()
+
+        # Dataset
+        fname = os.path.join(othdr.__path__[0], "..", "tests", "data", "npfda-elnino.dat")
+        processSample = readProcessSample(fname)
+        size = processSample.getSize()
+        mesh = processSample.getMesh()
+        trajectories = othdr.ConvertProcessSampleToArray(processSample)
+        initialProcessSample = othdr.ConvertArrayToProcessSample(mesh, trajectories[:40])
+        firstProcessSample = othdr.ConvertArrayToProcessSample(mesh, trajectories[40:41])
+        newProcessSample = othdr.ConvertArrayToProcessSample(mesh, trajectories[41:])
+
+        # KL decomposition
+        reduction = othdr.KarhunenLoeveDimensionReductionAlgorithm(processSample, 2)
+        reduction.run()
+        reducedComponents = reduction.getReducedComponents()
+        reducedDistribution = ot.KernelSmoothing().build(reducedComponents)
+
+        hdr = othdr.ProcessHighDensityRegionAlgorithm(
+            initialProcessSample,
+            reducedComponents[:40],
+            reducedDistribution,
+            [0.8, 0.5],
+        )
+        hdr.setCompactStorage(True)
+        hdr.pdfBatchSize = 7
+        # Only the float32 arrays and the mesh are kept
+        self.assertIsNone(hdr.processSample)
+        self.assertIsNone(hdr.sample)
+        assert_equal(hdr._getTrajectories().dtype, np.float32)
+        assert_equal(hdr._getPoints().dtype, np.float32)
+        hdr.run()
+        assert_equal(hdr.getCompactStorage(), True)
+        outlier_indices = hdr.computeIndices()
+        assert_equal(outlier_indices.dtype, np.int32)
+        points = np.array(reducedComponents, dtype=np.float32).astype(float)
+        pdf = np.ravel(reducedDistribution.computePDF(points))
+        assert_equal(outlier_indices, np.where(pdf[:40] < hdr.getOutlierPValue())[0])
+        self.assertRaises(ValueError, hdr.setCompactStorage, False)
+
+        # The new trajectories are appended to the arrays, whose capacity
+        # is doubled when they are full
+        hdr.update(firstProcessSample, reducedComponents[40:41])
+        assert_equal(hdr._trajectories.shape[0], 80)
+        assert_equal(hdr._points.shape[0], 80)
+        hdr.update(newProcessSample, reducedComponents[41:])
+        assert_equal(hdr._getTrajectories(), trajectories.astype(np.float32))
+        assert_equal(hdr._getPoints().shape[0], size)
+        assert_equal(hdr.computeIndices(), np.where(pdf < hdr.getOutlierPValue())[0])
+        graph = hdr.draw(drawInliers=True)
+        otv.View(graph)
+        hdr.drawWithMatplotlib(drawInliers=True)
+
+        # Without compact storage, the process sample is kept in sync
+        hdr = othdr.ProcessHighDensityRegionAlgorithm(
+            initialProcessSample,
+            reducedComponents[:40],
+            reducedDistribution,
+            [0.8, 0.5],
+        )
+        hdr.run()
+        hdr.update(firstProcessSample, reducedComponents[40:41])
+        assert_equal(hdr.processSample.getSize(), 41)
+        assert_equal(initialProcessSample.getSize(), 40)
+        # The converted trajectories are extended, not converted again
+        hdr.drawWithMatplotlib()
+        hdr.update(newProcessSample, reducedComponents[41:])
+        assert_equal(hdr._getTrajectories(), trajectories)
+        buffer = hdr._trajectories
+        assert_equal(buffer.shape[0], 82)
+        hdr.update(firstProcessSample, reducedComponents[40:41])
+        self.assertIs(hdr._trajectories, buffer)
+        assert_equal(hdr._getTrajectories().shape[0], size + 1)
 
 
 if __name__ == "__main__":
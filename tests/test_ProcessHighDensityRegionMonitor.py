@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for ProcessHighDensityRegionMonitor class.
+"""
+import unittest
+import numpy as np
+from numpy.testing import assert_equal, assert_almost_equal
+import openturns as ot
+import othdrplot as othdr
+
+
+def setup_HDRenv():
+    """
+    Setup the HDR environnement.
+    """
+    ot.RandomGenerator.SetSeed(0)
+    numberOfPointsForSampling = 500
+    ot.ResourceMap.SetAsBool("Distribution-MinimumVolumeLevelSetBySampling", True)
+    ot.ResourceMap.Set(
+        "Distribution-MinimumVolumeLevelSetSamplingSize", str(numberOfPointsForSampling)
+    )
+    return
+
+
+def createProcessSample(nbTrajectories):
+    """Return trajectories of a squared exponential Gaussian process."""
+    timeGrid = ot.RegularGrid(0.0, 0.1, 51)
+    covarianceModel = ot.SquaredExponential([1.5], [7.0])
+    process = ot.GaussianProcess(covarianceModel, timeGrid)
+    return process.getSample(nbTrajectories)
+
+
+class CheckProcessHDRMonitor(unittest.TestCase):
+    def test_SlidingWindow(self):
+        setup_HDRenv()
+        processSample = createProcessSample(80)
+        initialSample = othdr.ConvertArrayToProcessSample(
+            processSample.getMesh(),
+            othdr.ConvertProcessSampleToArray(processSample)[:50],
+        )
+        monitor = othdr.ProcessHighDensityRegionMonitor(
+            initialSample, 2, windowSize=40, refreshPeriod=10
+        )
+        monitor.run()
+        assert_equal(monitor.getWindowProcessSample().getSize(), 40)
+
+        events = []
+        monitor.setOutlierCallback(
+            lambda arrival, values, pdf: events.append(arrival)
+        )
+        trajectories = othdr.ConvertProcessSampleToArray(processSample)
+        for values in trajectories[50:75]:
+            monitor.addTrajectory(values)
+        assert_equal(monitor.numberOfArrivals, 25)
+        assert_equal(monitor.numberOfArrivalsSinceRefresh, 5)
+
+        # The window holds the last 40 trajectories, oldest first
+        window = othdr.ConvertProcessSampleToArray(monitor.getWindowProcessSample())
+        assert_almost_equal(window, trajectories[35:75])
+
+        # The reduced components are the projection on the current basis
+        reduced = np.array(monitor.getReducedComponents())
+        assert_almost_equal(reduced[-5:], trajectories[70:75].dot(monitor.projectionMatrix.T))
+
+        # A shifted trajectory is an outlier
+        isOutlier = monitor.addTrajectory(trajectories[75] + 50.0)
+        assert_equal(isOutlier, True)
+        assert_equal(monitor.getOutlierEvents()[-1][0], 25)
+        assert_equal(events[-1], 25)
+
+        # The mode is a trajectory of the window
+        mode = np.ravel(monitor.getModeTrajectory().getValues())
+        window = othdr.ConvertProcessSampleToArray(monitor.getWindowProcessSample())
+        assert_equal(np.min(np.max(np.abs(window - mode), axis=1)), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
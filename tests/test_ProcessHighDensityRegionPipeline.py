@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for ProcessHighDensityRegionPipeline class.
+"""
+import unittest
+from numpy.testing import assert_equal
+import openturns as ot
+import othdrplot as othdr
+import openturns.viewer as otv
+
+
+class CheckProcessHDRPipeline(unittest.TestCase):
+    def test_StageCaching(self):
+        ot.RandomGenerator.SetSeed(0)
+        ot.ResourceMap.SetAsBool("Distribution-MinimumVolumeLevelSetBySampling", True)
+        ot.ResourceMap.Set("Distribution-MinimumVolumeLevelSetSamplingSize", "500")
+        timeGrid = ot.RegularGrid(0.0, 0.1, 101)
+        covarianceModel = ot.SquaredExponential([1.5], [7.0])
+        process = ot.GaussianProcess(covarianceModel, timeGrid)
+        processSample = process.getSample(50)
+
+        pipeline = othdr.ProcessHighDensityRegionPipeline(processSample, 2, cacheSize=4)
+        pipeline.run()
+        assert_equal(pipeline.numberOfCacheMisses, 3)
+        reduction = pipeline.getReduction()
+        distribution = pipeline.getDistribution()
+
+        # Same results as the stages chained by hand
+        hdr = othdr.ProcessHighDensityRegionAlgorithm(
+            processSample, reduction.getReducedComponents(), distribution, [0.5, 0.9]
+        )
+        ot.RandomGenerator.SetSeed(0)
+        hdr.run()
+        ot.RandomGenerator.SetSeed(0)
+        pipeline.clearCache()
+        pipeline.run()
+        assert_equal(pipeline.computeIndices(), hdr.computeIndices())
+
+        # Changing the alpha levels reuses the reduction and the distribution
+        misses = pipeline.numberOfCacheMisses
+        pipeline.setAlphaLevels([0.8, 0.95])
+        pipeline.run()
+        assert_equal(pipeline.numberOfCacheMisses, misses + 1)
+
+        # Drawing reuses everything
+        otv.View(pipeline.draw(drawInliers=True))
+        otv.View(pipeline.draw(bounds=False))
+        assert_equal(pipeline.numberOfCacheMisses, misses + 1)
+
+        # Back to the first alpha levels: still in the cache
+        pipeline.setAlphaLevels([0.9, 0.5])
+        pipeline.run()
+        assert_equal(pipeline.numberOfCacheMisses, misses + 1)
+
+        # The least recently used outputs are evicted
+        pipeline.setNumberOfComponents(3)
+        pipeline.setDistributionFactory("ReducedDistributionFactory")
+        pipeline.run()
+        assert_equal(len(pipeline._cache), 4)
+        assert_equal(pipeline.getReducedComponents().getDimension(), 3)
+
+        # Setting a factory object again is a new key
+        factory = ot.KernelSmoothing()
+        pipeline.setDistributionFactory(factory)
+        pipeline.run()
+        misses = pipeline.numberOfCacheMisses
+        pipeline.setDistributionFactory(factory)
+        pipeline.run()
+        assert_equal(pipeline.numberOfCacheMisses, misses + 2)
+
+        # A new process sample clears the cache
+        pipeline.setProcessSample(process.getSample(30))
+        assert_equal(len(pipeline._cache), 0)
+        numberOfInliers = len(pipeline.computeIndices(False))
+        assert_equal(numberOfInliers + len(pipeline.computeIndices()), 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
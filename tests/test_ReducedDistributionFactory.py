@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for ReducedDistributionFactory class.
+"""
+import os
+import unittest
+import numpy as np
+from numpy.testing import assert_equal, assert_almost_equal
+import openturns as ot
+import othdrplot as othdr
+
+
+class CheckReducedDistributionFactory(unittest.TestCase):
+    def test_GaussianMixture(self):
+        ot.RandomGenerator.SetSeed(0)
+        fname = os.path.join(othdr.__path__[0], "data", "gauss-mixture.csv")
+        sample = ot.Sample.ImportFromCSVFile(fname)
+
+        factory = othdr.ReducedDistributionFactory(numberOfMixtureComponents=2)
+        distribution = factory.build(sample)
+        assert_equal(factory.getSelectedModel(), "Mixture")
+        assert_equal(distribution.getDimension(), 2)
+        scores = factory.getValidationScores()
+        self.assertGreater(scores["Mixture"], scores["Normal"])
+
+        # The modes of the mixture are close to the modes of the sample
+        means = sorted(
+            [list(atom.getMean()) for atom in distribution.getDistributionCollection()]
+        )
+        assert_almost_equal(means, [[-1.0, 2.0], [1.0, -2.0]], 0)
+
+        # The mixture can be used by the HDR algorithm
+        hdr = othdr.HighDensityRegionAlgorithm(sample, distribution)
+        hdr.run()
+        self.assertGreater(len(hdr.computeIndices()), 0)
+
+    def test_Normal(self):
+        ot.RandomGenerator.SetSeed(0)
+        R = ot.CorrelationMatrix(2)
+        R[0, 1] = 0.5
+        sample = ot.Normal([0.0, 0.0], [1.0, 2.0], R).getSample(1000)
+        factory = othdr.ReducedDistributionFactory()
+        distribution = factory.build(sample)
+        assert_equal(factory.getSelectedModel(), "Normal")
+        assert_almost_equal(
+            np.array(distribution.getMean()), np.array(sample.computeMean())
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
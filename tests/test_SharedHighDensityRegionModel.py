@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for SharedHighDensityRegionModel class.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import os
+import subprocess
+import sys
+import unittest
+import numpy as np
+from numpy.testing import assert_equal, assert_almost_equal
+import openturns as ot
+import othdrplot as othdr
+
+
+def _scoreTrajectories(task):
+    """Score trajectories with the shared model."""
+    descriptor, trajectories = task
+    model = othdr.SharedHighDensityRegionModel.Attach(descriptor)
+    reducedComponents = model.computeReducedComponents(trajectories)
+    flags = model.computeOutlierFlags(reducedComponents)
+    labels = model.computeLevelMembership(reducedComponents)
+    model.close()
+    return flags, labels
+
+
+def _attachAndScore(descriptor):
+    """Attach the shared model and score the origin."""
+    model = othdr.SharedHighDensityRegionModel.Attach(descriptor)
+    pdf = model.computePDF(np.zeros((1, 2)))
+    model.close()
+    return pdf[0]
+
+
+def _attachConcurrently():
+    """Attach a model from many tasks of a pool at the same time."""
+    ot.RandomGenerator.SetSeed(0)
+    sample = ot.Normal(2).getSample(100)
+    distribution = ot.KernelSmoothing().build(sample)
+    hdr = othdr.HighDensityRegionAlgorithm(sample, distribution, [0.8, 0.5])
+    hdr.setThresholdAlgorithm(othdr.MonteCarloThresholdAlgorithm(1000, seed=0))
+    hdr.run()
+    model = othdr.SharedHighDensityRegionModel.Export(hdr)
+    try:
+        with ProcessPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(_attachAndScore, [model.getDescriptor()] * 2000)
+            )
+    finally:
+        model.unlink()
+    assert_equal(len(results), 2000)
+
+
+class CheckSharedHighDensityRegionModel(unittest.TestCase):
+    def test_SharedModel(self):
+        ot.RandomGenerator.SetSeed(0)
+        ot.ResourceMap.SetAsBool("Distribution-MinimumVolumeLevelSetBySampling", True)
+        ot.ResourceMap.Set("Distribution-MinimumVolumeLevelSetSamplingSize", "500")
+        timeGrid = ot.RegularGrid(0.0, 0.1, 101)
+        covarianceModel = ot.SquaredExponential([1.5], [7.0])
+        process = ot.GaussianProcess(covarianceModel, timeGrid)
+        processSample = process.getSample(80)
+        reduction = othdr.KarhunenLoeveDimensionReductionAlgorithm(processSample, 2)
+        reduction.run()
+        reducedComponents = reduction.getReducedComponents()
+        distribution = ot.KernelSmoothing().build(reducedComponents)
+        hdr = othdr.ProcessHighDensityRegionAlgorithm(
+            processSample, reducedComponents, distribution, [0.8, 0.5]
+        )
+        hdr.run()
+
+        model = othdr.SharedHighDensityRegionModel.Export(
+            hdr, reduction.getKarhunenLoeveResult()
+        )
+        try:
+            # Same projection, density and classification
+            trajectories = othdr.ConvertProcessSampleToArray(processSample)
+            assert_almost_equal(
+                model.computeReducedComponents(trajectories), np.array(reducedComponents)
+            )
+            assert_almost_equal(
+                model.computePDF(np.array(reducedComponents)), hdr.sample_pdf
+            )
+            assert_equal(
+                model.computeLevelMembership(np.array(reducedComponents)),
+                hdr.computeLevelMembership(),
+            )
+            self.assertRaises(ValueError, model.arrays["pvalues"].__setitem__, 0, 1.0)
+
+            # Sharded scoring in worker processes
+            descriptor = model.getDescriptor()
+            tasks = [(descriptor, shard) for shard in np.array_split(trajectories, 4)]
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                results = list(executor.map(_scoreTrajectories, tasks))
+            flags = np.concatenate([result[0] for result in results])
+            assert_equal(np.where(flags)[0], hdr.computeIndices())
+        finally:
+            model.unlink()
+
+    def test_ConcurrentAttach(self):
+        # The resource tracker is a separate process which writes its errors
+        # to the standard error of the process which started it
+        directories = [os.path.dirname(othdr.__path__[0]), os.path.dirname(__file__)]
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.pathsep.join(
+            directories + [environment.get("PYTHONPATH", "")]
+        )
+        process = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import test_SharedHighDensityRegionModel as test; "
+                "test._attachConcurrently()",
+            ],
+            env=environment,
+            capture_output=True,
+            text=True,
+        )
+        assert_equal(process.returncode, 0)
+        assert_equal(process.stderr, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# Copyright 2018 - 2021 EDF - CERFACS.
+"""
+Test for UnivariateHighDensityRegionAlgorithm class.
+"""
+import unittest
+import numpy as np
+from numpy.testing import assert_equal, assert_almost_equal
+import openturns as ot
+import othdrplot as othdr
+import openturns.viewer as otv
+
+
+class CheckUnivariateHDRAlgo(unittest.TestCase):
+    def test_Normal(self):
+        ot.RandomGenerator.SetSeed(0)
+        sample = ot.Normal().getSample(500)
+        distribution = ot.Normal()
+        dp = othdr.UnivariateHighDensityRegionAlgorithm(sample, distribution, [0.9, 0.5])
+        dp.run()
+
+        # The HDR of the Normal distribution is symmetric
+        q95 = distribution.computeQuantile(0.95)[0]
+        q75 = distribution.computeQuantile(0.75)[0]
+        assert_almost_equal(dp.getIntervals(), [[-q95, q95]], 6)
+        assert_almost_equal(dp.getIntervals(0.5), [[-q75, q75]], 6)
+        assert_almost_equal(dp.getOutlierPValue(), distribution.computePDF([q95]), 6)
+
+        # Outliers are out of the interval
+        x = np.ravel(sample)
+        expected = [int(i) for i in np.where(np.abs(x) > q95)[0]]
+        assert_equal(dp.computeIndices(), expected)
+        assert_equal(dp.getMode(), int(np.argmin(np.abs(x))))
+        otv.View(dp.draw(drawInliers=True))
+
+    def test_Bimodal(self):
+        ot.RandomGenerator.SetSeed(0)
+        distribution = ot.Mixture([ot.Normal(-3.0, 1.0), ot.Normal(3.0, 1.0)])
+        sample = distribution.getSample(500)
+        ks = ot.KernelSmoothing()
+        fitted = ks.build(sample)
+        dp = othdr.UnivariateHighDensityRegionAlgorithm(sample, fitted, [0.9, 0.5])
+        dp.run()
+
+        # One interval per mode, with the expected mass
+        for alpha in [0.9, 0.5]:
+            intervals = dp.getIntervals(alpha)
+            assert_equal(intervals.shape, (2, 2))
+            cdf = np.ravel(fitted.computeCDF(np.reshape(intervals, (-1, 1))))
+            assert_almost_equal(np.sum(cdf[1::2] - cdf[0::2]), alpha, 8)
+
+        # Interval membership matches the threshold on the PDF
+        pdf = np.ravel(fitted.computePDF(sample))
+        expected = [int(i) for i in np.where(pdf < dp.getOutlierPValue())[0]]
+        assert_equal(dp.computeIndices(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()